@@ -0,0 +1,120 @@
+"""
+Benchmark of the movement validity check of every game.
+
+Compares the generic IGameRules.is_movement_possible (membership in possible_movements)
+with the direct check implemented by each game, over positions reached by random play.
+
+Usage:
+    PYTHONPATH=src python benchmarks/movement_validity.py [--repetitions N]
+"""
+
+import argparse
+import random
+import time
+
+from IArena.interfaces.IGameRules import IGameRules
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.games.Coins import CoinsRules
+from IArena.games.Nim import NimRules
+from IArena.games.NumberGuess import NumberGuessRules
+from IArena.games.TicTacToe import TicTacToeRules
+from IArena.games.Connect4 import Connect4Rules
+from IArena.games.NQueens import NQueensRules
+from IArena.games.Hanoi import HanoiRules
+from IArena.games.HighestCard import HighestCardRules
+from IArena.games.PrisonerDilemma import PrisonerDilemmaRules
+from IArena.games.SSP import SSPRules
+from IArena.games.SlicingPuzzle import SlicingPuzzleRules
+from IArena.games.FieldWalk import FieldWalkRules
+from IArena.games.CompassBlindWalk import CompassBlindWalkRules, CompassBlindWalkMap, CompassBlindWalkCoordinate
+from IArena.games.Mastermind import MastermindRules
+from IArena.games.Wordle import WordleRules
+from IArena.games.DistanceWordle import DistanceWordleRules
+from IArena.games.LetterWordle import LetterWordleRules
+
+# Code spaces bigger than this are not enumerated by the generic check
+MAX_ENUMERATED_SPACE = 10 ** 6
+
+GAMES = {
+    'Coins': lambda: CoinsRules(),
+    'Nim': lambda: NimRules(),
+    'NumberGuess': lambda: NumberGuessRules(number_values=1000),
+    'TicTacToe': lambda: TicTacToeRules(),
+    'Connect4': lambda: Connect4Rules(),
+    'NQueens 16': lambda: NQueensRules(16),
+    'Hanoi 10': lambda: HanoiRules(10),
+    'HighestCard': lambda: HighestCardRules(seed=0),
+    'PrisonerDilemma': lambda: PrisonerDilemmaRules(seed=0),
+    'SSP 50': lambda: SSPRules(coins=list(range(1, 51)), target=10 ** 6),
+    'SlicingPuzzle 5': lambda: SlicingPuzzleRules(n=5, seed=0),
+    'FieldWalk 50x50': lambda: FieldWalkRules(rows=50, cols=50, seed=0),
+    'CompassBlindWalk 50x50': lambda: CompassBlindWalkRules(
+        CompassBlindWalkMap([[True] * 50 for _ in range(50)]), CompassBlindWalkCoordinate(49, 49)),
+    'Mastermind 4x6': lambda: MastermindRules(4, 6),
+    'Mastermind 20x30': lambda: MastermindRules(20, 30),
+    'Wordle 5x8 norep': lambda: WordleRules(5, 8, allow_repetition=False),
+    'DistanceWordle 6x6 norep': lambda: DistanceWordleRules(6, 6, allow_repetition=False),
+    'LetterWordle 5x10': lambda: LetterWordleRules(5, 10),
+}
+
+
+def random_movement(rules, position, rng):
+    movements = rules.possible_movements(position)
+    if isinstance(movements, CodeSpace):
+        return movements.sample(rng)
+    return rng.choice(list(movements))
+
+
+def sample_checks(rules, rng, n_positions):
+    """Pairs (movement, position) reached by random play."""
+    checks = []
+    position = rules.first_position()
+    for _ in range(n_positions):
+        if rules.finished(position):
+            position = rules.first_position()
+        movement = random_movement(rules, position, rng)
+        checks.append((movement, position))
+        position = rules.next_position(movement, position)
+    return checks
+
+
+def time_checks(check, checks, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for movement, position in checks:
+            check(movement, position)
+    return (time.perf_counter() - start) / (repetitions * len(checks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--positions', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'game':<26}{'generic (us)':>16}{'direct (us)':>14}{'speedup':>10}")
+    for name, factory in GAMES.items():
+        rng = random.Random(0)
+        rules = factory()
+        checks = sample_checks(rules, rng, args.positions)
+
+        direct = time_checks(rules.is_movement_possible, checks, args.repetitions)
+
+        movements = rules.possible_movements(checks[0][1])
+        if isinstance(movements, CodeSpace) and movements.size() > MAX_ENUMERATED_SPACE:
+            print(f"{name:<26}{'(too big)':>16}{direct * 1e6:>14.2f}{'-':>10}")
+            continue
+
+        def generic(movement, position):
+            # Enumerate the movements as the generic implementation did before code spaces
+            return movement in list(rules.possible_movements(position))
+
+        if not isinstance(movements, CodeSpace):
+            generic = lambda movement, position: IGameRules.is_movement_possible(rules, movement, position)
+
+        generic_time = time_checks(generic, checks, 1)
+        print(f"{name:<26}{generic_time * 1e6:>16.2f}{direct * 1e6:>14.2f}{generic_time / direct:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterator, List
+import numpy as np
+
+from IArena.arena.PrisonerTournament import IteratedPrisonerTournament
+from IArena.games.PrisonerDilemma import PrisonerDilemmaScoreTable
+from IArena.players.prisoner_players import PrisonerStrategy
+
+"""
+Evolutionary dynamics of populations of Iterated Prisoner Dilemma strategies, over many score tables at once.
+
+The strategies play one tournament, whose fractions of rounds of each pair of decisions do not depend
+on the score table. So the payoff matrix of every table is a single product of those fractions with
+the tables, and the populations of all the tables evolve together as NumPy arrays of shape (tables, strategies):
+
+- Replicator: infinite populations, where the share of each strategy grows with its fitness over the mean.
+- Moran: finite populations, where in each step an individual chosen by fitness has a copy
+  that replaces an individual chosen at random. A generation is as many steps as individuals.
+
+Scores are years to minimize, so the fitness of a score in a table is 1 - w + w (worst - score) / (worst - best),
+with the selection intensity w between 0 (neutral drift) and 1.
+Tables are split in chunks that evolve in parallel processes, and the summary of each generation
+is yielded as soon as every chunk has reached it.
+"""
+
+
+def random_tables(seeds: List[int]) -> List[PrisonerDilemmaScoreTable]:
+    """Random score table of each seed, as generated by PrisonerDilemmaScoreTable."""
+    return [PrisonerDilemmaScoreTable.generate_random_table(seed) for seed in seeds]
+
+
+def replicator_step(
+        shares: np.ndarray,
+        fitness: np.ndarray) -> np.ndarray:
+    """
+    Discrete replicator dynamics of a generation.
+
+    Args:
+        shares: Share of each strategy in each population, with shape (populations, strategies).
+        fitness: Fitness of each strategy against each strategy in each population,
+            with shape (populations, strategies, strategies).
+
+    Returns:
+        Shares of the next generation.
+    """
+    strategy_fitness = np.einsum('bij,bj->bi', fitness, shares)
+    weighted = shares * strategy_fitness
+    return weighted / weighted.sum(axis=1, keepdims=True)
+
+
+def moran_step(
+        counts: np.ndarray,
+        fitness: np.ndarray,
+        rng: np.random.Generator):
+    """
+    One birth and death step of the Moran process in every population, in place.
+
+    Individuals play against every other individual of their population.
+
+    Args:
+        counts: Individuals of each strategy in each population, with shape (populations, strategies).
+        fitness: Fitness of each strategy against each strategy in each population,
+            with shape (populations, strategies, strategies).
+        rng: Random generator of the choices.
+    """
+    populations = np.arange(counts.shape[0])
+    size = counts.sum(axis=1, keepdims=True)
+    # Average fitness of the games against the rest of individuals
+    others = np.einsum('bij,bj->bi', fitness, counts) - np.diagonal(fitness, axis1=1, axis2=2)
+    strategy_fitness = others / np.maximum(size - 1, 1)
+
+    births = np.cumsum(counts * strategy_fitness, axis=1)
+    deaths = np.cumsum(counts, axis=1)
+    # Populations where nobody has fitness reproduce at random
+    births = np.where(births[:, -1:] > 0, births, deaths)
+    draws = rng.random((2, len(populations), 1))
+    born = (births <= draws[0] * births[:, -1:]).sum(axis=1)
+    died = (deaths <= draws[1] * deaths[:, -1:]).sum(axis=1)
+
+    counts[populations, born] += 1
+    counts[populations, died] -= 1
+
+
+def _evolve_chunk(
+        dynamics: str,
+        state: np.ndarray,
+        fitness: np.ndarray,
+        generations: int,
+        seed: np.random.SeedSequence):
+    """
+    Evolves the populations of a chunk of tables some generations.
+
+    Returns:
+        Final state, and the shares of every generation with shape (generations, populations, strategies).
+    """
+    rng = np.random.default_rng(seed)
+    history = np.empty((generations,) + state.shape)
+    for generation in range(generations):
+        if dynamics == PopulationDynamics.Replicator:
+            state = replicator_step(state, fitness)
+            history[generation] = state
+        else:
+            for _ in range(int(state[0].sum())):
+                moran_step(state, fitness, rng)
+            history[generation] = state / state.sum(axis=1, keepdims=True)
+    return state, history
+
+
+class PopulationDynamics:
+    """
+    Evolves populations of strategies under the score tables of the Prisoner Dilemma.
+    """
+
+    Replicator = 'replicator'
+    Moran = 'moran'
+
+    def __init__(
+            self,
+            strategies: List[PrisonerStrategy],
+            rounds: int = 200,
+            repetitions: int = 1,
+            noise: float = 0.0,
+            seed: int = None):
+        """
+        Args:
+            strategies: Strategies of the populations.
+            rounds: Rounds of each match of the tournament.
+            repetitions: Matches between each pair of strategies.
+            noise: Probability that each decision is flipped.
+            seed: Seed of the tournament and of the Moran process.
+        """
+        self.strategies = strategies
+        self.seed = seed
+        tournament = IteratedPrisonerTournament(
+            strategies=strategies,
+            rounds=rounds,
+            repetitions=repetitions,
+            noise=noise,
+            seed=seed)
+        self.names_ = tournament.names()
+        # Computed once, and shared by every table
+        self.outcomes_ = tournament.outcomes()
+
+    def names(self) -> List[str]:
+        return self.names_
+
+    def payoffs(
+            self,
+            score_tables: List[PrisonerDilemmaScoreTable]) -> np.ndarray:
+        """
+        Average score per round of each strategy (row) against each strategy (column) with each table,
+        as an array of shape (tables, strategies, strategies).
+        """
+        tables = np.array([table.as_matrix() for table in score_tables])
+        return np.einsum('ijab,tab->tij', self.outcomes_, tables)
+
+    def fitness(
+            self,
+            score_tables: List[PrisonerDilemmaScoreTable],
+            selection: float = 1.0) -> np.ndarray:
+        """
+        Fitness of each strategy against each strategy with each table, between 1 - selection and 1.
+        """
+        tables = np.array([table.as_matrix() for table in score_tables]).reshape(len(score_tables), -1)
+        best = tables.min(axis=1)[:, np.newaxis, np.newaxis]
+        worst = tables.max(axis=1)[:, np.newaxis, np.newaxis]
+        normalized = (worst - self.payoffs(score_tables)) / np.maximum(worst - best, np.finfo(float).tiny)
+        return 1 - selection + selection * normalized
+
+    def _first_state(
+            self,
+            dynamics: str,
+            tables: int,
+            population: int) -> np.ndarray:
+        n = len(self.strategies)
+        if dynamics == PopulationDynamics.Replicator:
+            return np.full((tables, n), 1 / n)
+        if dynamics == PopulationDynamics.Moran:
+            if population < n:
+                raise ValueError(f"Population {population} smaller than the {n} strategies")
+            counts = np.full((tables, n), population // n, dtype=np.int64)
+            counts[:, :population % n] += 1
+            return counts
+        raise ValueError(f"Unknown dynamics {dynamics}")
+
+    def evolve(
+            self,
+            score_tables: List[PrisonerDilemmaScoreTable],
+            generations: int,
+            dynamics: str = Replicator,
+            population: int = 100,
+            selection: float = 1.0,
+            processes: int = None,
+            block: int = 50) -> Iterator[dict]:
+        """
+        Evolves a population for each table, starting with the same share of every strategy.
+
+        Args:
+            score_tables: Score table of each population.
+            generations: Number of generations.
+            dynamics: Replicator or Moran.
+            population: Individuals of each population in the Moran process.
+            selection: Intensity of the selection, from 0 to 1.
+            processes: Processes that evolve the tables in chunks. By default, one per core.
+                With 1, everything runs in this process.
+            block: Generations that each chunk evolves before its summaries are yielded.
+
+        Yields:
+            Summary of each generation, with its number, the mean share of each strategy over the tables,
+            and the number of tables in which each strategy has the largest share.
+        """
+        fitness = self.fitness(score_tables, selection)
+        state = self._first_state(dynamics, len(score_tables), population)
+        seeds = np.random.SeedSequence(self.seed)
+
+        if processes == 1:
+            executor = None
+            chunks = [np.arange(len(score_tables))]
+        else:
+            processes = processes if processes is not None else os.cpu_count()
+            executor = ProcessPoolExecutor(max_workers=processes)
+            chunks = np.array_split(np.arange(len(score_tables)), processes)
+            chunks = [chunk for chunk in chunks if len(chunk) > 0]
+
+        try:
+            done = 0
+            while done < generations:
+                steps = min(block, generations - done)
+                arguments = [
+                    (dynamics, state[chunk], fitness[chunk], steps, chunk_seed)
+                    for chunk, chunk_seed in zip(chunks, seeds.spawn(len(chunks)))]
+                if executor is None:
+                    results = [_evolve_chunk(*args) for args in arguments]
+                else:
+                    results = list(executor.map(_evolve_chunk, *zip(*arguments)))
+
+                history = np.concatenate([shares for _, shares in results], axis=1)
+                for chunk, (chunk_state, _) in zip(chunks, results):
+                    state[chunk] = chunk_state
+                for shares in history:
+                    done += 1
+                    yield self._summary(done, shares)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _summary(
+            self,
+            generation: int,
+            shares: np.ndarray) -> dict:
+        mean = shares.mean(axis=0)
+        dominant = np.bincount(shares.argmax(axis=1), minlength=len(self.strategies))
+        return {
+            'generation': generation,
+            'mean_share': {name: float(share) for name, share in zip(self.names_, mean)},
+            'dominant': {name: int(count) for name, count in zip(self.names_, dominant)},
+        }
+
+    def write(
+            self,
+            stream: IO[str],
+            score_tables: List[PrisonerDilemmaScoreTable],
+            generations: int,
+            **kwargs) -> None:
+        """
+        Writes the summary of each generation of evolve to the stream, as a line of JSON, as soon as it is computed.
+        The rest of arguments are the ones of evolve.
+        """
+        for summary in self.evolve(score_tables, generations, **kwargs):
+            stream.write(json.dumps(summary) + '\n')
+            stream.flush()
@@ -0,0 +1,133 @@
+from typing import List, Tuple
+import numpy as np
+
+from IArena.games.PrisonerDilemma import PrisonerDilemmaScoreTable
+from IArena.players.prisoner_players import PrisonerStrategy
+
+"""
+Round robin tournaments of the Iterated Prisoner Dilemma, as the ones of Axelrod.
+
+Every pair of strategies (each one against itself too) plays several matches of a number of rounds.
+Instead of a game per match, all the matches are played at once: the decisions are kept in an int8 array
+of shape (2, matches, rounds), and in each round every strategy decides for all the matches it is in
+with a single call over views of their histories and the running count of defections of the opponents,
+so the cost of a round does not grow with the rounds played.
+Scores are then summed from the score table with NumPy.
+"""
+
+
+class IteratedPrisonerTournament:
+    """
+    Round robin tournament between strategies of the Iterated Prisoner Dilemma.
+
+    Scores are years to minimize, as in PrisonerDilemmaRules.
+    """
+
+    def __init__(
+            self,
+            strategies: List[PrisonerStrategy],
+            score_table: PrisonerDilemmaScoreTable = None,
+            rounds: int = 200,
+            repetitions: int = 1,
+            noise: float = 0.0,
+            seed: int = None):
+        """
+        Args:
+            strategies: Strategies of the tournament.
+            score_table: Score of each round. By default, the classic one of Axelrod.
+            rounds: Rounds of each match.
+            repetitions: Matches between each pair of strategies.
+            noise: Probability that each decision is flipped.
+            seed: Seed of the random decisions and the noise.
+        """
+        if score_table is None:
+            score_table = PrisonerDilemmaScoreTable.classic_table()
+        self.strategies = strategies
+        self.score_table = score_table
+        self.rounds = rounds
+        self.repetitions = repetitions
+        self.noise = noise
+        self.seed = seed
+
+    def names(self) -> List[str]:
+        return [strategy.name() for strategy in self.strategies]
+
+    def outcomes(self) -> np.ndarray:
+        """
+        Plays the tournament, without scoring it.
+
+        Returns:
+            Array of shape (strategies, strategies, 2, 2) with the fraction of rounds in which each strategy
+            (first axis) against each strategy (second axis) decided a (third axis) while the opponent decided b
+            (fourth axis). The score of any table is then its sum weighted by these fractions.
+        """
+        rng = np.random.default_rng(self.seed)
+        n = len(self.strategies)
+
+        # Strategy of each side of each match
+        first, second = np.triu_indices(n)
+        first = np.repeat(first, self.repetitions)
+        second = np.repeat(second, self.repetitions)
+        sides = (first, second)
+        matches = len(first)
+
+        # Matches of each strategy in each side, decided with one call per round.
+        # Each group keeps its own copy of the histories of its matches and the defections of the opponents,
+        # so the strategy receives views of the rounds played instead of copies, and each round costs the same.
+        groups = []
+        for s in range(n):
+            for side in (0, 1):
+                rows = np.flatnonzero(sides[side] == s)
+                if len(rows) > 0:
+                    histories = np.zeros((2, len(rows), self.rounds), dtype=np.int8)
+                    defections = np.zeros(len(rows), dtype=np.int64)
+                    groups.append((self.strategies[s], side, rows, histories, defections))
+        decisions = np.zeros((2, matches, self.rounds), dtype=np.int8)
+
+        for played in range(self.rounds):
+            for strategy, side, rows, (own, other), defections in groups:
+                decisions[side, rows, played] = strategy.decide_counted(
+                    own[:, :played], other[:, :played], defections, rng)
+            if self.noise > 0:
+                flips = rng.random((2, matches)) < self.noise
+                decisions[:, :, played] ^= flips.astype(np.int8)
+            for _, side, rows, histories, defections in groups:
+                histories[0, :, played] = decisions[side, rows, played]
+                histories[1, :, played] = decisions[1 - side, rows, played]
+                defections += histories[1, :, played]
+
+        # Fraction of rounds of each pair of decisions (own, other) in each match, for the first side
+        pairs = 2 * decisions[0] + decisions[1]
+        fractions = (pairs[:, :, np.newaxis] == np.arange(4)).mean(axis=1)
+        # The second side sees the same rounds with the decisions swapped
+        swapped = fractions[:, [0, 2, 1, 3]]
+
+        totals = np.zeros((n, n, 4))
+        counts = np.zeros((n, n))
+        np.add.at(totals, (first, second), fractions)
+        np.add.at(counts, (first, second), 1)
+        np.add.at(totals, (second, first), swapped)
+        np.add.at(counts, (second, first), 1)
+        return (totals / counts[:, :, np.newaxis]).reshape(n, n, 2, 2)
+
+    def play(self) -> np.ndarray:
+        """
+        Returns:
+            Array of shape (strategies, strategies) with the average score per round
+            of each strategy (row) against each strategy (column).
+        """
+        return np.einsum('ijab,ab->ij', self.outcomes(), self.score_table.as_matrix())
+
+    def ranking(
+            self,
+            results: np.ndarray = None) -> List[Tuple[str, float]]:
+        """
+        Strategies from the best (lowest average score per round against every strategy) to the worst.
+
+        Args:
+            results: Result of play. If not given, the tournament is played.
+        """
+        if results is None:
+            results = self.play()
+        averages = results.mean(axis=1)
+        return [(self.strategies[i].name(), float(averages[i])) for i in np.argsort(averages, kind='stable')]
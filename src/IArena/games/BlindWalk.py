@@ -8,6 +8,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.SquareMap import SquareMapCoordinate, SquareMapMovement, SquareMap
+from IArena.utils.MapCorpus import get_valid_map
+from IArena.grader.RulesGenerator import IRulesGenerator
 
 """
 This game represents a grid search where some squares represent obstacles/walls.
@@ -56,7 +58,7 @@ class BlindWalkPosition(IPosition):
     def __eq__(
             self,
             other: "BlindWalkPosition"):
-        return self.steps_ == other.steps and self.position_ == other.position
+        return self.steps_ == other.steps_ and self.position_ == other.position_
 
     def __str__(self):
         return f'Steps: {self.steps_}, Position: {self.position_}'
@@ -76,15 +78,7 @@ class BlindWalkPosition(IPosition):
     def following_coordinate(
             self,
             movement: BlindWalkMovement) -> BlindWalkCoordinate:
-        if movement == BlindWalkMovement.Up:
-            return BlindWalkCoordinate(self.position_.x - 1, self.position_.y)
-        if movement == BlindWalkMovement.Down:
-            return BlindWalkCoordinate(self.position_.x + 1, self.position_.y)
-        if movement == BlindWalkMovement.Left:
-            return BlindWalkCoordinate(self.position_.x, self.position_.y - 1)
-        if movement == BlindWalkMovement.Right:
-            return BlindWalkCoordinate(self.position_.x, self.position_.y + 1)
-        raise ValueError(f"Invalid movement {movement}")
+        return self.rules_.following_coordinate(self.position_, movement)
 
 
 
@@ -95,7 +89,7 @@ class BlindWalkRules(IGameRules):
             map: BlindWalkMap,
             target: BlindWalkCoordinate,
             start: BlindWalkCoordinate = BlindWalkCoordinate(0, 0)):
-        self.map_ = self.map
+        self.map_ = map
         self.target_ = target
         self.start_ = start
 
@@ -137,6 +131,14 @@ class BlindWalkRules(IGameRules):
         return movements
 
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: IMovement,
+            position: IPosition) -> bool:
+        return self.is_valid_coordinate(self.following_coordinate(position.position_, movement))
+
+
     @override
     def finished(
             self,
@@ -153,10 +155,96 @@ class BlindWalkRules(IGameRules):
         return sb
 
 
+    def minimum_steps(self) -> float:
+        """Steps of the shortest path from start to target (inf if there is none), so the best score is minus it."""
+        return self.map_.distance(self.start_, self.target_)
+
+
+    def following_coordinate(
+            self,
+            coordinate: BlindWalkCoordinate,
+            movement: BlindWalkMovement) -> BlindWalkCoordinate:
+        if movement.direction == BlindWalkMovement.Direction.Up:
+            return BlindWalkCoordinate(coordinate.x - 1, coordinate.y)
+        if movement.direction == BlindWalkMovement.Direction.Down:
+            return BlindWalkCoordinate(coordinate.x + 1, coordinate.y)
+        if movement.direction == BlindWalkMovement.Direction.Left:
+            return BlindWalkCoordinate(coordinate.x, coordinate.y - 1)
+        if movement.direction == BlindWalkMovement.Direction.Right:
+            return BlindWalkCoordinate(coordinate.x, coordinate.y + 1)
+        raise ValueError(f"Invalid movement {movement}")
+
+
     def is_valid_coordinate(
             self,
             coordinate: BlindWalkCoordinate) -> bool:
         rows, cols = self.map_.size()
         return (0 <= coordinate.x < rows and
                 0 <= coordinate.y < cols and
-                self.map_[coordinate.x][coordinate.y])
+                self.map_[coordinate.x, coordinate.y])
+
+
+class BlindWalkRulesGenerator(IRulesGenerator):
+    """
+    Rules with a valid random map of the corpus, generated only the first time its parameters and seed are used.
+    """
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        rows = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'rows',
+            required = True,
+            type_cast = int,
+        )
+
+        cols = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['cols', 'columns'],
+            required = True,
+            type_cast = int,
+        )
+
+        start = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'start',
+            default_value = (0, 0),
+        )
+
+        target = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'target',
+            default_value = (rows - 1, cols - 1),
+        )
+
+        path_length = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['path_length', 'approx_path_length'],
+            default_value = 2 * (rows + cols),
+            type_cast = int,
+        )
+
+        obstacle_prob = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['obstacle_prob', 'approx_obstacle_prob'],
+            default_value = 0.3,
+            type_cast = float,
+        )
+
+        seed = BlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'seed',
+            required = True,
+            type_cast = int,
+        )
+
+        start = BlindWalkCoordinate(int(start[0]), int(start[1]))
+        target = BlindWalkCoordinate(int(target[0]), int(target[1]))
+
+        return BlindWalkRules(
+            map=get_valid_map(rows, cols, start, target, path_length, obstacle_prob, seed),
+            target=target,
+            start=start)
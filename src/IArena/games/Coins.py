@@ -177,6 +177,13 @@ class CoinsRules(IGameRules):
             )
         ]
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: CoinsMovement,
+            position: CoinsPosition) -> bool:
+        return self.min_play() <= movement.n <= min(len(position), self.max_play())
+
     @override
     def finished(
             self,
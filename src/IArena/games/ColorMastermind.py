@@ -2,8 +2,7 @@
 from __future__ import annotations
 
 import copy
-from typing import Iterator, List, Set
-import itertools
+from typing import List, Set
 from dataclasses import dataclass
 
 from IArena.grader.RulesGenerator import IRulesGenerator
@@ -15,6 +14,9 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.games.Mastermind import MastermindRules
 
 """
 This game represents a version of the MasterMind game.
@@ -79,8 +81,8 @@ class ColorMastermindPosition(IPosition):
             guesses: List[ColorMastermindMovement],
             feedback: List[List[ColorMastermindFeedback]]):
         super().__init__(rules)
-        self._guesses : List[ColorMastermindMovement] = guesses
-        self._feedback : List[ColorMastermindPosition.ColorMastermindFeedback] = feedback
+        self._guesses : List[ColorMastermindMovement] = PersistentHistory.of(guesses)
+        self._feedback : List[ColorMastermindPosition.ColorMastermindFeedback] = PersistentHistory.of(feedback)
 
     @override
     def next_player(
@@ -99,26 +101,26 @@ class ColorMastermindPosition(IPosition):
 
         # Print each guess in a line together with the feedback
         st = ""
-        for i in range(len(self._guesses)):
-            feedback_str = f'Correct: {self._feedback[i].correct}, Misplaced: {self._feedback[i].misplaced}'
-            st += f'Guess {i}: {self._guesses[i]} | Feedback: {feedback_str}\n'
+        for i, (guess, feedback) in enumerate(zip(self._guesses, self._feedback)):
+            feedback_str = f'Correct: {feedback.correct}, Misplaced: {feedback.misplaced}'
+            st += f'Guess {i}: {guess} | Feedback: {feedback_str}\n'
         return st
 
     def guesses(self) -> List[ColorMastermindMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def feedback(self) -> List[ColorMastermindFeedback]:
-        return copy.deepcopy(self._feedback)
+        return copy.deepcopy(self._feedback.to_list())
 
     def last_guess(self) -> ColorMastermindMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def last_feedback(self) -> ColorMastermindFeedback:
         if len(self._feedback) == 0:
             return None
-        return copy.deepcopy(self._feedback[-1])
+        return copy.deepcopy(self._feedback.last())
 
     def code_size(self) -> int:
         return self.get_rules().code_size()
@@ -130,7 +132,7 @@ class ColorMastermindPosition(IPosition):
         """Returns whether repetition of colors is allowed."""
         return self.get_rules().allow_repetition()
 
-    def possible_colors(self) -> List[int]:
+    def possible_colors(self) -> List[str]:
         """List of strings representing the possible colors in the game."""
         return self.get_rules().possible_colors()
 
@@ -158,19 +160,18 @@ class ColorMastermindRules(IGameRules):
                 rng: RandomGenerator,
                 allow_repetition: bool = True) -> List[str]:
 
-        possible_colors_set = set(possible_colors)
         number_values = len(possible_colors)
         if not allow_repetition and code_size > number_values:
             raise ValueError("n must be less than or equal to m when allow_repetition is False")
         if allow_repetition:
             indexes = [rng.randint(number_values) for _ in range(code_size)]
         else:
-            colors = []
+            possible_indexes = list(range(number_values))
+            indexes = []
             for _ in range(code_size):
-                color = rng.choice(list(possible_colors_set))
-                colors.append(color)
-                possible_colors_set.remove(color)
-            indexes = colors
+                index = rng.choice(possible_indexes)
+                indexes.append(index)
+                possible_indexes.remove(index)
 
         return [possible_colors[i] for i in indexes]
 
@@ -210,20 +211,37 @@ class ColorMastermindRules(IGameRules):
         if secret is None:
             secret = ColorMastermindRules.random_secret(
                 code_size=code_size,
-                number_values=number_values,
+                possible_colors=possible_colors,
                 rng=RandomGenerator(),
                 allow_repetition=allow_repetition,
             )
 
-        self.m = number_values
+        self.m = len(possible_colors)
         self.n = code_size
-        if len(secret) != code_size or any(x not in possible_colors for x in secret):
+        self.allow_repetition_ = allow_repetition
+        self.possible_colors_ = tuple(possible_colors)
+        # Index of each color, so codes are handled as integers and colors only appear in the movements
+        self.__color_values = {color: i for i, color in enumerate(self.possible_colors_)}
+
+        if len(secret) != code_size or any(x not in self.__color_values for x in secret):
             raise ValueError("Secret must be of size n and with numbers from 0 to m-1")
         if not allow_repetition and len(set(secret)) != code_size:
             raise ValueError("Secret must not have repetitions when allow_repetition is False")
-        self.__secret = secret
-        self.allow_repetition_ = allow_repetition
-        self.possible_colors_ = possible_colors
+
+        # The numeric game with the secret as integers computes the feedback
+        self.__numeric_rules = MastermindRules(
+            code_size=self.n,
+            number_values=self.m,
+            secret=self.to_values(secret),
+            allow_repetition=allow_repetition)
+
+        # Every code of n values, built lazily: indexable, sampleable and with constant time membership
+        self.code_space_ = CodeSpace(
+            code_size=self.n,
+            number_values=self.m,
+            allow_repetition=self.allow_repetition_,
+            movement_type=ColorMastermindMovement,
+            symbols=self.possible_colors_)
 
     def number_values(self) -> int:
         return self.m
@@ -234,8 +252,20 @@ class ColorMastermindRules(IGameRules):
     def allow_repetition(self) -> bool:
         return self.allow_repetition_
 
-    def possible_colors(self) -> List[int]:
-        return copy.deepcopy(self.possible_colors_)
+    def possible_colors(self) -> List[str]:
+        return list(self.possible_colors_)
+
+    def to_values(
+            self,
+            colors: List[str]) -> List[int]:
+        """Index of each color of a code in possible_colors."""
+        return [self.__color_values[x] for x in colors]
+
+    def to_colors(
+            self,
+            values: List[int]) -> List[str]:
+        """Colors of a code given by the index of each color in possible_colors."""
+        return [self.possible_colors_[x] for x in values]
 
     @override
     def n_players(self) -> int:
@@ -250,71 +280,59 @@ class ColorMastermindRules(IGameRules):
             self,
             movement: ColorMastermindMovement,
             position: ColorMastermindPosition) -> ColorMastermindPosition:
-        guesses = position.guesses() + [movement]
-        old_feedback = position.feedback()
+        guesses = position._guesses.append(movement)
 
-        # Check if the movement is valid
-        if len(movement.guess) != self.n or any(x not in self.possible_colors_ for x in movement.guess):
+        # Check if the movement is valid, converting it into integers
+        values = self.code_space_.code(movement)
+        if values is None:
+            if len(movement.guess) == self.n and all(x in self.__color_values for x in movement.guess):
+                raise ValueError(f"Movement must not have repetitions when allow_repetition is False. Incorrect movement: {movement}")
             raise ValueError(f"Movement must be of size n and with valid colors. Incorrect movement: {movement}")
-        if not self.allow_repetition_ and len(set(movement.guess)) != self.n:
-            raise ValueError(f"Movement must not have repetitions when allow_repetition is False. Incorrect movement: {movement}")
 
         # Calculate the feedback of the new guess
-        new_feedback = ColorMastermindPosition.ColorMastermindFeedback()
-        secret_copy = self.__secret.copy()
-        guess_copy = movement.guess.copy()
-
-        # First pass: check for correct positions
-        for i in range(self.n):
-            if guess_copy[i] == secret_copy[i]:
-                new_feedback.correct += 1
-                secret_copy[i] = -1
-                guess_copy[i] = -2
-
-        # Second pass: check for misplaced positions
-        for i in range(self.n):
-            if guess_copy[i] in secret_copy:
-                new_feedback.misplaced += 1
-                secret_index = secret_copy.index(guess_copy[i])
-                secret_copy[secret_index] = -1
-                guess_copy[i] = -2
+        new_feedback = self._calculate_feedback(values)
 
         # Append the new feedback to the list of feedbacks
-        feedback = copy.deepcopy(position.feedback())
-        feedback.append(new_feedback)
+        feedback = position._feedback.append(new_feedback)
 
         return ColorMastermindPosition(self, guesses, feedback)
 
+    def _calculate_feedback(
+            self,
+            guess: List[int]) -> ColorMastermindPosition.ColorMastermindFeedback:
+        """Number of correct and misplaced values of a guess given as color indexes."""
+        feedback = self.__numeric_rules._calculate_feedback(guess)
+        return ColorMastermindPosition.ColorMastermindFeedback(feedback.correct, feedback.misplaced)
+
     @override
     def possible_movements(
             self,
-            position: ColorMastermindPosition) -> Iterator[ColorMastermindMovement]:
-
-        if self.allow_repetition_:
-            # Every combination of n colors in possible_colors using itertools
-            for x in itertools.product(self.possible_colors_, repeat=self.n):
-                yield ColorMastermindMovement(guess=list(x))
+            position: ColorMastermindPosition) -> CodeSpace:
+        return self.code_space_
 
-        else:
-            # Every permutation of n numbers from 0 to m-1 using itertools
-            for x in itertools.permutations(self.possible_colors_, self.n):
-                yield ColorMastermindMovement(guess=list(x))
+    @override
+    def is_movement_possible(
+            self,
+            movement: ColorMastermindMovement,
+            position: ColorMastermindPosition) -> bool:
+        # Only checks the size and values of the code, without enumerating the space
+        return movement in self.code_space_
 
     @override
     def finished(
             self,
             position: ColorMastermindPosition) -> bool:
-        # Game is finished if the last guess is equal the hidden secret
-        if len(position.guesses()) == 0:
+        # Game is finished if the last guess is equal the hidden secret, so every value is correct
+        if len(position._feedback) == 0:
             return False
-        return position.guesses()[-1].guess == self.__secret
+        return position._feedback.last().correct == self.n
 
     @override
     def score(
             self,
             position: ColorMastermindPosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
@@ -357,21 +375,24 @@ class ColorMastermindRulesGenerator(IRulesGenerator):
             param_name = 'secret',
         )
 
+        if possible_colors:
+            if len(set(possible_colors)) != len(possible_colors):
+                raise ValueError("possible_colors must not have repetitions")
+            elif len(possible_colors) != number_values:
+                raise ValueError("Length of possible_colors must be equal to number_values")
+        else:
+            possible_colors = ColorMastermindRules.default_colors(number_values)
+
         if secret is not None:
-            if len(secret) != code_size or any(x < 0 or x >= number_values for x in secret):
-                raise ValueError("Secret must be of size n and with numbers from 0 to m-1")
+            # The secret is given as the index of each color, or as the colors themselves
+            if all(isinstance(x, int) for x in secret):
+                if len(secret) != code_size or any(x < 0 or x >= number_values for x in secret):
+                    raise ValueError("Secret must be of size n and with numbers from 0 to m-1")
+                secret = [possible_colors[x] for x in secret]
             if not allow_repetition and len(set(secret)) != code_size:
                 raise ValueError("Secret must not have repetitions when allow_repetition is False")
         else:
 
-            if possible_colors:
-                if len(set(possible_colors)) != len(possible_colors):
-                    raise ValueError("possible_colors must not have repetitions")
-                elif len(possible_colors) != number_values:
-                    raise ValueError("Length of possible_colors must be equal to number_values")
-            else:
-                possible_colors = ColorMastermindRules.default_colors(number_values)
-
             seed = ColorMastermindRulesGenerator._get_param(
                 configuration=configuration,
                 param_name = 'seed',
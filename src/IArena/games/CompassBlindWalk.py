@@ -8,6 +8,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.SquareMap import SquareMapCoordinate, SquareMapMovement, SquareMap
+from IArena.utils.MapCorpus import get_valid_map
+from IArena.grader.RulesGenerator import IRulesGenerator
 
 """
 This game represents a grid search where some squares represent obstacles/walls.
@@ -54,7 +56,7 @@ class CompassBlindWalkPosition(IPosition):
     def __eq__(
             self,
             other: "CompassBlindWalkPosition"):
-        return self.steps_ == other.steps and self.__position == other.position
+        return self.steps_ == other.steps_ and self.__position == other.__position
 
     def __str__(self):
         st = f"""Steps: {self.steps_},
@@ -142,6 +144,14 @@ class CompassBlindWalkRules(IGameRules):
         return movements
 
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: IMovement,
+            position: CompassBlindWalkPosition) -> bool:
+        return self.is_valid_coordinate(position._following_coordinate(movement))
+
+
     @override
     def finished(
             self,
@@ -158,6 +168,11 @@ class CompassBlindWalkRules(IGameRules):
         return sb
 
 
+    def minimum_steps(self) -> float:
+        """Steps of the shortest path from start to target (inf if there is none), so the best score is minus it."""
+        return self.__map.distance(self.start_, self.target_)
+
+
     def is_valid_coordinate(
             self,
             coordinate: CompassBlindWalkCoordinate) -> bool:
@@ -165,3 +180,69 @@ class CompassBlindWalkRules(IGameRules):
         return (0 <= coordinate.x < rows and
                 0 <= coordinate.y < cols and
                 self.__map[coordinate.x, coordinate.y])
+
+
+class CompassBlindWalkRulesGenerator(IRulesGenerator):
+    """
+    Rules with a valid random map of the corpus, generated only the first time its parameters and seed are used.
+    """
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        rows = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'rows',
+            required = True,
+            type_cast = int,
+        )
+
+        cols = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['cols', 'columns'],
+            required = True,
+            type_cast = int,
+        )
+
+        start = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'start',
+            default_value = (0, 0),
+        )
+
+        target = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'target',
+            default_value = (rows - 1, cols - 1),
+        )
+
+        path_length = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['path_length', 'approx_path_length'],
+            default_value = 2 * (rows + cols),
+            type_cast = int,
+        )
+
+        obstacle_prob = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['obstacle_prob', 'approx_obstacle_prob'],
+            default_value = 0.3,
+            type_cast = float,
+        )
+
+        seed = CompassBlindWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'seed',
+            required = True,
+            type_cast = int,
+        )
+
+        start = CompassBlindWalkCoordinate(int(start[0]), int(start[1]))
+        target = CompassBlindWalkCoordinate(int(target[0]), int(target[1]))
+
+        return CompassBlindWalkRules(
+            map=get_valid_map(rows, cols, start, target, path_length, obstacle_prob, seed),
+            target=target,
+            start=start)
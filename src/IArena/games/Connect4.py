@@ -269,6 +269,16 @@ class Connect4Rules(IGameRules):
         return movements
 
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: Connect4Movement,
+            position: Connect4Position) -> bool:
+        # Column exists and it is not full (without copying the matrix)
+        return (0 <= movement.n < self.n_cols
+                and position.position.matrix[0][movement.n] == Connect4Matrix.EMPTY_CELL)
+
+
     @override
     def finished(
             self,
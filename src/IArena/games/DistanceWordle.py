@@ -1,8 +1,7 @@
 
 import copy
-from typing import Iterator, List
+from typing import List
 from enum import Enum
-import itertools
 
 from IArena.grader.RulesGenerator import IRulesGenerator
 from IArena.interfaces.IPlayer import IPlayer
@@ -13,6 +12,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
+from IArena.utils.CodeSpace import CodeSpace
 
 """
 This game represents the Wordle game with exact tips.
@@ -70,8 +71,8 @@ class DistanceWordlePosition(IPosition):
             guesses: List[DistanceWordleMovement],
             feedback: List[List[int]]):
         super().__init__(rules)
-        self._guesses = guesses
-        self._feedback = feedback
+        self._guesses = PersistentHistory.of(guesses)
+        self._feedback = PersistentHistory.of(feedback)
 
     @override
     def next_player(
@@ -89,23 +90,23 @@ class DistanceWordlePosition(IPosition):
             return "<EMPTY POSITION>\n"
 
         # Print each guess in a line together with the feedback
-        return "\n".join([f'{self._guesses[i]} : {[x.name for x in self._feedback[i]]}' for i in range(len(self._guesses))]) + "\n"
+        return "\n".join([f'{guess} : {feedback}' for guess, feedback in zip(self._guesses, self._feedback)]) + "\n"
 
     def guesses(self) -> List[DistanceWordleMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def feedback(self) -> List[List[int]]:
-        return copy.deepcopy(self._feedback)
+        return copy.deepcopy(self._feedback.to_list())
 
     def last_guess(self) -> DistanceWordleMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def last_feedback(self) -> List[int]:
         if len(self._feedback) == 0:
             return None
-        return copy.deepcopy(self._feedback[-1])
+        return copy.deepcopy(self._feedback.last())
 
     def code_size(self) -> int:
         return self.get_rules().code_size()
@@ -179,8 +180,19 @@ class DistanceWordleRules(IGameRules):
         if not allow_repetition and len(set(secret)) != code_size:
             raise ValueError("Secret must not have repetitions when allow_repetition is False")
         self.__secret = secret
+        # Positions of each value in the secret, so the feedback of a guess is computed in linear time
+        self.__secret_positions = {}
+        for i, x in enumerate(secret):
+            self.__secret_positions.setdefault(x, []).append(i)
         self.allow_repetition_ = allow_repetition
 
+        # Every code of n values, built lazily: indexable, sampleable and with constant time membership
+        self.code_space_ = CodeSpace(
+            code_size=self.n,
+            number_values=self.m,
+            allow_repetition=self.allow_repetition_,
+            movement_type=DistanceWordleMovement)
+
     def number_values(self) -> int:
         return self.m
 
@@ -203,7 +215,7 @@ class DistanceWordleRules(IGameRules):
             self,
             movement: DistanceWordleMovement,
             position: DistanceWordlePosition) -> DistanceWordlePosition:
-        guesses = position.guesses() + [movement]
+        guesses = position._guesses.append(movement)
 
         # Check if the movement is valid
         if len(movement.guess) != self.n or any(x < 0 or x >= self.m for x in movement.guess):
@@ -212,59 +224,68 @@ class DistanceWordleRules(IGameRules):
             raise ValueError("Movement must not have repetitions when allow_repetition is False")
 
         # Calculate the feedback of the new guess
-        feedback = [self.n for _ in range(self.n)]
-        already_placed = [False for _ in range(self.n)]
-        possible_misplaced = []
-        for i in range(self.n):
-            if movement.guess[i] == self.__secret[i]:
-                feedback[i] = 0
-                already_placed[i] = True
-            elif movement.guess[i] in self.__secret:
-                possible_misplaced.append(i)
-
-        for i in possible_misplaced:
-            # Check if such number is in secret in a position that has already not being checked
-            for j in range(self.n):
-                if not already_placed[j] and movement.guess[i] == self.__secret[j]:
-                    already_placed[j] = True
-                    feedback[i] = abs(i - j)
-                    break
+        feedback = self._calculate_feedback(movement.guess)
 
-        new_feedback = copy.deepcopy(position.feedback())
-        new_feedback.append(feedback)
+        new_feedback = position._feedback.append(feedback)
 
         return DistanceWordlePosition(self, guesses, new_feedback)
 
+    def _calculate_feedback(
+            self,
+            guess: List[int]) -> List[int]:
+        """Distance of each position of a guess to its matched value in the secret, in two linear passes."""
+        feedback = [self.n for _ in range(self.n)]
+        correct = [guess[i] == self.__secret[i] for i in range(self.n)]
+        for i in range(self.n):
+            if correct[i]:
+                feedback[i] = 0
+        # Each misplaced value is matched with the first not matched position of the secret with that value.
+        # Those positions are taken from left to right, so a pointer per value is enough
+        next_match = {}
+        for i in range(self.n):
+            if correct[i]:
+                continue
+            positions = self.__secret_positions.get(guess[i])
+            if positions is None:
+                continue
+            k = next_match.get(guess[i], 0)
+            while k < len(positions) and correct[positions[k]]:
+                k += 1
+            if k < len(positions):
+                feedback[i] = abs(i - positions[k])
+                k += 1
+            next_match[guess[i]] = k
+        return feedback
+
     @override
     def possible_movements(
             self,
-            position: DistanceWordlePosition) -> Iterator[DistanceWordleMovement]:
+            position: DistanceWordlePosition) -> CodeSpace:
+        return self.code_space_
 
-        if self.allow_repetition_:
-            # Every combination of n numbers from 0 to m-1 using itertools
-            for x in itertools.product(range(self.m), repeat=self.n):
-                yield DistanceWordleMovement(guess=list(x))
-
-        else:
-            # Every permutation of n numbers from 0 to m-1 using itertools
-            for x in itertools.permutations(range(self.m), self.n):
-                yield DistanceWordleMovement(guess=list(x))
+    @override
+    def is_movement_possible(
+            self,
+            movement: DistanceWordleMovement,
+            position: DistanceWordlePosition) -> bool:
+        # Only checks the size and values of the code, without enumerating the space
+        return movement in self.code_space_
 
     @override
     def finished(
             self,
             position: DistanceWordlePosition) -> bool:
         # Game is finished if the last guess is equal the hidden secret
-        if len(position.guesses()) == 0:
+        if len(position._guesses) == 0:
             return False
-        return position.guesses()[-1].guess == self.__secret
+        return position._guesses.last().guess == self.__secret
 
     @override
     def score(
             self,
             position: DistanceWordlePosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
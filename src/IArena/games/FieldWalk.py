@@ -1,8 +1,7 @@
 
-from typing import Iterator, List
+from typing import Iterator, List, Tuple
 from enum import Enum
-import random
-import math
+import numpy as np
 
 from IArena.interfaces.IPosition import IPosition
 from IArena.interfaces.IMovement import IMovement
@@ -10,6 +9,8 @@ from IArena.interfaces.IGameRules import IGameRules
 from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.utils.decorators import override
 from IArena.interfaces.ScoreBoard import ScoreBoard
+from IArena.grader.RulesGenerator import IRulesGenerator
+from IArena.utils.pathfinding import cost_to_go, optimal_path
 
 """
 This game represents a grid search where each square has a different weight.
@@ -103,69 +104,122 @@ class FieldWalkPosition(IPosition):
 
 
 class FieldWalkMap:
+    """
+    Grid of the game, with the cost of entering each square as a NumPy array of integers.
+
+    The map does not change, so the minimum cost to reach the goal from each square is computed
+    only the first time it is required.
+    """
+
+    # Parameter of the exponential distribution of the random costs
+    Lambda = 0.5
 
     def __init__(
             self,
             squares: List[List[int]]):
-        self.squares = squares
+        self.squares = np.array(squares, dtype=np.int64, ndmin=2)
+        self.__cost_to_goal = None
 
     def __str__(self):
-        return '\n'.join([' '.join(["{0:4d}".format(square) for square in row]) for row in self.squares])
+        return '\n'.join([' '.join(["{0:4d}".format(square) for square in row]) for row in self.squares.tolist()])
+
+    def size(self) -> Tuple[int, int]:
+        rows, cols = self.squares.shape
+        return rows, cols
 
     def __len__(self):
-        return (len(self.squares), len(self.squares[0]))
+        return self.squares.shape[0]
 
-    def __getitem__(self, i, j):
-        return self.squares[i][j]
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        i, j = index
+        return int(self.squares[i, j])
 
-    def goal(self):
-        return (len(self)-1, len(self)-1)
+    def goal(self) -> Tuple[int, int]:
+        rows, cols = self.size()
+        return (rows - 1, cols - 1)
 
     def is_goal(self, position: FieldWalkPosition):
-        return position.x == len(self.squares) - 1 and position.y == len(self.squares[0]) - 1
+        return (position.x, position.y) == self.goal()
 
     def get_matrix(self) -> List[List[int]]:
-        return self.squares
+        return self.squares.tolist()
 
-    @staticmethod
-    def generate_random_map(rows: int, cols: int, seed: int = None):
+    def cost_to_goal(self) -> np.ndarray:
+        """Minimum cost to reach the goal from each square. Must not be modified."""
+        if self.__cost_to_goal is None:
+            self.__cost_to_goal = cost_to_go(self.squares)
+            self.__cost_to_goal.flags.writeable = False
+        return self.__cost_to_goal
+
+    def minimum_cost(
+            self,
+            x: int = 0,
+            y: int = 0) -> int:
+        """Minimum cost to reach the goal from a square, by default the initial one."""
+        return int(self.cost_to_goal()[x, y])
 
-        if seed is not None:
-            random.seed(seed)
+    def optimal_path(
+            self,
+            x: int = 0,
+            y: int = 0) -> List[Tuple[int, int]]:
+        """Squares of a path of minimum cost from a square (by default the initial one) to the goal."""
+        return optimal_path(self.squares, (x, y), field=self.cost_to_goal())[1]
 
-        lambda_parameter = 0.5  # You can adjust this to your preference
+    @staticmethod
+    def random_squares(
+            rows: int,
+            cols: int,
+            seed: int = None,
+            maps: int = None) -> np.ndarray:
+        """
+        Random costs of a map, or of a batch of maps with shape (maps, rows, cols).
 
-        def exponential_random_number():
-            return max(1, int(-1/lambda_parameter * math.log(1 - random.random())))
+        Costs follow an exponential distribution truncated to integers of at least 1.
+        """
+        shape = (rows, cols) if maps is None else (maps, rows, cols)
+        rng = np.random.default_rng(seed)
+        return np.maximum(1, rng.exponential(1 / FieldWalkMap.Lambda, shape).astype(np.int64))
 
-        return FieldWalkMap(
-            [[exponential_random_number() for j in range(cols)] for i in range(rows)])
+    @staticmethod
+    def generate_random_map(rows: int, cols: int, seed: int = None):
+        return FieldWalkMap(FieldWalkMap.random_squares(rows, cols, seed))
 
     def get_possible_movements(self, position: FieldWalkPosition) -> List[FieldWalkMovement]:
         result = []
         if position.x > 0:
             result.append(FieldWalkMovement(FieldWalkMovement.Direction.Up))
-        if position.x < len(self.squares) - 1:
+        if position.x < self.squares.shape[0] - 1:
             result.append(FieldWalkMovement(FieldWalkMovement.Direction.Down))
         if position.y > 0:
             result.append(FieldWalkMovement(FieldWalkMovement.Direction.Left))
-        if position.y < len(self.squares[position.x]) - 1:
+        if position.y < self.squares.shape[1] - 1:
             result.append(FieldWalkMovement(FieldWalkMovement.Direction.Right))
         return result
 
+    def is_possible_movement(self, position: FieldWalkPosition, movement: FieldWalkMovement) -> bool:
+        if movement.direction == FieldWalkMovement.Direction.Up:
+            return position.x > 0
+        if movement.direction == FieldWalkMovement.Direction.Down:
+            return position.x < self.squares.shape[0] - 1
+        if movement.direction == FieldWalkMovement.Direction.Left:
+            return position.y > 0
+        if movement.direction == FieldWalkMovement.Direction.Right:
+            return position.y < self.squares.shape[1] - 1
+        return False
+
     def get_next_position(
             self,
             position: FieldWalkPosition,
             movement: FieldWalkMovement,
             rules: "FieldWalkRules") -> FieldWalkPosition:
         if movement.direction == FieldWalkMovement.Direction.Up:
-            return FieldWalkPosition(rules, position.x - 1, position.y, position.cost + self.squares[position.x - 1][position.y])
+            return FieldWalkPosition(rules, position.x - 1, position.y, position.cost + int(self.squares[position.x - 1, position.y]))
         if movement.direction == FieldWalkMovement.Direction.Down:
-            return FieldWalkPosition(rules, position.x + 1, position.y, position.cost + self.squares[position.x + 1][position.y])
+            return FieldWalkPosition(rules, position.x + 1, position.y, position.cost + int(self.squares[position.x + 1, position.y]))
         if movement.direction == FieldWalkMovement.Direction.Left:
-            return FieldWalkPosition(rules, position.x, position.y - 1, position.cost + self.squares[position.x][position.y - 1])
+            return FieldWalkPosition(rules, position.x, position.y - 1, position.cost + int(self.squares[position.x, position.y - 1]))
         if movement.direction == FieldWalkMovement.Direction.Right:
-            return FieldWalkPosition(rules, position.x, position.y + 1, position.cost + self.squares[position.x][position.y + 1])
+            return FieldWalkPosition(rules, position.x, position.y + 1, position.cost + int(self.squares[position.x, position.y + 1]))
 
 
 class FieldWalkRules(IGameRules):
@@ -183,7 +237,7 @@ class FieldWalkRules(IGameRules):
             cols: The number of columns of the map. Only has effect if initial_map is None.
             seed: The seed for the random generator of the map. Only has effect if initial_map is None.
         """
-        if initial_map:
+        if initial_map is not None:
             self.map = initial_map
         else:
             self.map = FieldWalkMap.generate_random_map(rows, cols, seed)
@@ -216,6 +270,13 @@ class FieldWalkRules(IGameRules):
             position: FieldWalkPosition) -> Iterator[FieldWalkMovement]:
         return self.map.get_possible_movements(position)
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: FieldWalkMovement,
+            position: FieldWalkPosition) -> bool:
+        return self.map.is_possible_movement(position, movement)
+
     @override
     def finished(
             self,
@@ -229,3 +290,38 @@ class FieldWalkRules(IGameRules):
         s = ScoreBoard()
         s.add_score(PlayerIndex.FirstPlayer, position.cost)
         return s
+
+    def minimum_cost(self) -> int:
+        """Score of an optimal path from the initial position to the goal."""
+        return self.map.minimum_cost()
+
+
+class FieldWalkRulesGenerator(IRulesGenerator):
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        rows = FieldWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['rows', 'n'],
+            required = True,
+            type_cast = int,
+        )
+
+        cols = FieldWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['cols', 'columns', 'm'],
+            default_value = rows,
+            type_cast = int,
+        )
+
+        seed = FieldWalkRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'seed',
+            required = True,
+            type_cast = int,
+        )
+
+        return FieldWalkRules(rows=rows, cols=cols, seed=seed)
@@ -1,22 +1,28 @@
 
-from typing import Iterator, List
-from queue import LifoQueue
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
 
 from IArena.interfaces.IPosition import CostPosition, CostType
 from IArena.interfaces.IMovement import IMovement
 from IArena.interfaces.IGameRules import IGameRules
 from IArena.interfaces.PlayerIndex import PlayerIndex, two_player_game_change_player
 from IArena.interfaces.ScoreBoard import ScoreBoard
+from IArena.grader.RulesGenerator import IRulesGenerator
 from IArena.utils.decorators import override
+from IArena.utils.BitDomain import bits
 
 """
 This game represents the Hanoi Tower game.
-There are N towers and M pieces numerated from 1 to M.
+There are K towers (3 by default) and N pieces numerated from 0 to N-1.
 In each turn, the player can move one piece from one tower to another.
 There cannot be a bigger piece on top of a smaller piece.
 The end games when all the pieces are in the last tower.
 
 NOTE: Bigger pieces are the one with lower index.
+
+Positions keep, for each tower, an integer whose bit d is set if piece d is in it, so the top piece of a tower
+is its highest bit and moving a piece takes constant time. The tower of every piece is also packed into one integer,
+the key of the position, that identifies it for hashing and searching with little memory.
 """
 
 class HanoiPosition(CostPosition):
@@ -32,11 +38,55 @@ class HanoiPosition(CostPosition):
 
     def __init__(
             self,
-            rules: "IGameRules",
+            rules: "HanoiRules",
             towers: List[List[int]],
-            cost: CostType):
+            cost: CostType,
+            masks: Tuple[int, ...] = None,
+            key: int = None):
+        """
+        Args:
+            rules: Rules of the game.
+            towers: The pieces in each tower. Ignored if masks are given.
+            cost: The number of movements made so far.
+            masks: For each tower, the integer with bit d set if piece d is in it.
+            key: Packed tower of every piece, if already known.
+        """
         super().__init__(rules, cost)
-        self.towers = towers
+        if masks is None:
+            masks = [0] * len(towers)
+            for tower, pieces in enumerate(towers):
+                for piece in pieces:
+                    masks[tower] |= 1 << piece
+        self.masks_ = tuple(masks)
+        if key is None:
+            key = 0
+            for tower, mask in enumerate(self.masks_):
+                for piece in bits(mask):
+                    key |= tower << (rules.tower_bits_ * piece)
+        self.key_ = key
+
+    @property
+    def towers(self) -> List[List[int]]:
+        """The pieces in each tower, from the bottom one. New lists in each call."""
+        return [list(bits(mask)) for mask in self.masks_]
+
+    def key(self) -> int:
+        """Tower of every piece packed into an integer, the same for positions with the same pieces in each tower."""
+        return self.key_
+
+    def top(
+            self,
+            tower: int) -> int:
+        """Top piece of a tower, or -1 if it is empty."""
+        return self.masks_[tower].bit_length() - 1
+
+    def tower_of_pieces(self) -> List[int]:
+        """Tower of each piece."""
+        towers = [0] * self.get_rules().n
+        for tower, mask in enumerate(self.masks_):
+            for piece in bits(mask):
+                towers[piece] = tower
+        return towers
 
     @override
     def next_player(
@@ -46,19 +96,23 @@ class HanoiPosition(CostPosition):
     def __eq__(
             self,
             other: "HanoiPosition"):
-        return self.towers == other.towers and self.cost() == other.cost()
+        return self.key_ == other.key_ and self.cost() == other.cost()
+
+    def __hash__(self):
+        return hash(self.key_)
 
     def __str__(self):
 
-        max_height = max([len(tower) for tower in self.towers])
-        max_piece = max([max(tower, default=0) for tower in self.towers])+1
+        towers = self.towers
+        max_height = max([len(tower) for tower in towers])
+        max_piece = max([max(tower, default=0) for tower in towers])+1
         max_width = max_piece * 2
 
         st = ""
         st += f"Cost: {self.cost()}\n\n"
 
         for level in reversed(range(max_height)):
-            for tower in self.towers:
+            for tower in towers:
                 if level < len(tower):
                     piece_width = (max_piece - tower[level]) * 2
                     padding = (max_width - piece_width) // 2
@@ -67,7 +121,7 @@ class HanoiPosition(CostPosition):
                     st += " " * max_width + " "
             st += "\n"
 
-        for i, _ in enumerate(self.towers):
+        for i, _ in enumerate(towers):
             st += "=" * max_width + " "
 
         st += "\n"
@@ -100,22 +154,134 @@ class HanoiMovement(IMovement):
         return f'{{from: {self.tower_source}  to: {self.tower_target}}}'
 
 
+# Frame-Stewart movements and best split for each number of pieces, by number of towers
+_frame_stewart_tables: Dict[int, Tuple[List[int], List[int]]] = {}
+
+
+def _frame_stewart_table(
+        n: int,
+        towers: int) -> Tuple[List[int], List[int]]:
+    """
+    For every number of pieces i up to n (at least), the movements to move i pieces with the towers,
+    and how many of them are moved first to an auxiliary tower.
+    """
+    if towers < 3:
+        raise ValueError("There must be at least 3 towers")
+    if towers not in _frame_stewart_tables:
+        _frame_stewart_tables[towers] = ([0], [0])
+    moves, splits = _frame_stewart_tables[towers]
+
+    while len(moves) <= n:
+        i = len(moves)
+        if towers == 3:
+            best = i - 1
+            moves.append(2 * moves[best] + 1)
+        else:
+            fewer = _frame_stewart_table(i, towers - 1)[0]
+            best = min(range(i), key=lambda t: 2 * moves[t] + fewer[i - t])
+            moves.append(2 * moves[best] + fewer[i - best])
+        splits.append(best)
+
+    return moves, splits
+
+
+def frame_stewart_moves(
+        n: int,
+        towers: int = 3) -> int:
+    """
+    Movements of the Frame-Stewart algorithm to move n pieces from one tower to another.
+
+    It is the minimum for 3 towers (2^n - 1) and for 4 towers, and conjectured to be the minimum for more.
+    """
+    return _frame_stewart_table(n, towers)[0][n]
+
+
+def frame_stewart_solution(
+        n: int,
+        source: int,
+        target: int,
+        towers: List[int]) -> List[Tuple[int, int]]:
+    """
+    Movements (source tower, target tower) of the Frame-Stewart algorithm to move the n smallest pieces
+    from source to target, using the towers given (source and target included).
+    """
+    if n == 0:
+        return []
+    if n == 1:
+        return [(source, target)]
+
+    # Move the smallest pieces to an auxiliary tower, the rest without it, and the smallest ones back on top
+    first = _frame_stewart_table(n, len(towers))[1][n]
+    auxiliary = next(t for t in towers if t != source and t != target)
+    rest = [t for t in towers if t != auxiliary]
+    return (frame_stewart_solution(first, source, auxiliary, towers)
+            + frame_stewart_solution(n - first, source, target, rest)
+            + frame_stewart_solution(first, auxiliary, target, towers))
+
+
+def three_towers_moves(
+        tower_of_pieces: List[int],
+        target: int) -> int:
+    """
+    Minimum movements to take every piece to the target tower from any position with 3 towers.
+
+    The biggest piece out of the target must move there once, after every smaller piece is gathered in
+    the third tower, and those then move on top of it as a whole tower (2^k - 1 movements for k pieces).
+    """
+    moves = 0
+    n = len(tower_of_pieces)
+    for piece, tower in enumerate(tower_of_pieces):
+        if tower != target:
+            moves += 1 << (n - piece - 1)
+            target = 3 - tower - target
+    return moves
+
+
+def three_towers_solution(
+        tower_of_pieces: List[int],
+        target: int) -> List[Tuple[int, int]]:
+    """
+    Movements (source tower, target tower) of a minimum solution from any position with 3 towers,
+    following the same reasoning as three_towers_moves.
+    """
+    n = len(tower_of_pieces)
+    for piece, tower in enumerate(tower_of_pieces):
+        if tower != target:
+            other = 3 - tower - target
+            return (three_towers_solution(tower_of_pieces[piece + 1:], other)
+                    + [(tower, target)]
+                    + frame_stewart_solution(n - piece - 1, other, target, [0, 1, 2]))
+    return []
+
+
 class HanoiRules(IGameRules):
 
     DefaultPieces = 4
+    DefaultTowers = 3
 
     @staticmethod
-    def generate_initial_towers(n: int) -> List[List[int]]:
-        return [list(range(n)), [], []]
+    def generate_initial_towers(n: int, towers: int = DefaultTowers) -> List[List[int]]:
+        return [list(range(n))] + [[] for _ in range(towers - 1)]
 
     def __init__(
             self,
-            n: int = DefaultPieces):
+            n: int = DefaultPieces,
+            towers: int = DefaultTowers):
         """
         Args:
             n: The number of pieces in the game.
+            towers: The number of towers. The pieces start in the first one and must reach the last one.
         """
+        if towers < 3:
+            raise ValueError("There must be at least 3 towers")
         self.n = n
+        self.towers = towers
+        self.tower_bits_ = (towers - 1).bit_length()
+
+        # Every movement, so they are not created again in each position
+        self.__movements = [[HanoiMovement(i, j) for j in range(towers)] for i in range(towers)]
+        self.__goal_masks = tuple([0] * (towers - 1) + [(1 << n) - 1])
+        self.__first_key = self.first_position().key_
 
     @override
     def n_players(self) -> int:
@@ -125,7 +291,7 @@ class HanoiRules(IGameRules):
     def first_position(self) -> HanoiPosition:
         return HanoiPosition(
             rules=self,
-            towers=HanoiRules.generate_initial_towers(self.n),
+            towers=HanoiRules.generate_initial_towers(self.n, self.towers),
             cost=0)
 
     @override
@@ -133,41 +299,48 @@ class HanoiRules(IGameRules):
             self,
             movement: HanoiMovement,
             position: HanoiPosition) -> HanoiPosition:
+        if not self.is_movement_possible(movement, position):
+            raise ValueError(f"Invalid movement {movement} in position with towers {position.towers}")
 
-        new_position = HanoiPosition(
-            rules=self,
-            towers=position.towers.copy(),
-            cost=position.cost() + 1)
-
-        x = new_position.towers[movement.tower_source].pop()
-        new_position.towers[movement.tower_target].append(x)
+        source, target = movement.tower_source, movement.tower_target
+        piece = position.top(source)
+        masks = list(position.masks_)
+        masks[source] ^= 1 << piece
+        masks[target] |= 1 << piece
 
-        return new_position
+        return HanoiPosition(
+            rules=self,
+            towers=None,
+            cost=position.cost() + 1,
+            masks=masks,
+            key=position.key_ + ((target - source) << (self.tower_bits_ * piece)))
 
     @override
     def possible_movements(
             self,
             position: HanoiPosition) -> Iterator[HanoiMovement]:
-        movements_result = []
-        top_towers = [tower[-1] if len(tower) > 0 else -1 for tower in position.towers]
+        top_towers = [mask.bit_length() - 1 for mask in position.masks_]
+        return [
+            self.__movements[i][j]
+            for i in range(self.towers) for j in range(self.towers)
+            if i != j and top_towers[i] > top_towers[j]]
 
-        for i in range(len(position.towers)):
-            for j in range(len(position.towers)):
-                if i != j and (top_towers[i] > top_towers[j]):
-                    movements_result.append(HanoiMovement(i, j))
-
-        return movements_result
+    @override
+    def is_movement_possible(
+            self,
+            movement: HanoiMovement,
+            position: HanoiPosition) -> bool:
+        source, target = movement.tower_source, movement.tower_target
+        if source == target or not (0 <= source < self.towers and 0 <= target < self.towers):
+            return False
+        return position.masks_[source].bit_length() > position.masks_[target].bit_length()
 
     @override
     def finished(
             self,
             position: HanoiPosition) -> bool:
         # The game is finished when all the elements are in the last tower
-        # Thus, when all towers except last are empty
-        for tower in position.towers[:-1]:
-            if len(tower) > 0:
-                return False
-        return True
+        return position.masks_ == self.__goal_masks
 
 
     @override
@@ -177,3 +350,85 @@ class HanoiRules(IGameRules):
         s = ScoreBoard()
         s.add_score(PlayerIndex.FirstPlayer, position.cost())
         return s
+
+    def minimum_moves(
+            self,
+            position: HanoiPosition = None,
+            max_states: int = 1 << 20) -> int:
+        """
+        Minimum movements to finish the game from a position (by default the first one).
+
+        From the first position it is the Frame-Stewart number (proven minimum up to 4 towers).
+        From other positions it is computed directly with 3 towers, and with a breadth first search over
+        the keys of the positions otherwise, raising ValueError if it reaches more than max_states of them.
+        """
+        if position is None or position.key_ == self.__first_key:
+            return frame_stewart_moves(self.n, self.towers)
+        if self.towers == 3:
+            return three_towers_moves(position.tower_of_pieces(), self.towers - 1)
+        return len(self._search(position, max_states))
+
+    def solution(
+            self,
+            position: HanoiPosition = None,
+            max_states: int = 1 << 20) -> List[HanoiMovement]:
+        """
+        Movements of a solution from a position (by default the first one) with the moves of minimum_moves.
+        """
+        if position is None or position.key_ == self.__first_key:
+            moves = frame_stewart_solution(self.n, 0, self.towers - 1, list(range(self.towers)))
+        elif self.towers == 3:
+            moves = three_towers_solution(position.tower_of_pieces(), self.towers - 1)
+        else:
+            return self._search(position, max_states)
+        return [self.__movements[source][target] for source, target in moves]
+
+    def _search(
+            self,
+            position: HanoiPosition,
+            max_states: int) -> List[HanoiMovement]:
+        """Breadth first search from the position storing only the keys of the positions reached."""
+        parents = {position.key_: None}
+        queue = deque([position])
+        while queue:
+            current = queue.popleft()
+            if self.finished(current):
+                break
+            for movement in self.possible_movements(current):
+                following = self.next_position(movement, current)
+                if following.key_ not in parents:
+                    parents[following.key_] = (current.key_, movement)
+                    if len(parents) > max_states:
+                        raise ValueError(f"Search reached more than {max_states} positions")
+                    queue.append(following)
+
+        movements = []
+        key = current.key_
+        while parents[key] is not None:
+            key, movement = parents[key]
+            movements.append(movement)
+        return movements[::-1]
+
+
+class HanoiRulesGenerator(IRulesGenerator):
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        n = HanoiRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['n', 'pieces'],
+            default_value = HanoiRules.DefaultPieces,
+            type_cast = int,
+        )
+
+        towers = HanoiRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['towers', 'pegs'],
+            default_value = HanoiRules.DefaultTowers,
+            type_cast = int,
+        )
+
+        return HanoiRules(n=n, towers=towers)
@@ -1,7 +1,7 @@
 
-from typing import Dict, Iterator, List
+from typing import Dict, Iterator, List, Tuple
 import random
-from copy import deepcopy
+import numpy as np
 
 from IArena.interfaces.IPosition import IPosition
 from IArena.interfaces.IMovement import IMovement
@@ -19,8 +19,24 @@ Then in each round all players play its highest card, and wins the highest of th
 Players that has accurately bet the number of rounds won gets -5 points.
 Players that bet less than the number of rounds won gets 1 point for each round less.
 Players that bet more than the number of rounds won gets 2 point for each round more.
+
+The cards are dealt once in the rules, and every position shares them: a position only keeps the bets made,
+as a tuple of ints that each new bet extends.
 """
 
+
+def bet_score(
+        bet,
+        wins):
+    """
+    Score of betting a number of rounds and winning a number of rounds.
+    Works with ints, or with NumPy arrays of bets and wins.
+    """
+    bet = np.asarray(bet)
+    wins = np.asarray(wins)
+    score = np.where(bet == wins, -5, np.where(bet < wins, wins - bet, 2 * (bet - wins)))
+    return int(score) if score.ndim == 0 else score
+
 class HighestCardMovement(IMovement):
     """
     Represents the bet of the player.
@@ -52,67 +68,49 @@ class HighestCardPosition(IPosition):
 
     def __init__(
             self,
-            cards: Dict[PlayerIndex, List[int]] = None,
+            rules: "HighestCardRules",
+            cards: Tuple[Tuple[int]] = None,
             next_bet: HighestCardMovement = None,
             previous: "HighestCardPosition" = None):
+        super().__init__(rules)
         if cards is not None:
-            self.__cards = cards
-            self.__bet = {}
+            # Sorted cards of each player, shared by every position of the game
+            self.cards_ = cards
+            self.bets_ = ()
 
         else:
-            self.__cards = deepcopy(previous.__cards)
-            self.__bet = deepcopy(previous.__bet)
-            self.__bet[self.next_player()] = next_bet
+            self.cards_ = previous.cards_
+            self.bets_ = previous.bets_ + (next_bet.bet,)
 
     @override
     def next_player(
             self) -> PlayerIndex:
         # The next player is the one that has not bet yet
-        if self.__bet == {}:
-            return PlayerIndex.FirstPlayer
-        return max(self.__bet.keys()) + 1
+        return PlayerIndex(len(self.bets_))
 
     def get_cards(self) -> List[int]:
-        return deepcopy(self.__cards[self.next_player()])
+        return list(self.cards_[self.next_player()])
 
     def number_players(self) -> int:
-        return len(self.__cards)
+        return len(self.cards_)
 
     def number_cards(self) -> int:
-        return len(self.__cards[0])
+        return len(self.cards_[0])
 
     def __eq__(
             self,
             other: "HighestCardPosition"):
-        return self.__bet == other.__bet
+        return self.bets_ == other.bets_
 
     def __str__(self):
         # Print each guess in a line together with the correctness
-        return f'{{ Next player: {self.next_player()} | Cards: {self.__cards[self.next_player()]}}}'
+        return f'{{ Next player: {self.next_player()} | Cards: {list(self.cards_[self.next_player()])}}}'
 
     def _calculate_score(self) -> ScoreBoard:
-        # Calculate how many rounds each player has won
-        round_win = [0 for _ in range(self.number_players())]
-        for i in range(self.number_cards()):
-            max_player = -1
-            max_card = -1
-            for j in range(self.number_players()):
-                if self.__cards[j][i] > max_card:
-                    max_card = self.__cards[j][i]
-                    max_player = j
-            round_win[max_player] += 1
-
-        # Calculate the score of each player depending on its bet
-        score = {}
+        wins = self.rules.round_wins()
         score = ScoreBoard()
-        for i in range(self.number_players()):
-            if self.__bet[i].bet == round_win[i]:
-                score.add_score(i, -5)
-            elif self.__bet[i].bet < round_win[i]:
-                score.add_score(i, 1 * (round_win[i] - self.__bet[i].bet))
-            else:
-                score.add_score(i, 2 * (self.__bet[i].bet - round_win[i]))
-
+        for player, bet in enumerate(self.bets_):
+            score.add_score(player, bet_score(bet, wins[player]))
         return score
 
 
@@ -133,23 +131,24 @@ class HighestCardRules(IGameRules):
 
             random.shuffle(cards)
 
-            self.__cards = {}
+            cards_distribution = {}
 
             for i in range(n_players):
-                self.__cards[i] = []
+                cards_distribution[i] = []
                 for _ in range(m_cards):
-                    self.__cards[i].append(cards.pop())
-
-        else:
-            self.__cards = cards_distribution
+                    cards_distribution[i].append(cards.pop())
 
         # Sort the cards of each player
-        for i in range(n_players):
-            self.__cards[i].sort()
+        self.__cards = tuple(tuple(sorted(cards_distribution[i])) for i in range(len(cards_distribution)))
 
         self.n = len(self.__cards)
         self.m = len(self.__cards[0])
+        self.__deck = tuple(sorted(card for cards in self.__cards for card in cards))
 
+        # In each round every player plays its next highest card, so the rounds pair the cards by rank
+        winners = np.argmax(np.array(self.__cards), axis=0)
+        self.__wins = tuple(int(w) for w in np.bincount(winners, minlength=self.n))
+        self.__movements = [HighestCardMovement(i) for i in range(self.m + 1)]
 
     @override
     def n_players(self) -> int:
@@ -158,9 +157,18 @@ class HighestCardRules(IGameRules):
     def m_cards(self) -> int:
         return self.m
 
+    def deck(self) -> Tuple[int]:
+        """Every card of the game, sorted. By default, from 0 to N*M-1, but a given distribution may use any cards."""
+        return self.__deck
+
+    def round_wins(self) -> Tuple[int]:
+        """Number of rounds that each player wins."""
+        return self.__wins
+
     @override
     def first_position(self) -> HighestCardPosition:
         return HighestCardPosition(
+            rules=self,
             cards=self.__cards
         )
 
@@ -169,7 +177,10 @@ class HighestCardRules(IGameRules):
             self,
             movement: HighestCardMovement,
             position: HighestCardPosition) -> HighestCardPosition:
+        if not self.is_movement_possible(movement, position):
+            raise ValueError(f"Invalid bet {movement} with {self.m} cards")
         return HighestCardPosition(
+            rules=self,
             next_bet=movement,
             previous=position
         )
@@ -179,7 +190,14 @@ class HighestCardRules(IGameRules):
             self,
             position: HighestCardPosition) -> Iterator[HighestCardMovement]:
         # The possible movements are the numbers between 0 and M
-        return [HighestCardMovement(i) for i in range(self.m + 1)]
+        return self.__movements
+
+    @override
+    def is_movement_possible(
+            self,
+            movement: HighestCardMovement,
+            position: HighestCardPosition) -> bool:
+        return 0 <= movement.bet <= self.m
 
     @override
     def finished(
@@ -193,3 +211,25 @@ class HighestCardRules(IGameRules):
             self,
             position: HighestCardPosition) -> ScoreBoard:
         return position._calculate_score()
+
+    @override
+    def determinize(
+            self,
+            position: HighestCardPosition,
+            player: PlayerIndex,
+            rng: random.Random) -> HighestCardPosition:
+        # The cards of the rest of players are dealt again, in new rules with the same bets
+        hidden = [card for p, cards in enumerate(position.cards_) if p != player for card in cards]
+        rng.shuffle(hidden)
+        cards_distribution = {}
+        for p in range(self.n):
+            if p == player:
+                cards_distribution[p] = list(position.cards_[p])
+            else:
+                cards_distribution[p], hidden = hidden[:self.m], hidden[self.m:]
+        rules = HighestCardRules(cards_distribution=cards_distribution)
+
+        determinized = rules.first_position()
+        for bet in position.bets_:
+            determinized = HighestCardPosition(rules=rules, next_bet=HighestCardMovement(bet), previous=determinized)
+        return determinized
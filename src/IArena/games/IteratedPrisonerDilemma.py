@@ -0,0 +1,247 @@
+
+import random
+from typing import Iterator
+import numpy as np
+
+from IArena.interfaces.IPosition import IPosition
+from IArena.interfaces.IGameRules import IGameRules
+from IArena.interfaces.PlayerIndex import PlayerIndex
+from IArena.interfaces.ScoreBoard import ScoreBoard
+from IArena.games.PrisonerDilemma import PrisonerDilemmaMovement, PrisonerDilemmaScoreTable
+from IArena.grader.RulesGenerator import IRulesGenerator
+from IArena.utils.decorators import override
+from IArena.utils.BitDomain import popcount
+
+"""
+This game represents the Iterated Prisoner Dilemma.
+The same 2 players play a Prisoner Dilemma a fixed number of rounds, knowing the decisions of previous rounds.
+In each round, first player decides without knowing the decision of the second one, and then the second one.
+The score of each player is the sum of their scores in every round, so the goal is to minimize it.
+
+The decisions of each player are kept as the bits of an integer (bit r set if the player defected in round r),
+so a new position never copies the history, and the scores are computed by counting bits.
+"""
+
+
+class IteratedPrisonerDilemmaPosition(IPosition):
+    """
+    Represents the rounds already played.
+    The decision of the first player in the current round is hidden until the second player decides.
+    """
+
+    def __init__(
+            self,
+            rules: "IteratedPrisonerDilemmaRules",
+            last_position: "IteratedPrisonerDilemmaPosition" = None,
+            new_movement: PrisonerDilemmaMovement = None):
+        super().__init__(rules)
+        if last_position is None:
+            self.rounds_ = 0
+            # For each player, integer with bit r set if the player defected in round r
+            self.defections_ = (0, 0)
+            self.__pending = None
+        elif last_position.__pending is None:
+            self.rounds_ = last_position.rounds_
+            self.defections_ = last_position.defections_
+            self.__pending = new_movement
+        else:
+            played = last_position.rounds_
+            first, second = last_position.defections_
+            self.rounds_ = played + 1
+            self.defections_ = (
+                first | last_position.__pending.decision << played,
+                second | new_movement.decision << played)
+            self.__pending = None
+
+    @override
+    def next_player(
+            self) -> PlayerIndex:
+        if self.__pending is None:
+            return PlayerIndex.FirstPlayer
+        return PlayerIndex.SecondPlayer
+
+    def rounds(self) -> int:
+        """Number of rounds already played."""
+        return self.rounds_
+
+    def history(
+            self,
+            player: PlayerIndex) -> np.ndarray:
+        """Decisions of the player in each round played, 0 to cooperate and 1 to defect, as an int8 array."""
+        if self.rounds_ == 0:
+            return np.zeros(0, dtype=np.int8)
+        data = self.defections_[player].to_bytes((self.rounds_ + 7) // 8, 'little')
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')
+        return bits[:self.rounds_].astype(np.int8)
+
+    def last_decision(
+            self,
+            player: PlayerIndex) -> int:
+        """Decision of the player in the last round, or None if no round has been played."""
+        if self.rounds_ == 0:
+            return None
+        return self.defections_[player] >> (self.rounds_ - 1) & 1
+
+    def defections(
+            self,
+            player: PlayerIndex) -> int:
+        """Number of rounds in which the player defected."""
+        return popcount(self.defections_[player])
+
+    def with_hidden_decision(
+            self,
+            movement: PrisonerDilemmaMovement) -> "IteratedPrisonerDilemmaPosition":
+        """Same position with another decision of the first player in the current round, if it has decided."""
+        if self.__pending is None:
+            return self
+        position = IteratedPrisonerDilemmaPosition(self.rules)
+        position.rounds_ = self.rounds_
+        position.defections_ = self.defections_
+        position.__pending = movement
+        return position
+
+    def __eq__(
+            self,
+            other: "IteratedPrisonerDilemmaPosition"):
+        return (self.rounds_ == other.rounds_
+                and self.defections_ == other.defections_
+                and getattr(self.__pending, 'decision', None) == getattr(other.__pending, 'decision', None))
+
+    def __str__(self):
+        st = f"Round: {self.rounds_}  Player: {self.next_player()}\n"
+        for player in (PlayerIndex.FirstPlayer, PlayerIndex.SecondPlayer):
+            st += "".join("D" if d else "C" for d in self.history(player)) + "\n"
+        return st
+
+
+class IteratedPrisonerDilemmaRules(IGameRules):
+    """
+    Rules with the score table of each round and the number of rounds.
+    """
+
+    DefaultRounds = 200
+
+    def __init__(
+            self,
+            score_table: PrisonerDilemmaScoreTable = None,
+            rounds: int = DefaultRounds,
+            seed: int = None):
+        """
+        Args:
+            score_table: Score of each round. By default, random with the seed.
+            rounds: Number of rounds of the game.
+            seed: Seed of the random score table.
+        """
+        if score_table is None:
+            score_table = PrisonerDilemmaScoreTable.generate_random_table(seed)
+        self.score_table = score_table
+        self.rounds = rounds
+
+        self.__movements = [
+            PrisonerDilemmaMovement(PrisonerDilemmaMovement.Cooperate),
+            PrisonerDilemmaMovement(PrisonerDilemmaMovement.Defect)
+        ]
+
+    def get_score_table(self) -> PrisonerDilemmaScoreTable:
+        return self.score_table
+
+    def get_rounds(self) -> int:
+        return self.rounds
+
+    @override
+    def n_players(self) -> int:
+        return 2
+
+    @override
+    def first_position(self) -> IteratedPrisonerDilemmaPosition:
+        return IteratedPrisonerDilemmaPosition(rules=self)
+
+    @override
+    def next_position(
+            self,
+            movement: PrisonerDilemmaMovement,
+            position: IteratedPrisonerDilemmaPosition) -> IteratedPrisonerDilemmaPosition:
+        return IteratedPrisonerDilemmaPosition(
+            rules=self,
+            last_position=position,
+            new_movement=movement)
+
+    @override
+    def possible_movements(
+            self,
+            position: IteratedPrisonerDilemmaPosition) -> Iterator[PrisonerDilemmaMovement]:
+        return self.__movements
+
+    @override
+    def is_movement_possible(
+            self,
+            movement: PrisonerDilemmaMovement,
+            position: IteratedPrisonerDilemmaPosition) -> bool:
+        return movement.decision in (PrisonerDilemmaMovement.Cooperate, PrisonerDilemmaMovement.Defect)
+
+    @override
+    def finished(
+            self,
+            position: IteratedPrisonerDilemmaPosition) -> bool:
+        return position.rounds_ >= self.rounds
+
+    @override
+    def score(
+            self,
+            position: IteratedPrisonerDilemmaPosition) -> ScoreBoard:
+        first, second = position.defections_
+        both = popcount(first & second)
+        only_first = popcount(first) - both
+        only_second = popcount(second) - both
+        none = position.rounds_ - both - only_first - only_second
+
+        table = self.score_table.score_table
+        c, d = PrisonerDilemmaMovement.Cooperate, PrisonerDilemmaMovement.Defect
+        s = ScoreBoard()
+        s.add_score(PlayerIndex.FirstPlayer,
+                    none * table[c][c] + only_first * table[d][c] + only_second * table[c][d] + both * table[d][d])
+        s.add_score(PlayerIndex.SecondPlayer,
+                    none * table[c][c] + only_second * table[d][c] + only_first * table[c][d] + both * table[d][d])
+        return s
+
+    @override
+    def determinize(
+            self,
+            position: IteratedPrisonerDilemmaPosition,
+            player: PlayerIndex,
+            rng: random.Random) -> IteratedPrisonerDilemmaPosition:
+        # Only the decision of the first player in the current round is hidden, to the second one
+        if player == PlayerIndex.FirstPlayer:
+            return position
+        return position.with_hidden_decision(PrisonerDilemmaMovement(rng.randint(0, 1)))
+
+
+class IteratedPrisonerDilemmaRulesGenerator(IRulesGenerator):
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        rounds = IteratedPrisonerDilemmaRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'rounds',
+            default_value = IteratedPrisonerDilemmaRules.DefaultRounds,
+            type_cast = int,
+        )
+
+        classic = IteratedPrisonerDilemmaRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'classic',
+            default_value = False,
+            type_cast = bool,
+        )
+
+        seed = IteratedPrisonerDilemmaRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'seed',
+            type_cast = int,
+        )
+
+        score_table = PrisonerDilemmaScoreTable.classic_table() if classic else None
+        return IteratedPrisonerDilemmaRules(score_table=score_table, rounds=rounds, seed=seed)
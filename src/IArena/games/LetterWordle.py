@@ -1,8 +1,7 @@
 
 import copy
-from typing import Iterator, List
+from typing import List
 from enum import Enum
-import itertools
 
 from IArena.grader.RulesGenerator import IRulesGenerator
 from IArena.interfaces.IPlayer import IPlayer
@@ -13,6 +12,9 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.games.Wordle import WordleRules
 
 """
 This game represents the Wordle game with exact tips.
@@ -27,11 +29,11 @@ NOTE:
 3. The game tells for each guess exactly which letters are correct and in the right position.
 """
 
-def __number_to_letter(number: int) -> str:
+def _number_to_letter(number: int) -> str:
     return chr(ord('a') + number)
 
-def __code_to_letters(code: List[int]) -> List[str]:
-    return [__number_to_letter(x) for x in code]
+def _code_to_letters(code: List[int]) -> List[str]:
+    return [_number_to_letter(x) for x in code]
 
 class LetterWordleMovement(IMovement):
     """
@@ -75,8 +77,8 @@ class LetterWordlePosition(IPosition):
             guesses: List[LetterWordleMovement],
             feedback: List[List[LetterWordleFeedback]]):
         super().__init__(rules)
-        self._guesses = guesses
-        self._feedback = feedback
+        self._guesses = PersistentHistory.of(guesses)
+        self._feedback = PersistentHistory.of(feedback)
 
     @override
     def next_player(
@@ -94,23 +96,23 @@ class LetterWordlePosition(IPosition):
             return "<EMPTY POSITION>\n"
 
         # Print each guess in a line together with the feedback
-        return "\n".join([f'{self._guesses[i]} : {[x.name for x in self._feedback[i]]}' for i in range(len(self._guesses))]) + "\n"
+        return "\n".join([f'{guess} : {[x.name for x in feedback]}' for guess, feedback in zip(self._guesses, self._feedback)]) + "\n"
 
     def guesses(self) -> List[LetterWordleMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def feedback(self) -> List[List[LetterWordleFeedback]]:
-        return copy.deepcopy(self._feedback)
+        return copy.deepcopy(self._feedback.to_list())
 
     def last_guess(self) -> LetterWordleMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def last_feedback(self) -> List[LetterWordleFeedback]:
         if len(self._feedback) == 0:
             return None
-        return copy.deepcopy(self._feedback[-1])
+        return copy.deepcopy(self._feedback.last())
 
     def code_size(self) -> int:
         return self.get_rules().code_size()
@@ -125,6 +127,10 @@ class LetterWordlePosition(IPosition):
         return self.get_rules().possible_letters()
 
 
+# Feedback of the letter game for each value of the numeric feedback
+_LETTER_FEEDBACK = tuple(LetterWordlePosition.LetterWordleFeedback(i) for i in range(3))
+
+
 class LetterWordleRules(IGameRules):
 
     DefaultCodeSize = 5
@@ -139,7 +145,7 @@ class LetterWordleRules(IGameRules):
         if not allow_repetition and code_size > letters:
             raise ValueError("n must be less than or equal to m when allow_repetition is False")
         if allow_repetition:
-            return [rng.randint(letters) for _ in range(code_size)]
+            return _code_to_letters([rng.randint(letters) for _ in range(code_size)])
         else:
             possible_letters = set(range(letters))
             letters = []
@@ -147,7 +153,7 @@ class LetterWordleRules(IGameRules):
                 letter = rng.choice(list(possible_letters))
                 letters.append(letter)
                 possible_letters.remove(letter)
-            return __code_to_letters(letters)
+            return _code_to_letters(letters)
 
     @staticmethod
     def _is_correct_secret(
@@ -167,7 +173,7 @@ class LetterWordleRules(IGameRules):
             return False
         if any(ord(x) < ord('a') or ord(x) >= ord('a') + letters for x in secret):
             if throw:
-                raise ValueError(f"Secret must have letters from 'a' to '{__number_to_letter(letters - 1)}'")
+                raise ValueError(f"Secret must have letters from 'a' to '{_number_to_letter(letters - 1)}'")
             return False
         if not allow_repetition and len(set(secret)) != code_size:
             if throw:
@@ -217,9 +223,26 @@ class LetterWordleRules(IGameRules):
                 throw=True,
         )
 
-        self.__secret = secret
+        # Letters are handled as integers, and only appear in the movements
+        self.letters_ = tuple(_code_to_letters(range(letters)))
+        self.__letter_values = {letter: i for i, letter in enumerate(self.letters_)}
         self.allow_repetition_ = allow_repetition
 
+        # The numeric game with the secret as integers computes the feedback
+        self.__numeric_rules = WordleRules(
+            code_size=self.n,
+            number_values=self.m,
+            secret=self.to_values(secret),
+            allow_repetition=allow_repetition)
+
+        # Every code of n values, built lazily: indexable, sampleable and with constant time membership
+        self.code_space_ = CodeSpace(
+            code_size=self.n,
+            number_values=self.m,
+            allow_repetition=self.allow_repetition_,
+            movement_type=LetterWordleMovement,
+            symbols=self.letters_)
+
     def letters(self) -> int:
         return self.m
 
@@ -230,7 +253,19 @@ class LetterWordleRules(IGameRules):
         return self.allow_repetition_
 
     def possible_letters(self) -> List[str]:
-        return [__number_to_letter(i) for i in range(self.m)]
+        return list(self.letters_)
+
+    def to_values(
+            self,
+            letters: List[str]) -> List[int]:
+        """Number of each letter of a code, from 0 for 'a'."""
+        return [self.__letter_values[x] for x in letters]
+
+    def to_letters(
+            self,
+            values: List[int]) -> List[str]:
+        """Letters of a code given by the number of each letter, from 0 for 'a'."""
+        return [self.letters_[x] for x in values]
 
     @override
     def n_players(self) -> int:
@@ -245,68 +280,57 @@ class LetterWordleRules(IGameRules):
             self,
             movement: LetterWordleMovement,
             position: LetterWordlePosition) -> LetterWordlePosition:
-        guesses = position.guesses() + [movement]
+        guesses = position._guesses.append(movement)
 
-        # Check if the movement is valid
-        if len(movement.guess) != self.n or any(x < 0 or x >= self.m for x in movement.guess):
-            raise ValueError(f"Movement must be of size {self.n} and with numbers from 0 to {self.m-1}")
-        if not self.allow_repetition_ and len(set(movement.guess)) != self.n:
-            raise ValueError("Movement must not have repetitions when allow_repetition is False")
+        # Check if the movement is valid, converting it into integers
+        values = self.code_space_.code(movement)
+        if values is None:
+            if len(movement.guess) == self.n and all(x in self.__letter_values for x in movement.guess):
+                raise ValueError("Movement must not have repetitions when allow_repetition is False")
+            raise ValueError(f"Movement must be of size {self.n} and with letters from 'a' to '{_number_to_letter(self.m-1)}'")
 
         # Calculate the feedback of the new guess
-        feedback = [LetterWordlePosition.LetterWordleFeedback.Wrong for _ in range(self.n)]
-        already_placed = [False for _ in range(self.n)]
-        possible_misplaced = []
-        for i in range(self.n):
-            if movement.guess[i] == self.__secret[i]:
-                feedback[i] = LetterWordlePosition.LetterWordleFeedback.Correct
-                already_placed[i] = True
-            elif movement.guess[i] in self.__secret:
-                possible_misplaced.append(i)
-
-        for i in possible_misplaced:
-            # Check if such number is in secret in a position that has already not being checked
-            for j in range(self.n):
-                if not already_placed[j] and movement.guess[i] == self.__secret[j]:
-                    already_placed[j] = True
-                    feedback[i] = LetterWordlePosition.LetterWordleFeedback.Misplaced
-                    break
-
-        new_feedback = copy.deepcopy(position.feedback())
-        new_feedback.append(feedback)
+        feedback = self._calculate_feedback(values)
+
+        new_feedback = position._feedback.append(feedback)
 
         return LetterWordlePosition(self, guesses, new_feedback)
 
+    def _calculate_feedback(
+            self,
+            guess: List[int]) -> List[LetterWordlePosition.LetterWordleFeedback]:
+        """Feedback of each position of a guess given as letter numbers."""
+        return [_LETTER_FEEDBACK[x.value] for x in self.__numeric_rules._calculate_feedback(guess)]
+
     @override
     def possible_movements(
             self,
-            position: LetterWordlePosition) -> Iterator[LetterWordleMovement]:
+            position: LetterWordlePosition) -> CodeSpace:
+        return self.code_space_
 
-        if self.allow_repetition_:
-            # Every combination of n numbers from 0 to m-1 using itertools
-            for x in itertools.product(range(self.m), repeat=self.n):
-                yield LetterWordleMovement(guess=__code_to_letters(x))
-
-        else:
-            # Every permutation of n numbers from 0 to m-1 using itertools
-            for x in itertools.permutations(range(self.m), self.n):
-                yield LetterWordleMovement(guess=__code_to_letters(x))
+    @override
+    def is_movement_possible(
+            self,
+            movement: LetterWordleMovement,
+            position: LetterWordlePosition) -> bool:
+        # Only checks the size and values of the code, without enumerating the space
+        return movement in self.code_space_
 
     @override
     def finished(
             self,
             position: LetterWordlePosition) -> bool:
-        # Game is finished if the last guess is equal the hidden secret
-        if len(position.guesses()) == 0:
+        # Game is finished if the last guess is equal the hidden secret, so every letter is correct
+        if len(position._feedback) == 0:
             return False
-        return position.guesses()[-1].guess == self.__secret
+        return all(x == LetterWordlePosition.LetterWordleFeedback.Correct for x in position._feedback.last())
 
     @override
     def score(
             self,
             position: LetterWordlePosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
@@ -1,8 +1,8 @@
 
 import copy
-from typing import Iterator, List, Set
+from collections import Counter
+from typing import List, Set
 from enum import Enum
-import itertools
 from dataclasses import dataclass
 
 from IArena.grader.RulesGenerator import IRulesGenerator
@@ -14,6 +14,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
+from IArena.utils.CodeSpace import CodeSpace
 
 """
 This game represents the Mastermind game with exact tips.
@@ -69,8 +71,8 @@ class MastermindPosition(IPosition):
             guesses: List[MastermindMovement],
             feedback: List[List[MastermindFeedback]]):
         super().__init__(rules)
-        self._guesses = guesses
-        self._feedback = feedback
+        self._guesses = PersistentHistory.of(guesses)
+        self._feedback = PersistentHistory.of(feedback)
 
     @override
     def next_player(
@@ -89,26 +91,26 @@ class MastermindPosition(IPosition):
 
         # Print each guess in a line together with the feedback
         st = ""
-        for i in range(len(self._guesses)):
-            feedback_str = f'Correct: {self._feedback[i].correct}, Misplaced: {self._feedback[i].misplaced}'
-            st += f'Guess {i}: {self._guesses[i]} | Feedback: {feedback_str}\n'
+        for i, (guess, feedback) in enumerate(zip(self._guesses, self._feedback)):
+            feedback_str = f'Correct: {feedback.correct}, Misplaced: {feedback.misplaced}'
+            st += f'Guess {i}: {guess} | Feedback: {feedback_str}\n'
         return st
 
     def guesses(self) -> List[MastermindMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def feedback(self) -> List[MastermindFeedback]:
-        return copy.deepcopy(self._feedback)
+        return copy.deepcopy(self._feedback.to_list())
 
     def last_guess(self) -> MastermindMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def last_feedback(self) -> MastermindFeedback:
         if len(self._feedback) == 0:
             return None
-        return copy.deepcopy(self._feedback[-1])
+        return copy.deepcopy(self._feedback.last())
 
     def code_size(self) -> int:
         return self.get_rules().code_size()
@@ -182,8 +184,17 @@ class MastermindRules(IGameRules):
         if not allow_repetition and len(set(secret)) != code_size:
             raise ValueError("Secret must not have repetitions when allow_repetition is False")
         self.__secret = secret
+        # Secret indexed by value, so the feedback of a guess is computed in linear time
+        self.__secret_histogram = Counter(secret)
         self.allow_repetition_ = allow_repetition
 
+        # Every code of n values, built lazily: indexable, sampleable and with constant time membership
+        self.code_space_ = CodeSpace(
+            code_size=self.n,
+            number_values=self.m,
+            allow_repetition=self.allow_repetition_,
+            movement_type=MastermindMovement)
+
     def number_values(self) -> int:
         return self.m
 
@@ -206,8 +217,7 @@ class MastermindRules(IGameRules):
             self,
             movement: MastermindMovement,
             position: MastermindPosition) -> MastermindPosition:
-        guesses = position.guesses() + [movement]
-        old_feedback = position.feedback()
+        guesses = position._guesses.append(movement)
 
         # Check if the movement is valid
         if len(movement.guess) != self.n or any(x < 0 or x >= self.m for x in movement.guess):
@@ -216,59 +226,61 @@ class MastermindRules(IGameRules):
             raise ValueError(f"Movement must not have repetitions when allow_repetition is False. Incorrect movement: {movement}")
 
         # Calculate the feedback of the new guess
-        new_feedback = MastermindPosition.MastermindFeedback()
-        secret_copy = self.__secret.copy()
-        guess_copy = movement.guess.copy()
-        # First pass: check for correct positions
-        for i in range(self.n):
-            if guess_copy[i] == secret_copy[i]:
-                new_feedback.correct += 1
-                secret_copy[i] = -1
-                guess_copy[i] = -2
-        # Second pass: check for misplaced positions
-        for i in range(self.n):
-            if guess_copy[i] in secret_copy:
-                new_feedback.misplaced += 1
-                secret_index = secret_copy.index(guess_copy[i])
-                secret_copy[secret_index] = -1
-                guess_copy[i] = -2
+        new_feedback = self._calculate_feedback(movement.guess)
 
         # Append the new feedback to the list of feedbacks
-        feedback = copy.deepcopy(position.feedback())
-        feedback.append(new_feedback)
+        feedback = position._feedback.append(new_feedback)
 
         return MastermindPosition(self, guesses, feedback)
 
+    def _calculate_feedback(
+            self,
+            guess: List[int]) -> MastermindPosition.MastermindFeedback:
+        """Number of correct and misplaced values of a guess, in two linear passes."""
+        feedback = MastermindPosition.MastermindFeedback()
+        # Values of the secret not matched yet
+        available = self.__secret_histogram.copy()
+        # First pass: check for correct positions
+        for i in range(self.n):
+            if guess[i] == self.__secret[i]:
+                feedback.correct += 1
+                available[guess[i]] -= 1
+        # Second pass: check for misplaced positions
+        for i in range(self.n):
+            if guess[i] != self.__secret[i] and available[guess[i]] > 0:
+                feedback.misplaced += 1
+                available[guess[i]] -= 1
+        return feedback
+
     @override
     def possible_movements(
             self,
-            position: MastermindPosition) -> Iterator[MastermindMovement]:
+            position: MastermindPosition) -> CodeSpace:
+        return self.code_space_
 
-        if self.allow_repetition_:
-            # Every combination of n numbers from 0 to m-1 using itertools
-            for x in itertools.product(range(self.m), repeat=self.n):
-                yield MastermindMovement(guess=list(x))
-
-        else:
-            # Every permutation of n numbers from 0 to m-1 using itertools
-            for x in itertools.permutations(range(self.m), self.n):
-                yield MastermindMovement(guess=list(x))
+    @override
+    def is_movement_possible(
+            self,
+            movement: MastermindMovement,
+            position: MastermindPosition) -> bool:
+        # Only checks the size and values of the code, without enumerating the space
+        return movement in self.code_space_
 
     @override
     def finished(
             self,
             position: MastermindPosition) -> bool:
         # Game is finished if the last guess is equal the hidden secret
-        if len(position.guesses()) == 0:
+        if len(position._guesses) == 0:
             return False
-        return position.guesses()[-1].guess == self.__secret
+        return position._guesses.last().guess == self.__secret
 
     @override
     def score(
             self,
             position: MastermindPosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
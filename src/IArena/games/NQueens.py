@@ -11,6 +11,10 @@ from IArena.interfaces.ScoreBoard import ScoreBoard
 """
 This game represents the NQueens game.
 In a chessboard of NxN, N queens must be placed in a way that no queen can attack another.
+
+Positions count the queens in each row, column and diagonal, and keep a bitmask of the occupied columns
+of each row. Placing a queen updates them and the number of attacks in constant time,
+so the score never goes through every pair of queens.
 """
 
 class NQueensPosition(IPosition):
@@ -24,11 +28,82 @@ class NQueensPosition(IPosition):
     def __init__(
             self,
             rules: "NQueensRules",
-            positions: List[tuple[int, int]] = []) -> None:
+            positions: List[tuple[int, int]] = [],
+            previous: "NQueensPosition" = None) -> None:
+        """
+        Args:
+            rules: Rules of the game.
+            positions: List of (x,y) positions of the queens.
+            previous: Position with every queen but the last one, to copy its counters instead of counting again.
+        """
         super().__init__(rules)
         self.n = rules.get_size()
         self.positions = positions
 
+        if previous is not None:
+            self.rows_ = previous.rows_.copy()
+            self.columns_ = previous.columns_.copy()
+            self.diagonals_ = previous.diagonals_.copy()
+            self.anti_diagonals_ = previous.anti_diagonals_.copy()
+            self.occupied_ = previous.occupied_.copy()
+            self.attacks_ = previous.attacks_
+            square = tuple(positions[-1])
+            same = sum(1 for queen in previous.positions if tuple(queen) == square) if previous.is_occupied(square) else 0
+            self._place(square, same)
+            return
+
+        # Queens in each row, column, diagonal (x - y + n - 1) and anti diagonal (x + y)
+        self.rows_ = [0] * self.n
+        self.columns_ = [0] * self.n
+        self.diagonals_ = [0] * (2 * self.n - 1)
+        self.anti_diagonals_ = [0] * (2 * self.n - 1)
+        # Bit y of occupied_[x] is set if there is a queen in (x,y)
+        self.occupied_ = [0] * self.n
+        self.attacks_ = 0
+        placed = {}
+        for square in positions:
+            square = tuple(square)
+            self._place(square, placed.get(square, 0))
+            placed[square] = placed.get(square, 0) + 1
+
+    def _place(
+            self,
+            square: tuple[int, int],
+            same: int):
+        """
+        Add a queen to the counters, with the number of queens already in its square.
+        Only while creating the position, as positions must not change.
+        """
+        # Queens in the same square count in the four lines, but do not attack each other
+        self.attacks_ += 2 * (self.attackers(square) - 4 * same)
+        x, y = square
+        self.rows_[x] += 1
+        self.columns_[y] += 1
+        self.diagonals_[x - y + self.n - 1] += 1
+        self.anti_diagonals_[x + y] += 1
+        self.occupied_[x] |= 1 << y
+
+    def attackers(
+            self,
+            square: tuple[int, int]) -> int:
+        """
+        Number of queens in the row, column or diagonals of the square.
+        Those are the queens that would attack a queen placed in it, if the square is empty.
+        """
+        x, y = square
+        return self.rows_[x] + self.columns_[y] + self.diagonals_[x - y + self.n - 1] + self.anti_diagonals_[x + y]
+
+    def is_occupied(
+            self,
+            square: tuple[int, int]) -> bool:
+        """Whether there is a queen in the square."""
+        x, y = square
+        return bool(self.occupied_[x] >> y & 1)
+
+    def attacks(self) -> int:
+        """Score of the position: for each queen, the number of other queens it attacks."""
+        return self.attacks_
+
     @override
     def next_player(
             self) -> PlayerIndex:
@@ -88,6 +163,8 @@ class NQueensRules(IGameRules):
             n: Size of the board = nxn
         """
         self.n = n
+        # Every movement, created the first time they are required
+        self.__movements = None
 
     def __len__(self):
         return self.n
@@ -108,13 +185,29 @@ class NQueensRules(IGameRules):
             self,
             movement: NQueensMovement,
             position: NQueensPosition) -> NQueensPosition:
-        return NQueensPosition(self, position.positions + [movement.new_position])
+        if not self.is_movement_possible(movement, position):
+            raise ValueError(f"Invalid movement {movement} in a board of size {self.n}")
+
+        return NQueensPosition(
+            self,
+            position.positions + [tuple(movement.new_position)],
+            previous=position)
 
     @override
     def possible_movements(
             self,
             position: NQueensPosition) -> Iterator[NQueensMovement]:
-        return [NQueensMovement((x, y)) for x in range(self.n) for y in range(self.n)]
+        if self.__movements is None:
+            self.__movements = [NQueensMovement((x, y)) for x in range(self.n) for y in range(self.n)]
+        return self.__movements
+
+    @override
+    def is_movement_possible(
+            self,
+            movement: NQueensMovement,
+            position: NQueensPosition) -> bool:
+        x, y = movement.new_position
+        return 0 <= x < self.n and 0 <= y < self.n
 
     @override
     def finished(
@@ -128,24 +221,6 @@ class NQueensRules(IGameRules):
             self,
             position: NQueensPosition) -> ScoreBoard:
         # Sum 1 for each queen that is attacking other
-        attacks = 0
-
-        # For each queen
-        for x, y in position.positions:
-            # For each other
-            for x2, y2 in position.positions:
-                if not (x == x2 and y == y2):
-
-                    # Check if it not attacking other horizontally
-                    if x == x2:
-                        attacks += 1
-                    # Check if it not attacking other vertically
-                    if y == y2:
-                        attacks += 1
-                    # Check if it not attacking other diagonally
-                    if abs(x - x2) == abs(y - y2):
-                        attacks += 1
-
         s = ScoreBoard()
-        s.add_score(PlayerIndex.FirstPlayer, attacks)
+        s.add_score(PlayerIndex.FirstPlayer, position.attacks())
         return s
@@ -151,6 +151,14 @@ class NimRules(IGameRules):
 
         return movements_result
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: NimMovement,
+            position: NimPosition) -> bool:
+        return (0 <= movement.line_index < len(position.lines)
+                and 1 <= movement.remove <= position.lines[movement.line_index])
+
     @override
     def finished(
             self,
@@ -13,6 +13,7 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
 
 """
 This game represents the NumberGuess game.
@@ -58,7 +59,7 @@ class NumberGuessPosition(IPosition):
             rules: "NumberGuessRules",
             guesses: List[NumberGuessMovement]):
         super().__init__(rules)
-        self._guesses = guesses
+        self._guesses = PersistentHistory.of(guesses)
 
     @override
     def next_player(
@@ -76,15 +77,15 @@ class NumberGuessPosition(IPosition):
             return "<EMPTY POSITION>\n"
 
         # Print each guess in a line together with the feedback
-        return "{" + ", ".join([f'{self._guesses[i]}' for i in range(len(self._guesses))]) + "}"
+        return "{" + ", ".join([f'{guess}' for guess in self._guesses]) + "}"
 
     def guesses(self) -> List[NumberGuessMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def last_guess(self) -> NumberGuessMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def number_values(self) -> int:
         return self.get_rules().number_values()
@@ -142,7 +143,7 @@ class NumberGuessRules(IGameRules):
             raise ValueError(f"Movement must be between 0 and {self.m-1}")
 
         # Create new list of guesses
-        guesses = position.guesses() + [movement]
+        guesses = position._guesses.append(movement)
 
         return NumberGuessPosition(self, guesses)
 
@@ -155,6 +156,13 @@ class NumberGuessRules(IGameRules):
         for i in range(self.m):
             yield NumberGuessMovement(i)
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: NumberGuessMovement,
+            position: NumberGuessPosition) -> bool:
+        return 0 <= movement.guess < self.m
+
     @override
     def finished(
             self,
@@ -169,7 +177,7 @@ class NumberGuessRules(IGameRules):
             self,
             position: NumberGuessPosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
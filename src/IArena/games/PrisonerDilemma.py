@@ -2,6 +2,7 @@
 from typing import Dict, Iterator
 from enum import Enum
 import random
+import numpy as np
 
 from IArena.interfaces.IPosition import IPosition
 from IArena.interfaces.IMovement import IMovement
@@ -86,6 +87,28 @@ class PrisonerDilemmaScoreTable:
             }
         })
 
+    def classic_table() -> "PrisonerDilemmaScoreTable":
+        """
+        Table of the tournaments of Axelrod, whose payoffs are 3 (both cooperate), 5 (defect against cooperation),
+        1 (both defect) and 0 (cooperate against defection), as scores to minimize: 5 minus the payoff.
+        """
+        return PrisonerDilemmaScoreTable({
+            PrisonerDilemmaMovement.Cooperate: {
+                PrisonerDilemmaMovement.Cooperate: 2,
+                PrisonerDilemmaMovement.Defect: 5
+            },
+            PrisonerDilemmaMovement.Defect: {
+                PrisonerDilemmaMovement.Cooperate: 0,
+                PrisonerDilemmaMovement.Defect: 4
+            }
+        })
+
+    def as_matrix(self) -> np.ndarray:
+        """Scores as a 2x2 array, indexed by the decision of the player and the decision of the opponent."""
+        return np.array([
+            [self.score_table[player][opponent] for opponent in (PrisonerDilemmaMovement.Cooperate, PrisonerDilemmaMovement.Defect)]
+            for player in (PrisonerDilemmaMovement.Cooperate, PrisonerDilemmaMovement.Defect)], dtype=float)
+
     def score(self, player_movement: PrisonerDilemmaMovement, opponent_movement: PrisonerDilemmaMovement) -> float:
         return self.score_table[player_movement.decision][opponent_movement.decision]
 
@@ -196,6 +219,13 @@ class PrisonerDilemmaRules(IGameRules):
             PrisonerDilemmaMovement(PrisonerDilemmaMovement.Defect)
         ]
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: PrisonerDilemmaMovement,
+            position: PrisonerDilemmaPosition) -> bool:
+        return movement.decision in (PrisonerDilemmaMovement.Cooperate, PrisonerDilemmaMovement.Defect)
+
     @override
     def finished(
             self,
@@ -212,3 +242,15 @@ class PrisonerDilemmaRules(IGameRules):
         s.add_score(PlayerIndex.SecondPlayer, scores[PlayerIndex.SecondPlayer])
 
         return s
+
+    @override
+    def determinize(
+            self,
+            position: PrisonerDilemmaPosition,
+            player: PlayerIndex,
+            rng: random.Random) -> PrisonerDilemmaPosition:
+        # Only the decision of the first player is hidden, to the second one
+        if player == PlayerIndex.FirstPlayer or not position.first_player_already_played() \
+                or position.second_player_already_played():
+            return position
+        return self.next_position(PrisonerDilemmaMovement(rng.randint(0, 1)), self.first_position())
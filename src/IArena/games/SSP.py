@@ -11,6 +11,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.utils.decorators import override
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.grader.RulesGenerator import IRulesGenerator
+from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.SSPSolver import SSPSolver
 
 """
 This game represents the Subset Sum Problem (SSP) as a one-player game
@@ -43,7 +45,7 @@ class SSPPosition(IPosition):
         return deepcopy(self.selected_)
 
     def __eq__(self, other: "SSPPosition"):
-        return self.coins_ == other.coins_
+        return self.selected_ == other.selected_ and self.finished_ == other.finished_
 
     def __str__(self):
         # Create a table with coins and if they are selected or not
@@ -126,7 +128,7 @@ class SSPRules(IGameRules):
                 raise ValueError(f"Invalid coin index {movement.coin_index}.")
 
             # Check if the coin has already been selected
-            if movement.coin_index in position.selected():
+            if movement.coin_index in position.selected_:
                 raise ValueError(f"Coin index {movement.coin_index} has already been selected.")
 
             # Create a new position with the selected coin added
@@ -143,12 +145,24 @@ class SSPRules(IGameRules):
             return iter([])
         else:
             # Possible movements are selecting any unselected coin or finishing the selection
-            unselected_indices = [i for i in range(len(self.coins_)) if i not in position.selected()]
+            unselected_indices = [i for i in range(len(self.coins_)) if i not in position.selected_]
             for index in unselected_indices:
                 yield SSPMovement(coin_index=index)
             yield SSPMovement(finish=True)
 
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: SSPMovement,
+            position: SSPPosition) -> bool:
+        if position.finished_:
+            return False
+        if movement.finish:
+            return movement.coin_index is None
+        return 0 <= movement.coin_index < len(self.coins_) and movement.coin_index not in position.selected_
+
+
     @override
     def finished(
             self,
@@ -177,8 +191,12 @@ class SSPRules(IGameRules):
         return self.target_
 
 
+    def minimum_loss(self) -> int:
+        """Difference between the target and the maximum sum of coins that does not exceed it."""
+        return self.target_ - SSPSolver(self.coins_, self.target_).solve()[0]
+
     def coins_value(self, position: SSPPosition) -> int:
-        return sum(self.coins_[i] for i in position.selected())
+        return sum(self.coins_[i] for i in position.selected_)
 
 
 
@@ -220,6 +238,10 @@ class SSPPlayablePlayer(IPlayer):
 
 
 class SSPRulesGenerator(IRulesGenerator):
+    """
+    Generates SSP rules with the coins given, or with random coins from a seed if there are none.
+    Random coins are n values from 1 to max_value (by default, the target).
+    """
 
     @override
     def generate(
@@ -236,9 +258,33 @@ class SSPRulesGenerator(IRulesGenerator):
         coins = SSPRulesGenerator._get_param(
             configuration=configuration,
             param_names = ['coins', 'numbers'],
-            required = True,
         )
 
+        if coins is None:
+            n = SSPRulesGenerator._get_param(
+                configuration=configuration,
+                param_names = ['n', 'n_coins'],
+                required = True,
+                type_cast = int,
+            )
+
+            max_value = SSPRulesGenerator._get_param(
+                configuration=configuration,
+                param_name = 'max_value',
+                default_value = target,
+                type_cast = int,
+            )
+
+            seed = SSPRulesGenerator._get_param(
+                configuration=configuration,
+                param_name = 'seed',
+                required = True,
+                type_cast = int,
+            )
+
+            rng = RandomGenerator(seed)
+            coins = [rng.randint(max_value + 1, 1) for _ in range(n)]
+
         return SSPRules(
             coins = coins,
             target = target
@@ -1,6 +1,7 @@
 
-from typing import Iterator, List
+from typing import Iterator, List, Tuple
 from enum import Enum
+import math
 import random
 
 from IArena.interfaces.IPosition import CostPosition, CostType
@@ -9,6 +10,8 @@ from IArena.interfaces.IGameRules import IGameRules
 from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
+from IArena.grader.RulesGenerator import IRulesGenerator
+from IArena.utils.SlicingSolver import solver_for
 
 """
 This game represents the SlicingPuzzle game.
@@ -22,21 +25,44 @@ class SlicingPuzzlePosition(CostPosition):
     This is the grid NxN with NxN-1 numerated squares.
     The empty space is the -1.
     The not empty numbers go from 1 to NxN-1.
+
+    The board is kept as an immutable flat tuple, row after row, together with the index of the empty space,
+    so positions are hashable and moving a square does not search the board.
     """
     def __init__(
             self,
             rules: "SlicingPuzzleRules",
             squares: List[List[int]],
-            cost: CostType) -> None:
+            cost: CostType,
+            blank: int = None) -> None:
+        """
+        Args:
+            rules: Rules of the game.
+            squares: Board as a list of rows, or already flattened in a tuple.
+            cost: Number of movements to reach the position.
+            blank: Index of the empty space in the flat board, if known.
+        """
         super().__init__(rules, cost)
-        self.squares = squares
-        self.n = len(squares)
+        if isinstance(squares, tuple):
+            self.key_ = squares
+        else:
+            self.key_ = tuple(square for row in squares for square in row)
+        self.n = math.isqrt(len(self.key_))
+        self.blank_ = self.key_.index(-1) if blank is None else blank
 
     @override
     def next_player(
             self) -> PlayerIndex:
         return PlayerIndex.FirstPlayer
 
+    def __eq__(
+            self,
+            other: "SlicingPuzzlePosition"):
+        return self.key_ == other.key_ and self._cost == other._cost
+
+    def __hash__(self):
+        return hash(self.key_)
+
     def __str__(self) -> str:
         # Print the board with the squares
         board = f"Cost: {self.cost()}\n"
@@ -50,11 +76,17 @@ class SlicingPuzzlePosition(CostPosition):
             board += "|\n+" + "----+" * self.n + "\n"
         return board
 
+    @property
+    def squares(self) -> List[List[int]]:
+        """Board as a new list of rows."""
+        return [list(self.key_[i:i + self.n]) for i in range(0, self.n * self.n, self.n)]
+
+    def key(self) -> Tuple[int, ...]:
+        """Board flattened row after row, equal for positions with the same board whatever their cost."""
+        return self.key_
+
     def empty_space(self):
-        for i in range(self.n):
-            for j in range(self.n):
-                if self.squares[i][j] == -1:
-                    return (i, j)
+        return divmod(self.blank_, self.n)
 
 
 class SlicingPuzzleMovement(IMovement):
@@ -104,18 +136,20 @@ class SlicingPuzzleRules(IGameRules):
             seed: Seed for the random generator
             random_moves: Number of random movements
         """
-        self.initial_position = SlicingPuzzlePosition(self, SlicingPuzzleRules.generate_correct_position(self.n), 0)
-
-        # Move the squares randomly to generate a random position
+        # Move the squares randomly to generate a random position, over a mutable flat board
         if seed is not None:
             random.seed(seed)
 
+        squares = list(self.solved_key_)
+        blank = len(squares) - 1
         for _ in range(random_moves):
-            possible_movements = self.possible_movements(self.initial_position)
-            movement = random.choice(list(possible_movements))
-            self.initial_position = self.next_position(movement, self.initial_position)
+            movement = random.choice(self.__movements[blank])
+            target = self.__targets[blank][movement.value]
+            squares[blank] = squares[target]
+            squares[target] = -1
+            blank = target
 
-        return self.initial_position.squares
+        return [squares[i:i + self.n] for i in range(0, self.n * self.n, self.n)]
 
 
     def __init__(
@@ -128,12 +162,37 @@ class SlicingPuzzleRules(IGameRules):
             initial_position: Initial position of the game if given.
             n: Size of the board = nxn
         """
+        if initial_position is not None:
+            n = len(initial_position)
+        self.n = n
+
+        # Solved board, and for each index of the empty space, the movements possible and the index it moves to
+        self.solved_key_ = tuple(square for row in SlicingPuzzleRules.generate_correct_position(n) for square in row)
+        self.__movements = []
+        self.__targets = []
+        for blank in range(n * n):
+            row, column = divmod(blank, n)
+            movements = []
+            targets = [-1] * len(SlicingPuzzleMovement.Values)
+            if row > 0:
+                movements.append(SlicingPuzzleMovement.Values.Down)
+                targets[SlicingPuzzleMovement.Values.Down.value] = blank - n
+            if row < n - 1:
+                movements.append(SlicingPuzzleMovement.Values.Up)
+                targets[SlicingPuzzleMovement.Values.Up.value] = blank + n
+            if column > 0:
+                movements.append(SlicingPuzzleMovement.Values.Right)
+                targets[SlicingPuzzleMovement.Values.Right.value] = blank - 1
+            if column < n - 1:
+                movements.append(SlicingPuzzleMovement.Values.Left)
+                targets[SlicingPuzzleMovement.Values.Left.value] = blank + 1
+            self.__movements.append(tuple(movements))
+            self.__targets.append(tuple(targets))
+
         if initial_position is None:
-            self.n = n
-            self.initial_position = self.generate_random_position(seed=seed)
-        else:
-            self.initial_position = initial_position
-            self.n = len(initial_position)
+            initial_position = self.generate_random_position(seed=seed)
+        self.initial_position = initial_position
+        self.__initial_key = tuple(square for row in initial_position for square in row)
 
     @override
     def n_players(self) -> int:
@@ -143,7 +202,7 @@ class SlicingPuzzleRules(IGameRules):
     def first_position(self) -> SlicingPuzzlePosition:
         return SlicingPuzzlePosition(
             rules=self,
-            squares=self.initial_position,
+            squares=self.__initial_key,
             cost=0)
 
     @override
@@ -151,67 +210,45 @@ class SlicingPuzzleRules(IGameRules):
             self,
             movement: SlicingPuzzleMovement,
             position: SlicingPuzzlePosition) -> SlicingPuzzlePosition:
-                # Find the empty space and move the square next to it to the empty space
-        empty_space = position.empty_space()
-        new_space = None
-
-        if movement == SlicingPuzzleMovement.Values.Up:
-            new_space = (empty_space[0] + 1, empty_space[1])
-
-        elif movement == SlicingPuzzleMovement.Values.Down:
-            new_space = (empty_space[0] - 1, empty_space[1])
-
-        elif movement == SlicingPuzzleMovement.Values.Left:
-            new_space = (empty_space[0], empty_space[1] + 1)
-
-        elif movement == SlicingPuzzleMovement.Values.Right:
-            new_space = (empty_space[0], empty_space[1] - 1)
+        # Move the square next to the empty space to it
+        blank = position.blank_
+        target = self.__targets[blank][movement.value]
+        if target < 0:
+            raise ValueError(f"Invalid movement {movement} with the empty space in {position.empty_space()}")
 
-        new_squares = [[position.squares[i][j] for j in range(self.n)] for i in range(self.n)]
-        new_squares[empty_space[0]][empty_space[1]] = new_squares[new_space[0]][new_space[1]]
-        new_squares[new_space[0]][new_space[1]] = -1
+        squares = list(position.key_)
+        squares[blank] = squares[target]
+        squares[target] = -1
 
         return SlicingPuzzlePosition(
             rules=self,
-            squares=new_squares,
-            cost=position.cost() + 1)
+            squares=tuple(squares),
+            cost=position.cost() + 1,
+            blank=target)
 
 
     @override
     def possible_movements(
             self,
             position: SlicingPuzzlePosition) -> Iterator[SlicingPuzzleMovement]:
-        # Find the empty space and return the possible movements depending on the borders of the game
-        empty_space = position.empty_space()
+        # Movements possible depending on the borders of the game, precomputed for each empty space
+        return list(self.__movements[position.blank_])
 
-        possible_movements = []
-        if empty_space[0] > 0:
-            possible_movements.append(SlicingPuzzleMovement.Values.Down)
-        if empty_space[0] < self.n - 1:
-            possible_movements.append(SlicingPuzzleMovement.Values.Up)
-        if empty_space[1] > 0:
-            possible_movements.append(SlicingPuzzleMovement.Values.Right)
-        if empty_space[1] < self.n - 1:
-            possible_movements.append(SlicingPuzzleMovement.Values.Left)
 
-        return possible_movements
+    @override
+    def is_movement_possible(
+            self,
+            movement: SlicingPuzzleMovement,
+            position: SlicingPuzzlePosition) -> bool:
+        return isinstance(movement, SlicingPuzzleMovement.Values) and self.__targets[position.blank_][movement.value] >= 0
 
 
     @override
     def finished(
             self,
             position: SlicingPuzzlePosition) -> bool:
-        # Check that every square is in the correct position
-        correct_n = 1
-        for i in range(self.n):
-            for j in range(self.n):
-                if position.squares[i][j] != correct_n:
-                    if i == self.n - 1 and j == self.n - 1:
-                        continue
-                    else:
-                        return False
-                correct_n += 1
-        return True
+        # Every square is in the correct position
+        return position.key_ == self.solved_key_
 
 
     @override
@@ -221,3 +258,40 @@ class SlicingPuzzleRules(IGameRules):
         s = ScoreBoard()
         s.add_score(PlayerIndex.FirstPlayer, position.cost())
         return s
+
+
+    def minimum_cost(
+            self,
+            pattern_databases: bool = None) -> int:
+        """
+        Minimum number of movements to solve the initial position: the score of an optimal player.
+
+        Args:
+            pattern_databases: True to use them (building them if needed), False to never use them,
+                or None to use them only if they are already built. Without them, 4x4 boards may take minutes.
+        """
+        return solver_for(self.n, pattern_databases).solution_cost(self.__initial_key)
+
+
+class SlicingPuzzleRulesGenerator(IRulesGenerator):
+
+    @override
+    def generate(
+            self,
+            configuration: dict) -> IGameRules:
+
+        n = SlicingPuzzleRulesGenerator._get_param(
+            configuration=configuration,
+            param_names = ['n', 'size'],
+            default_value = SlicingPuzzleRules.DefaultSize,
+            type_cast = int,
+        )
+
+        seed = SlicingPuzzleRulesGenerator._get_param(
+            configuration=configuration,
+            param_name = 'seed',
+            required = True,
+            type_cast = int,
+        )
+
+        return SlicingPuzzleRules(n=n, seed=seed)
@@ -179,6 +179,15 @@ class TicTacToeRules(IGameRules):
         return movements
 
 
+    @override
+    def is_movement_possible(
+            self,
+            movement: TicTacToeMovement,
+            position: TicTacToePosition) -> bool:
+        return (0 <= movement.row < 3 and 0 <= movement.column < 3
+                and position.board_[movement.row][movement.column] == TicTacToePosition.TicTacToePiece.Empty)
+
+
     @override
     def finished(
             self,
@@ -1,8 +1,8 @@
 
 import copy
-from typing import Iterator, List, Tuple
+from collections import Counter
+from typing import List, Tuple
 from enum import Enum
-import itertools
 
 from IArena.grader.RulesGenerator import IRulesGenerator
 from IArena.interfaces.IPlayer import IPlayer
@@ -13,6 +13,8 @@ from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.interfaces.ScoreBoard import ScoreBoard
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.History import PersistentHistory
+from IArena.utils.CodeSpace import CodeSpace
 
 """
 This game represents the Wordle game with exact tips.
@@ -71,9 +73,9 @@ class VectorWordlePosition(IPosition):
             positive_feedback: List[List[int]],
             misplaced_feedback: List[List[int]]):
         super().__init__(rules)
-        self._guesses = guesses
-        self._positive_feedback = positive_feedback
-        self._misplaced_feedback = misplaced_feedback
+        self._guesses = PersistentHistory.of(guesses)
+        self._positive_feedback = PersistentHistory.of(positive_feedback)
+        self._misplaced_feedback = PersistentHistory.of(misplaced_feedback)
 
     @override
     def next_player(
@@ -83,7 +85,9 @@ class VectorWordlePosition(IPosition):
     def __eq__(
             self,
             other: "VectorWordlePosition"):
-        return self._guesses == other._guesses and self._feedback == other._feedback
+        return (self._guesses == other._guesses
+                and self._positive_feedback == other._positive_feedback
+                and self._misplaced_feedback == other._misplaced_feedback)
 
     def __str__(self):
 
@@ -91,27 +95,29 @@ class VectorWordlePosition(IPosition):
             return "<EMPTY POSITION>\n"
 
         # Print each guess in a line together with the feedback
-        return "\n".join([f'{self._guesses[i]} : {[x.name for x in self._feedback[i]]}' for i in range(len(self._guesses))]) + "\n"
+        return "\n".join([
+            f'{guess} : Correct: {positive} Misplaced: {misplaced}'
+            for guess, positive, misplaced in zip(self._guesses, self._positive_feedback, self._misplaced_feedback)]) + "\n"
 
     def guesses(self) -> List[VectorWordleMovement]:
-        return copy.deepcopy(self._guesses)
+        return copy.deepcopy(self._guesses.to_list())
 
     def positive_feedback(self) -> List[List[int]]:
         """List of all positions with correct values for each guess."""
-        return copy.deepcopy(self._positive_feedback)
+        return copy.deepcopy(self._positive_feedback.to_list())
 
     def misplaced_feedback(self) -> List[List[int]]:
         """List of all positions with misplaced values for each guess."""
-        return copy.deepcopy(self._misplaced_feedback)
+        return copy.deepcopy(self._misplaced_feedback.to_list())
 
     def negative_feedback(self) -> List[List[int]]:
         """List of all positions with incorrect values for each guess."""
         negative_feedback = []
-        for guess_index in range(len(self._guesses)):
+        for movement, positive, misplaced in zip(self._guesses, self._positive_feedback, self._misplaced_feedback):
             negative_positions = []
-            guess = self._guesses[guess_index].guess
-            positive_positions = set(self._positive_feedback[guess_index])
-            misplaced_positions = set(self._misplaced_feedback[guess_index])
+            guess = movement.guess
+            positive_positions = set(positive)
+            misplaced_positions = set(misplaced)
             for i in range(len(guess)):
                 if i not in positive_positions and i not in misplaced_positions:
                     negative_positions.append(i)
@@ -121,27 +127,27 @@ class VectorWordlePosition(IPosition):
     def last_guess(self) -> VectorWordleMovement:
         if len(self._guesses) == 0:
             return None
-        return copy.deepcopy(self._guesses[-1])
+        return copy.deepcopy(self._guesses.last())
 
     def last_positive_feedback(self) -> List[int]:
         """Returns the list of positions with correct values for the last guess."""
         if len(self._positive_feedback) == 0:
             return None
-        return copy.deepcopy(self._positive_feedback[-1])
+        return copy.deepcopy(self._positive_feedback.last())
 
     def last_misplaced_feedback(self) -> List[int]:
         """Returns the list of positions with misplaced values for the last guess."""
         if len(self._misplaced_feedback) == 0:
             return None
-        return copy.deepcopy(self._misplaced_feedback[-1])
+        return copy.deepcopy(self._misplaced_feedback.last())
 
     def last_negative_feedback(self) -> List[int]:
         """Returns the list of positions with incorrect values for the last guess."""
         if len(self._guesses) == 0:
             return None
-        last_guess = self._guesses[-1].guess
-        positive_positions = set(self._positive_feedback[-1])
-        misplaced_positions = set(self._misplaced_feedback[-1])
+        last_guess = self._guesses.last().guess
+        positive_positions = set(self._positive_feedback.last())
+        misplaced_positions = set(self._misplaced_feedback.last())
         negative_positions = []
         for i in range(len(last_guess)):
             if i not in positive_positions and i not in misplaced_positions:
@@ -220,8 +226,17 @@ class VectorWordleRules(IGameRules):
         if not allow_repetition and len(set(secret)) != code_size:
             raise ValueError("Secret must not have repetitions when allow_repetition is False")
         self.__secret = secret
+        # Secret indexed by value, so the feedback of a guess is computed in linear time
+        self.__secret_histogram = Counter(secret)
         self.allow_repetition_ = allow_repetition
 
+        # Every code of n values, built lazily: indexable, sampleable and with constant time membership
+        self.code_space_ = CodeSpace(
+            code_size=self.n,
+            number_values=self.m,
+            allow_repetition=self.allow_repetition_,
+            movement_type=VectorWordleMovement)
+
     def number_values(self) -> int:
         return self.m
 
@@ -237,14 +252,14 @@ class VectorWordleRules(IGameRules):
 
     @override
     def first_position(self) -> VectorWordlePosition:
-        return VectorWordlePosition(self, [], [])
+        return VectorWordlePosition(self, [], [], [])
 
     @override
     def next_position(
             self,
             movement: VectorWordleMovement,
             position: VectorWordlePosition) -> VectorWordlePosition:
-        guesses = position.guesses() + [movement]
+        guesses = position._guesses.append(movement)
 
         # Check if the movement is valid
         if len(movement.guess) != self.n or any(x < 0 or x >= self.m for x in movement.guess):
@@ -253,63 +268,61 @@ class VectorWordleRules(IGameRules):
             raise ValueError("Movement must not have repetitions when allow_repetition is False")
 
         # Calculate the feedback of the new guess
+        positive_feedback, misplaced_feedback = self._calculate_feedback(movement.guess)
+
+        new_positive_feedback = position._positive_feedback.append(positive_feedback)
+        new_misplaced_feedback = position._misplaced_feedback.append(misplaced_feedback)
+
+        return VectorWordlePosition(self, guesses, new_positive_feedback, new_misplaced_feedback)
+
+    def _calculate_feedback(
+            self,
+            guess: List[int]) -> Tuple[List[int], List[int]]:
+        """Positions with correct values and positions with misplaced values of a guess, in two linear passes."""
         positive_feedback = []
         misplaced_feedback = []
-        already_placed = [False for _ in range(self.n)]
-        possible_misplaced = []
+        # Values of the secret not matched yet
+        available = self.__secret_histogram.copy()
         for i in range(self.n):
-            if movement.guess[i] == self.__secret[i]:
+            if guess[i] == self.__secret[i]:
                 positive_feedback.append(i)
-                already_placed[i] = True
-            elif movement.guess[i] in self.__secret:
-                possible_misplaced.append(i)
-
-        for i in possible_misplaced:
-            # Check if such number is in secret in a position that has already not being checked
-            for j in range(self.n):
-                if not already_placed[j] and movement.guess[i] == self.__secret[j]:
-                    already_placed[j] = True
-                    misplaced_feedback.append(i)
-                    break
-
-        new_positive_feedback = copy.deepcopy(position.positive_feedback())
-        new_positive_feedback.append(positive_feedback)
-
-        new_misplaced_feedback = copy.deepcopy(position.misplaced_feedback())
-        new_misplaced_feedback.append(misplaced_feedback)
-
-        return VectorWordlePosition(self, guesses, new_positive_feedback, new_misplaced_feedback)
+                available[guess[i]] -= 1
+        # Repeated values are misplaced from left to right while the secret has unmatched ones
+        for i in range(self.n):
+            if guess[i] != self.__secret[i] and available[guess[i]] > 0:
+                misplaced_feedback.append(i)
+                available[guess[i]] -= 1
+        return positive_feedback, misplaced_feedback
 
     @override
     def possible_movements(
             self,
-            position: VectorWordlePosition) -> Iterator[VectorWordleMovement]:
+            position: VectorWordlePosition) -> CodeSpace:
+        return self.code_space_
 
-        if self.allow_repetition_:
-            # Every combination of n numbers from 0 to m-1 using itertools
-            for x in itertools.product(range(self.m), repeat=self.n):
-                yield VectorWordleMovement(guess=list(x))
-
-        else:
-            # Every permutation of n numbers from 0 to m-1 using itertools
-            for x in itertools.permutations(range(self.m), self.n):
-                yield VectorWordleMovement(guess=list(x))
+    @override
+    def is_movement_possible(
+            self,
+            movement: VectorWordleMovement,
+            position: VectorWordlePosition) -> bool:
+        # Only checks the size and values of the code, without enumerating the space
+        return movement in self.code_space_
 
     @override
     def finished(
             self,
             position: VectorWordlePosition) -> bool:
         # Game is finished if the last guess is equal the hidden secret
-        if len(position.guesses()) == 0:
+        if len(position._guesses) == 0:
             return False
-        return position.guesses()[-1].guess == self.__secret
+        return position._guesses.last().guess == self.__secret
 
     @override
     def score(
             self,
             position: VectorWordlePosition) -> ScoreBoard:
         s = ScoreBoard()
-        s.define_score(PlayerIndex.FirstPlayer, -len(position.guesses()))
+        s.define_score(PlayerIndex.FirstPlayer, -len(position._guesses))
         return s
 
 
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple
+
+from IArena.interfaces.IPlayer import IPlayer
+from IArena.arena.GenericGame import GenericGame
+from IArena.grader.RulesGenerator import RulesGeneratorConfiguration, RulesGeneratorSuite, get_rules_generator_from_name
+from IArena.grader.Report import ReportCommonConfiguration
+from IArena.grader.AutoGrader import TAG_YAML_CONF_GAME, read_reports
+from IArena.utils.CodeSpace import CodeSpace
+
+"""
+Analyzer of a player of a single player guess game against many secrets of the same configuration.
+
+The grader tries a player with a few seeds. The sweep plays it against every secret of a configuration,
+or against a stratified sample of them when there are too many, and reports the distribution of the scores
+(minus the number of guesses in guess games), so the min_score of the reports can be chosen from data.
+
+Secrets are given to the rules generator with the 'secret' argument, in the same format the movements use.
+Games run without a clock, in a process pool when more than one process is requested.
+"""
+
+
+@dataclass
+class SweepResult:
+    """
+    Scores of a player against a set of secrets.
+
+    Attributes:
+        secrets: Secrets played.
+        scores: Score of each secret, or None if the game failed.
+        errors: Error of each failed game, by index of the secret.
+        space_size: Number of secrets of the configuration.
+    """
+
+    secrets: List[Any] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+    space_size: int = 0
+
+    def exhaustive(self) -> bool:
+        """Whether every secret of the configuration was played."""
+        return len(self.secrets) == self.space_size
+
+    def valid_scores(self) -> List[float]:
+        return [s for s in self.scores if s is not None]
+
+    def distribution(self) -> Dict[float, int]:
+        """Number of games with each score, sorted by score."""
+        return dict(sorted(Counter(self.valid_scores()).items()))
+
+    def guess_counts(self) -> Dict[int, int]:
+        """Number of games solved with each number of guesses, for games scored with minus the guesses."""
+        return dict(sorted(Counter(-int(s) for s in self.valid_scores()).items()))
+
+    def worst(self) -> float:
+        """Lowest score, or None if every game failed."""
+        scores = self.valid_scores()
+        return min(scores) if scores else None
+
+    def mean(self) -> float:
+        """Mean score of the games that did not fail, or None if every game failed."""
+        scores = self.valid_scores()
+        return sum(scores) / len(scores) if scores else None
+
+    def failing_secrets(
+            self,
+            min_score: float = float('-inf')) -> List[Tuple[Any, str]]:
+        """Secrets whose game failed or scored under min_score, with the reason."""
+        failing = []
+        for i, (secret, score) in enumerate(zip(self.secrets, self.scores)):
+            if score is None:
+                failing.append((secret, self.errors.get(i, 'failed')))
+            elif score < min_score:
+                failing.append((secret, f'score {score} below {min_score}'))
+        return failing
+
+    def min_score_for(
+            self,
+            pass_fraction: float = 1.0) -> float:
+        """
+        Highest min_score that at least pass_fraction of the games reach.
+
+        Failed games count as never reaching it, so with failures and pass_fraction 1 it is -inf.
+        """
+        if not self.scores:
+            return None
+        scores = sorted(s if s is not None else float('-inf') for s in self.scores)
+        return scores[min(len(scores) - 1, int(math.floor((1 - pass_fraction) * len(scores))))]
+
+    def merge(
+            self,
+            other: SweepResult) -> SweepResult:
+        """Result with the games of both results."""
+        offset = len(self.secrets)
+        errors = dict(self.errors)
+        errors.update({i + offset: e for i, e in other.errors.items()})
+        return SweepResult(
+            secrets=self.secrets + other.secrets,
+            scores=self.scores + other.scores,
+            errors=errors,
+            space_size=self.space_size + other.space_size)
+
+    def __str__(self) -> str:
+        st = f'Games: {len(self.secrets)} of {self.space_size} secrets'
+        st += ' (exhaustive)\n' if self.exhaustive() else ' (stratified sample)\n'
+        st += f'Failed: {len(self.errors)}\n'
+        if self.valid_scores():
+            st += f'Worst: {self.worst()}  Mean: {self.mean():.3f}\n'
+            st += f'Distribution: {self.distribution()}\n'
+        return st
+
+
+def secret_space(
+        game: str,
+        configuration: RulesGeneratorConfiguration) -> Any:
+    """
+    Indexable sequence of every possible secret of a configuration, as the movements of the game.
+
+    Guess games where any code can be the secret return their movements, so the secrets are their guesses.
+    """
+    configuration = dict(configuration)
+    configuration.setdefault('seed', 0)
+    rules = get_rules_generator_from_name(game).generate(configuration)
+    movements = rules.possible_movements(rules.first_position())
+    if isinstance(movements, CodeSpace):
+        return movements
+    return list(movements)
+
+
+def sample_ranks(
+        space_size: int,
+        max_secrets: int = None,
+        seed: int = 0) -> List[int]:
+    """
+    Positions of the secrets to play: all of them, or one random position in each of max_secrets strata
+    of the same size, so every region of the space is represented.
+    """
+    if max_secrets is None or space_size <= max_secrets:
+        return list(range(space_size))
+    rng = random.Random(seed)
+    return [
+        (k * space_size) // max_secrets + rng.randrange(
+            ((k + 1) * space_size) // max_secrets - (k * space_size) // max_secrets)
+        for k in range(max_secrets)]
+
+
+def _secret_of(movement: Any) -> Any:
+    return getattr(movement, 'guess', movement)
+
+
+def _play_secrets(
+        game: str,
+        configuration: RulesGeneratorConfiguration,
+        player: IPlayer,
+        secrets: List[Any],
+        max_moves: int) -> List[Tuple[float, str]]:
+    """Score (or error) of the player against each secret. Run by each process of the pool."""
+    generator = get_rules_generator_from_name(game)
+    results = []
+    for secret in secrets:
+        conf = dict(configuration)
+        conf['secret'] = secret
+        try:
+            rules = generator.generate(conf)
+            score = GenericGame(rules, [player], max_moves=max_moves).play()[0]
+            results.append((score, None))
+        except Exception as e:
+            results.append((None, f'{type(e).__name__}: {e}'))
+    return results
+
+
+def _chunks(
+        elements: List[Any],
+        n_chunks: int) -> Iterator[List[Any]]:
+    size = max(1, math.ceil(len(elements) / n_chunks))
+    for i in range(0, len(elements), size):
+        yield elements[i:i + size]
+
+
+def sweep(
+        game: str,
+        configuration: RulesGeneratorConfiguration,
+        player: IPlayer,
+        max_secrets: int = None,
+        processes: int = 1,
+        max_moves: int = 1000,
+        seed: int = 0) -> SweepResult:
+    """
+    Play the player against every secret of a configuration, or a stratified sample of at most max_secrets.
+
+    Args:
+        game: Name of the game, as in the grader configuration files.
+        configuration: Arguments of the rules generator. The seed, if any, is ignored.
+        player: Player to analyze. Each process plays with its own copy.
+        max_secrets: Maximum number of secrets to play. None to play all of them.
+        processes: Number of processes. 1 to play in this process.
+        max_moves: Games with more moves fail.
+        seed: Seed of the stratified sample.
+    """
+    space = secret_space(game, configuration)
+    space_size = space.size() if isinstance(space, CodeSpace) else len(space)
+    secrets = [_secret_of(space[r]) for r in sample_ranks(space_size, max_secrets, seed)]
+
+    if processes == 1:
+        results = _play_secrets(game, configuration, player, secrets, max_moves)
+    else:
+        # Several chunks per process, so slow secrets do not leave the rest of processes idle
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = list(_chunks(secrets, 8 * (processes or 1)))
+            futures = [pool.submit(_play_secrets, game, configuration, player, c, max_moves) for c in chunks]
+            results = [r for f in futures for r in f.result()]
+
+    return SweepResult(
+        secrets=secrets,
+        scores=[score for score, _ in results],
+        errors={i: error for i, (_, error) in enumerate(results) if error is not None},
+        space_size=space_size)
+
+
+def sweep_reports(
+        yaml_configuration: Dict,
+        player: IPlayer,
+        max_secrets: int = None,
+        processes: int = 1,
+        seed: int = 0) -> Dict[str, SweepResult]:
+    """
+    Sweep the secrets of each report of a grader configuration.
+
+    The seeds of the reports are replaced by the secrets. Reports with several configurations
+    (other multi_args) merge the results of all of them.
+
+    Returns:
+        Result of each report by name.
+    """
+    game = yaml_configuration[TAG_YAML_CONF_GAME]
+    default_config = ReportCommonConfiguration(yaml_configuration)
+
+    results = {}
+    for report in read_reports(default_config, yaml_configuration):
+        multi_args = {k: v for k, v in report.rules_suite._multi_args.items() if k != 'seed'}
+        suite = RulesGeneratorSuite(args=report.rules_suite._args, multi_args=multi_args)
+        result = None
+        for configuration in suite.get_configuration_iterator():
+            configuration_result = sweep(
+                game, configuration, player,
+                max_secrets=max_secrets,
+                processes=processes,
+                max_moves=report.common_configuration.max_moves,
+                seed=seed)
+            result = configuration_result if result is None else result.merge(configuration_result)
+        results[report.name] = result
+    return results
@@ -1,9 +1,11 @@
 
+import random
 from typing import Iterator
 
 from IArena.interfaces.IPosition import IPosition
 from IArena.interfaces.IMovement import IMovement
 from IArena.interfaces.ScoreBoard import ScoreBoard
+from IArena.interfaces.PlayerIndex import PlayerIndex
 from IArena.utils.decorators import pure_virtual
 
 
@@ -50,3 +52,17 @@ class IGameRules:
             movement: IMovement,
             position: IPosition):
         return movement in self.possible_movements(position)
+
+    def determinize(
+            self,
+            position: IPosition,
+            player: PlayerIndex,
+            rng: random.Random) -> IPosition:
+        """
+        Position consistent with all that the player knows of the given one,
+        with the information hidden to the player sampled at random.
+        Its rules may be new ones, if the hidden information is kept in the rules.
+
+        Games without hidden information return the same position.
+        """
+        return position
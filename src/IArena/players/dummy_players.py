@@ -8,6 +8,7 @@ from IArena.interfaces.IGameRules import IGameRules
 from IArena.interfaces.IPlayer import IPlayer
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.CodeSpace import CodeSpace
 
 
 class FirstPlayer(IPlayer):
@@ -34,7 +35,11 @@ class RandomPlayer(IPlayer):
     def play(
             self,
             position: IPosition) -> IMovement:
-        return random.choice(list(position.get_rules().possible_movements(position)))
+        movements = position.get_rules().possible_movements(position)
+        # Code spaces can be too big to be listed
+        if isinstance(movements, CodeSpace):
+            return movements.sample()
+        return random.choice(list(movements))
 
 
 class ConsistentRandomPlayer(IPlayer):
@@ -49,7 +54,10 @@ class ConsistentRandomPlayer(IPlayer):
             self,
             position: IPosition) -> IMovement:
         movements = position.get_rules().possible_movements(position)
-        selection = self.rg.randint(0, len(movements) - 1)
+        if isinstance(movements, CodeSpace):
+            return movements.sample(self.rg)
+        movements = list(movements)
+        selection = self.rg.randint(len(movements))
         return movements[selection]
 
 
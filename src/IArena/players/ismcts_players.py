@@ -0,0 +1,200 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from IArena.interfaces.IPosition import IPosition
+from IArena.interfaces.IMovement import IMovement
+from IArena.interfaces.IPlayer import IPlayer
+from IArena.interfaces.IGameRules import IGameRules
+from IArena.interfaces.PlayerIndex import PlayerIndex
+from IArena.utils.decorators import override
+
+"""
+Information set Monte Carlo tree search (single observer ISMCTS, by Cowling, Powley and Whitehouse).
+
+Each iteration samples a determinization of the position with the determinize hook of the rules:
+the information hidden to the player is dealt again at random, so the rest of the iteration is a normal
+search with perfect information. A single tree, whose nodes are the movements played from the root,
+is shared by every determinization. In each node only the children whose movement is possible in the
+current determinization are chosen, by UCB with the number of times they were available instead of
+the visits of the parent. The game is then played at random until it finishes, and each node adds
+the score of the player that played its movement.
+
+Several processes search independent trees from their own determinizations, and the movement
+of the root with the most visits summed over all of them is played.
+"""
+
+
+class _Node:
+    """Node of the tree: the movement played from its parent, by one player."""
+
+    __slots__ = ('movement', 'player', 'parent', 'children', 'visits', 'availability', 'reward')
+
+    def __init__(
+            self,
+            movement: IMovement = None,
+            player: PlayerIndex = None,
+            parent: "_Node" = None):
+        self.movement = movement
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.availability = 0
+        self.reward = 0.0
+
+    def child(
+            self,
+            movement: IMovement) -> "_Node":
+        for child in self.children:
+            if child.movement == movement:
+                return child
+        return None
+
+
+def _search(
+        position: IPosition,
+        player: PlayerIndex,
+        minimize: bool,
+        exploration: float,
+        time_s: float,
+        iterations: int,
+        seed: int) -> List[int]:
+    """
+    Runs ISMCTS from the position for the player, until the time or the iterations end.
+
+    Returns:
+        Visits of each movement of the position, in the order of the possible movements of its rules.
+    """
+    start = time.monotonic()
+    rng = random.Random(seed)
+    root = _Node()
+    sign = -1 if minimize else 1
+    # Range of the rewards seen, to scale them to [0, 1] in UCB
+    low, high = math.inf, -math.inf
+
+    done = 0
+    while (iterations is None or done < iterations) and (time_s is None or time.monotonic() - start < time_s):
+        current = position.get_rules().determinize(position, player, rng)
+        node = root
+
+        # Selection among the movements possible in this determinization, and expansion of one not tried
+        while not current.get_rules().finished(current):
+            rules = current.get_rules()
+            movements = list(rules.possible_movements(current))
+            available, untried = [], []
+            for movement in movements:
+                child = node.child(movement)
+                if child is None:
+                    untried.append(movement)
+                else:
+                    available.append(child)
+            for child in available:
+                child.availability += 1
+
+            if untried:
+                movement = rng.choice(untried)
+                child = _Node(movement, current.next_player(), node)
+                child.availability = 1
+                node.children.append(child)
+                node = child
+                current = rules.next_position(movement, current)
+                break
+
+            scale = high - low if high > low else 1.0
+            node = max(available, key=lambda c: (
+                (c.reward / c.visits - low) / scale + exploration * math.sqrt(math.log(c.availability) / c.visits)))
+            current = rules.next_position(node.movement, current)
+
+        # Simulation
+        rules = current.get_rules()
+        while not rules.finished(current):
+            current = rules.next_position(rng.choice(list(rules.possible_movements(current))), current)
+        board = rules.score(current)
+        # Players that never scored may be missing from the board
+        rewards = [sign * (board.score[p] if p < len(board.score) else 0) for p in range(rules.n_players())]
+        low, high = min(low, *rewards), max(high, *rewards)
+
+        # Back propagation
+        while node is not root:
+            node.visits += 1
+            node.reward += rewards[node.player]
+            node = node.parent
+        done += 1
+
+    visits = []
+    for movement in position.get_rules().possible_movements(position):
+        child = root.child(movement)
+        visits.append(child.visits if child is not None else 0)
+    return visits
+
+
+class ISMCTSPlayer(IPlayer):
+    """
+    Plays the movement most visited by information set Monte Carlo tree search, summed over several processes.
+
+    Works with any game: the rules sample the hidden information with determinize,
+    and games without hidden information do not need to override it.
+    """
+
+    def __init__(
+            self,
+            name: str = None,
+            move_time_s: float = 1.0,
+            iterations: int = None,
+            processes: int = None,
+            exploration: float = 0.7,
+            minimize: bool = False,
+            seed: int = None):
+        """
+        Args:
+            name: Name of the player.
+            move_time_s: Time budget of each move. Keep it under the move timeout of the game.
+            iterations: Maximum iterations of each process in each move. By default, as many as the time allows.
+            processes: Processes searching in parallel. By default, one per core. With 1, it searches in this process.
+            exploration: Constant of the exploration term of UCB, over rewards scaled to [0, 1].
+            minimize: Whether the players try to minimize their score, as in PrisonerDilemma or HighestCard.
+            seed: Seed of the determinizations and the simulations.
+        """
+        if move_time_s is None and iterations is None:
+            raise ValueError("Either a time budget or a number of iterations is needed")
+
+        super().__init__(name=name)
+        self.move_time_s = move_time_s
+        self.iterations = iterations
+        self.processes = processes if processes is not None else os.cpu_count()
+        self.exploration = exploration
+        self.minimize = minimize
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    @override
+    def starting_game(
+            self,
+            rules: IGameRules,
+            player_index: int):
+        self.rng = random.Random(self.seed)
+
+    @override
+    def play(
+            self,
+            position: IPosition) -> IMovement:
+        movements = list(position.get_rules().possible_movements(position))
+        if len(movements) == 1:
+            return movements[0]
+
+        arguments = [
+            (position, position.next_player(), self.minimize, self.exploration, self.move_time_s, self.iterations,
+             self.rng.randrange(1 << 32))
+            for _ in range(self.processes)]
+        if self.processes == 1:
+            results = [_search(*args) for args in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                results = list(pool.map(_search, *zip(*arguments)))
+
+        visits = [sum(counts) for counts in zip(*results)]
+        return movements[visits.index(max(visits))]
@@ -1,6 +1,7 @@
 
 import random
 import math
+import time
 from typing import Tuple, List
 
 from IArena.interfaces.IPosition import IPosition
@@ -308,3 +309,340 @@ class MinimaxRandomMatchConsistentPlayer(MinimaxRandomConsistentPlayer):
             player_index: int):
         super().starting_game(rules, player_index)
         self.rg.reset_seed()
+
+
+class _SearchTimeout(Exception):
+    """The time budget of the move ended in the middle of a search."""
+    pass
+
+
+class MaxNPlayer(AbstractMinimaxPlayer, IPlayer):
+    """
+    Search player for games of any number of players.
+
+    Two modes:
+
+    - MaxN: each player chooses the movement that maximizes its own score, so every node has a score for each player.
+      With bounds of the score of a player (min_score and max_score) and of the sum of the scores of all of them
+      (max_sum), shallow pruning skips the rest of movements of a player once the previous player can not prefer them:
+      the previous player gets at most max_sum minus the score of this one minus min_score for each of the rest.
+    - Paranoid: the rest of players are a coalition that minimizes the score of this player,
+      so the game is a two player one and it is searched with alpha-beta.
+
+    The heuristic returns a score for each player, used when the depth limit is reached.
+    With a time budget, the search deepens one level at a time and plays the best movement of the deepest search
+    that finished. The previous best movement is searched first.
+    """
+
+    MaxN = 'maxn'
+    Paranoid = 'paranoid'
+
+    def __init__(
+            self,
+            depth: int = -1,
+            mode: str = MaxN,
+            move_time_s: float = None,
+            max_score: MinimaxScoreType = None,
+            max_sum: MinimaxScoreType = None,
+            min_score: MinimaxScoreType = None,
+            minimize: bool = False,
+            name: str = None):
+        """
+        Args:
+            depth: Maximum depth of the search. -1 for no limit.
+            mode: MaxN or Paranoid.
+            move_time_s: Time budget of each move for iterative deepening. By default, a single search to depth.
+            max_score: Largest score of a player, for shallow pruning in MaxN.
+            max_sum: Largest sum of the scores of every player, for shallow pruning in MaxN.
+            min_score: Smallest score of a player, needed with max_sum for shallow pruning with more than 2 players.
+            minimize: Whether the players try to minimize their score, as in HighestCard.
+                Then min_score, max_score and max_sum bound the negated scores.
+            name: Name of the player.
+        """
+        if mode not in (MaxNPlayer.MaxN, MaxNPlayer.Paranoid):
+            raise ValueError(f"Unknown mode {mode}")
+
+        super().__init__(name=name)
+        self.depth = depth
+        self.mode = mode
+        self.move_time_s = move_time_s
+        self.max_score = max_score
+        self.max_sum = max_sum
+        self.min_score = min_score
+        self.sign = -1 if minimize else 1
+        self.deadline_ = None
+
+    @override
+    def play(
+            self,
+            position: IPosition) -> IMovement:
+
+        movements = list(position.get_rules().possible_movements(position))
+        self.root_player_ = position.next_player()
+        max_depth = math.inf if self.depth < 0 else self.depth
+
+        if self.move_time_s is None:
+            self.deadline_ = None
+            return self._search_root(position, movements, max_depth)[0]
+
+        self.deadline_ = time.monotonic() + self.move_time_s
+        best = movements[0]
+        depth = 1
+        while depth <= max_depth:
+            # The best movement of the last search first
+            ordered = [best] + [m for m in movements if not m == best]
+            try:
+                best, complete = self._search_root(position, ordered, depth)
+            except _SearchTimeout:
+                break
+            if complete:
+                break
+            depth += 1
+        return best
+
+    def _search_root(
+            self,
+            position: IPosition,
+            movements: List[IMovement],
+            depth: int) -> Tuple[IMovement, bool]:
+        """
+        Returns:
+            Best movement, and whether the search reached every end of the game.
+        """
+        rules = position.get_rules()
+        self.depth_limited_ = False
+        player = position.next_player()
+        scores = []
+
+        if self.mode == MaxNPlayer.MaxN:
+            best = None
+            for move in movements:
+                bound = self._shallow_bound(rules, best, player)
+                score = self.minimax(rules.next_position(move, position), depth - 1, bound)
+                scores.append(score[player])
+                if best is None or score[player] > best[player]:
+                    best = score
+        else:
+            alpha = -math.inf
+            for move in movements:
+                score = self.minimax(rules.next_position(move, position), depth - 1, alpha, math.inf)
+                scores.append(score)
+                alpha = max(alpha, score)
+
+        return self.select_move(movements, scores, position), not self.depth_limited_
+
+    @override
+    def minimax(
+            self,
+            position: IPosition,
+            depth: MinimaxScoreType = math.inf,
+            alpha: MinimaxScoreType = -math.inf,
+            beta: MinimaxScoreType = math.inf):
+        """
+        Score of the position: a list with the score of each player in MaxN, where alpha is the bound of shallow
+        pruning, or the score of this player in Paranoid, with alpha-beta.
+        """
+        if self.deadline_ is not None and time.monotonic() > self.deadline_:
+            raise _SearchTimeout()
+
+        # Scores of MaxN do not depend on the bound, as only exact ones are kept
+        window = (-math.inf, math.inf) if self.mode == MaxNPlayer.MaxN else (alpha, beta)
+
+        # Scores of whole subtrees are kept with infinite depth, and the rest were limited by the depth
+        cache_score = self.cache_get(position, math.inf, *window)
+        if cache_score is not None:
+            return cache_score
+        cache_score = self.cache_get(position, depth, *window)
+        if cache_score is not None:
+            self.depth_limited_ = True
+            return cache_score
+
+        limited, self.depth_limited_ = self.depth_limited_, False
+        if self.mode == MaxNPlayer.MaxN:
+            score, exact = self._maxn(position, depth, alpha)
+        else:
+            score, exact = self._paranoid(position, depth, alpha, beta), True
+        if exact:
+            self.cache_store(position, score, depth if self.depth_limited_ else math.inf, *window)
+        self.depth_limited_ = limited or self.depth_limited_
+        return score
+
+    def _scores(
+            self,
+            position: IPosition) -> List[MinimaxScoreType]:
+        rules = position.get_rules()
+        board = rules.score(position)
+        # Players that never scored may be missing from the board
+        return [self.sign * (board.score[p] if p < len(board.score) else 0) for p in range(rules.n_players())]
+
+    def _heuristic(
+            self,
+            position: IPosition) -> List[MinimaxScoreType]:
+        self.depth_limited_ = True
+        return [self.sign * h for h in self.heuristic(position)]
+
+    def _maxn(
+            self,
+            position: IPosition,
+            depth: MinimaxScoreType,
+            bound: MinimaxScoreType) -> Tuple[List[MinimaxScoreType], bool]:
+        """
+        Returns:
+            Score of each player, and whether it is exact and not a bound because of pruning.
+        """
+        rules = position.get_rules()
+        if rules.finished(position):
+            return self._scores(position), True
+        if depth == 0:
+            return self._heuristic(position), True
+
+        player = position.next_player()
+        best = None
+        for move in rules.possible_movements(position):
+            child_bound = self._shallow_bound(rules, best, player)
+            score = self.minimax(rules.next_position(move, position), depth - 1, child_bound)
+
+            if best is None or score[player] > best[player]:
+                best = score
+            if best[player] >= bound:
+                return best, False
+            if self.max_score is not None and best[player] >= self.max_score:
+                break
+        return best, True
+
+    def _shallow_bound(
+            self,
+            rules: IGameRules,
+            best: List[MinimaxScoreType],
+            player: PlayerIndex) -> MinimaxScoreType:
+        """
+        Score of the next player from which the player can not prefer a movement over its best one,
+        as it would get at most max_sum minus that score minus min_score for each of the rest of players.
+        """
+        if best is None or self.max_sum is None:
+            return math.inf
+        others = rules.n_players() - 2
+        if others > 0 and self.min_score is None:
+            return math.inf
+        return self.max_sum - best[player] - (others * self.min_score if others > 0 else 0)
+
+    def _paranoid(
+            self,
+            position: IPosition,
+            depth: MinimaxScoreType,
+            alpha: MinimaxScoreType,
+            beta: MinimaxScoreType) -> MinimaxScoreType:
+        rules = position.get_rules()
+        if rules.finished(position):
+            return self._scores(position)[self.root_player_]
+        if depth == 0:
+            return self._heuristic(position)[self.root_player_]
+
+        max_playing = position.next_player() == self.root_player_
+        score = -math.inf if max_playing else math.inf
+        for move in rules.possible_movements(position):
+            next_score = self.minimax(rules.next_position(move, position), depth - 1, alpha, beta)
+            if max_playing:
+                score = max(score, next_score)
+                alpha = max(alpha, next_score)
+            else:
+                score = min(score, next_score)
+                beta = min(beta, next_score)
+            if alpha >= beta:
+                break
+        return score
+
+    @override
+    def heuristic(
+            self,
+            position: IPosition) -> List[MinimaxScoreType]:
+        """Score of each player in a position where the search stops, as the game scores it. By default, 0 for every one."""
+        return [0] * position.get_rules().n_players()
+
+    @override
+    def select_move(
+            self,
+            movements: List[IMovement],
+            scores: List[MinimaxScoreType],
+            position: IPosition = None) -> IMovement:
+        return movements[scores.index(max(scores))]
+
+    @override
+    def cache_store(
+            self,
+            position: IPosition,
+            score,
+            depth: MinimaxScoreType,
+            alpha: MinimaxScoreType,
+            beta: MinimaxScoreType):
+        # Do Nothing
+        pass
+
+    @override
+    def cache_get(
+            self,
+            position: IPosition,
+            depth: MinimaxScoreType,
+            alpha: MinimaxScoreType,
+            beta: MinimaxScoreType):
+        # Do Nothing
+        return None
+
+
+class MaxNCachePlayer(MaxNPlayer):
+    """
+    MaxNPlayer that keeps the score of each position searched, for the rest of the game.
+    Positions must be hashable.
+    """
+
+    def __init__(
+            self,
+            depth: int = -1,
+            mode: str = MaxNPlayer.MaxN,
+            move_time_s: float = None,
+            max_score: MinimaxScoreType = None,
+            max_sum: MinimaxScoreType = None,
+            min_score: MinimaxScoreType = None,
+            minimize: bool = False,
+            name: str = None):
+        super().__init__(
+            depth=depth,
+            mode=mode,
+            move_time_s=move_time_s,
+            max_score=max_score,
+            max_sum=max_sum,
+            min_score=min_score,
+            minimize=minimize,
+            name=name)
+        self.cache = {}
+
+    @override
+    def starting_game(
+            self,
+            rules: IGameRules,
+            player_index: int):
+        # Paranoid scores depend on the player
+        self.cache = {}
+
+    @override
+    def cache_store(
+            self,
+            position: IPosition,
+            score,
+            depth: MinimaxScoreType,
+            alpha: MinimaxScoreType,
+            beta: MinimaxScoreType):
+        self.cache[position] = (depth, alpha, beta, score)
+
+    @override
+    def cache_get(
+            self,
+            position: IPosition,
+            depth: MinimaxScoreType,
+            alpha: MinimaxScoreType,
+            beta: MinimaxScoreType):
+        if position in self.cache:
+            d, a, b, s = self.cache[position]
+            if d >= depth and a <= alpha and b >= beta:
+                return s
+        return None
@@ -1,14 +1,30 @@
 
+import random
+import time
 from typing import List, Tuple
+import numpy as np
 
 from IArena.games.NumberGuess import NumberGuessPosition, NumberGuessRules, NumberGuessMovement
 from IArena.games.Wordle import WordlePosition, WordleRules, WordleMovement
 from IArena.games.Mastermind import MastermindPosition, MastermindRules, MastermindMovement
+from IArena.games.DistanceWordle import DistanceWordlePosition, DistanceWordleRules, DistanceWordleMovement
+from IArena.games.FieldWalk import FieldWalkPosition, FieldWalkRules, FieldWalkMovement
+from IArena.games.SlicingPuzzle import SlicingPuzzlePosition, SlicingPuzzleRules, SlicingPuzzleMovement
+from IArena.games.Hanoi import HanoiPosition, HanoiRules, HanoiMovement
+from IArena.games.NQueens import NQueensPosition, NQueensRules, NQueensMovement
+from IArena.games.HighestCard import HighestCardPosition, HighestCardRules, HighestCardMovement
 from IArena.interfaces.IPlayer import IPlayer
 from IArena.utils.decorators import override
 from IArena.utils.RandomGenerator import RandomGenerator
-from IArena.utils.containing import SortedList
+from IArena.utils.BitDomain import BitDomain, bits
 from IArena.utils.excepting import ShouldNotHappenError
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.utils.CandidateSet import CandidateSet, feedback_array
+from IArena.utils.SlicingSolver import SlicingSolver, solver_for
+from IArena.utils.NQueensSolver import NQueensSolver
+from IArena.utils.HighestCardAdvisor import HighestCardAdvisor
+from IArena.utils.feedbacking import (
+    FeedbackType, all_codes, distance_feedback, feedback_code_count, feedback_codes, mastermind_code)
 
 
 class NumberGuess_OptimalPlayer(IPlayer):
@@ -32,7 +48,7 @@ class Wordle_OptimalPlayer_norep(IPlayer):
 
         self.code_size = None
         self.number_values = None
-        self.possibilities = None
+        self.domain = None
 
 
     def starting_game(
@@ -43,9 +59,7 @@ class Wordle_OptimalPlayer_norep(IPlayer):
         self.code_size = rules.code_size()
         self.number_values = rules.number_values()
 
-        self.possibilities = [
-            SortedList(range(self.number_values)) for _ in range(self.code_size)
-        ]
+        self.domain = BitDomain(self.code_size, self.number_values)
 
 
     def play(
@@ -60,46 +74,17 @@ class Wordle_OptimalPlayer_norep(IPlayer):
             return self._starting_all_numbers()
 
         # Update possibilities
-        for i, c in enumerate(last_correct):
-            guess_i = last_guess.guess[i]
-            if c == WordlePosition.WordleFeedback.Correct:
-                self.possibilities[i] = SortedList([guess_i])
-                for j in range(self.code_size):
-                    if j != i:
-                        self.possibilities[j].remove_if_exists(guess_i)
-            elif c == WordlePosition.WordleFeedback.Wrong:
-                for j in range(self.code_size):
-                    if guess_i in self.possibilities[j]:
-                        self.possibilities[j].remove_if_exists(guess_i)
-            else:
-                if guess_i in self.possibilities[i]:
-                    self.possibilities[i].remove_if_exists(guess_i)
+        _update_norep_domain(self.domain, last_guess, last_correct)
 
         # If in first rounds, try to play all numbers
         l = len(position.guesses())
         if l < (self.number_values // self.code_size + 1):
             return self._starting_all_numbers(l)
 
-        # If a value is unique in a position, it is correct
-        for i in range(self.code_size):
-            if len(self.possibilities[i]) == 1:
-                val = self.possibilities[i][0]
-                for j in range(self.code_size):
-                    if j != i:
-                        self.possibilities[j].remove_if_exists(val)
-
-        # If one value only appears in one position, it is correct
-        all_possibilities = []
-        for c in range(self.number_values):
-            count = 0
-            index = -1
-            for i in range(self.code_size):
-                if c in self.possibilities[i]:
-                    count += 1
-                    index = i
-            if count == 1:
-                self.possibilities[index] = SortedList([c])
-
+        # If a value is unique in a position, it is correct.
+        # If one value only appears in one position, it is correct, as every value not in the code
+        # has already been discarded in the first rounds.
+        self.domain.propagate_unique(hidden_singles=True)
 
         # Else, play arbitrary valid guess
         return self._arbitrary_guess()
@@ -115,43 +100,8 @@ class Wordle_OptimalPlayer_norep(IPlayer):
 
 
     def _arbitrary_guess(self) -> WordleMovement:
-
-        code_size = self.code_size
-        number_values = self.number_values
-        possibilities = self.possibilities
-
-        # Calculate number of possibilities for space
-        n_possibilities = [len(p) for p in possibilities]
-
-        # Move from the most constrained space
-        indexes = [0] * code_size
-
-        numbers_selected = set()
-        guess = []
-
-        index = 0
-
-        while index < code_size:
-
-            p = possibilities[index][indexes[index]]
-
-            if p not in numbers_selected:
-                numbers_selected.add(p)
-                guess.append(p)
-                index += 1
-
-            else:
-                indexes[index] += 1
-                while indexes[index] >= n_possibilities[index]:
-                    indexes[index] = 0
-                    index -= 1
-
-                    x = guess.pop()
-                    numbers_selected.remove(x)
-
-                    indexes[index] += 1
-
-        return WordleMovement(guess)
+        # Backtracking from the most constrained position
+        return WordleMovement(self.domain.first_unique_code())
 
 
 class Wordle_NonOptimalPlayer_norep(IPlayer):
@@ -166,7 +116,8 @@ class Wordle_NonOptimalPlayer_norep(IPlayer):
         self.rng = rng
         self.code_size = None
         self.number_values = None
-        self.possibilities = None
+        self.domain = None
+        self.order = None
 
 
     def starting_game(
@@ -177,10 +128,11 @@ class Wordle_NonOptimalPlayer_norep(IPlayer):
         self.code_size = rules.code_size()
         self.number_values = rules.number_values()
 
-        self.possibilities = [list(range(self.number_values)) for _ in range(self.code_size)]
+        self.domain = BitDomain(self.code_size, self.number_values)
 
-        # Shuffle possibilities
-        for p in self.possibilities:
+        # Shuffle the order in which the values of each position are tried
+        self.order = [list(range(self.number_values)) for _ in range(self.code_size)]
+        for p in self.order:
             self.rng.shuffle(p)
 
 
@@ -196,51 +148,28 @@ class Wordle_NonOptimalPlayer_norep(IPlayer):
             return self._arbitrary_guess()
 
         # Update possibilities
-        for i, c in enumerate(last_correct):
-            guess_i = last_guess.guess[i]
-            if c == WordlePosition.WordleFeedback.Correct:
-                self.possibilities[i] = [guess_i]
-                for j in range(self.code_size):
-                    if j != i:
-                        if guess_i in self.possibilities[j]:
-                            self.possibilities[j].remove(guess_i)
-            elif c == WordlePosition.WordleFeedback.Wrong:
-                for j in range(self.code_size):
-                    if guess_i in self.possibilities[j]:
-                        self.possibilities[j].remove(guess_i)
-            else:
-                if guess_i in self.possibilities[i]:
-                    self.possibilities[i].remove(guess_i)
+        _update_norep_domain(self.domain, last_guess, last_correct)
 
         return self._arbitrary_guess()
 
 
     def _arbitrary_guess(self) -> WordleMovement:
-
-        # Calculate number of possibilities for space
-        n_possibilities = [len(p) for p in self.possibilities]
-
-        # Move from the most constrained space
-        indexes = [0] * self.code_size
-
-        while True:
-
-            guess = [p[i] for i, p in zip(indexes,self.possibilities)]
-            while not self._no_rep_valid_guess(guess):
-                indexes[-1] += 1
-                i = -1
-                while indexes[i] >= n_possibilities[i]:
-                    indexes[i] = 0
-                    i -= 1
-                    indexes[i] += 1
-                guess = [p[i] for i, p in zip(indexes,self.possibilities)]
-
-            else:
-                return WordleMovement(guess)
-
-
-    def _no_rep_valid_guess(self, guess) -> bool:
-        return len(guess) == len(set(guess))
+        return WordleMovement(self.domain.first_unique_code(self.order))
+
+
+def _update_norep_domain(
+        domain: BitDomain,
+        guess: WordleMovement,
+        feedback: List[WordlePosition.WordleFeedback]):
+    """Remove from the domain the values that the Wordle feedback of a guess without repetitions discards."""
+    for i, c in enumerate(feedback):
+        guess_i = guess.guess[i]
+        if c == WordlePosition.WordleFeedback.Correct:
+            domain.fix_unique(i, guess_i)
+        elif c == WordlePosition.WordleFeedback.Wrong:
+            domain.remove_value(guess_i)
+        else:
+            domain.remove(i, guess_i)
 
 
 class Wordle_OptimalPlayer_rep(IPlayer):
@@ -725,3 +654,551 @@ class Mastermind_OptimalPlayer_rep(IPlayer):
 
     def _strategy2_first_move(self) -> MastermindMovement:
         return MastermindMovement(guess=list(self.fix_positions))
+
+
+
+class Mastermind_PartitionPlayer(IPlayer):
+    """
+    Mastermind player that chooses the guess that best splits the codes still consistent with the feedback.
+
+    Each guess splits the consistent codes by the feedback they would give.
+    With criterion 'minimax' the guess with the smallest biggest part is chosen (Knuth),
+    and with 'entropy' the one with the most expected information.
+    Guesses that may be the secret are preferred on ties.
+
+    When there are too many guesses or consistent codes, a random sample of them is used,
+    and the guesses are evaluated until the time budget of the move ends.
+    """
+
+    Criteria = ('minimax', 'entropy')
+
+    def __init__(
+            self,
+            name: str = None,
+            criterion: str = 'entropy',
+            move_time_s: float = 1.0,
+            max_guesses: int = 2048,
+            max_candidates: int = 4096,
+            seed: int = None):
+        """
+        Args:
+            name: Name of the player.
+            criterion: 'minimax' or 'entropy'.
+            move_time_s: Time budget of each move, half of it to look for consistent codes when the space is big.
+                Keep it under the move timeout of the game.
+            max_guesses: Maximum number of guesses evaluated in each move.
+            max_candidates: Maximum number of consistent codes each guess is evaluated against.
+            seed: Seed of the samples.
+        """
+        if criterion not in self.Criteria:
+            raise ValueError(f"Criterion must be one of {self.Criteria}, not {criterion}")
+
+        super().__init__(name=name)
+
+        self.criterion = criterion
+        self.move_time_s = move_time_s
+        self.max_guesses = max_guesses
+        self.max_candidates = max_candidates
+        self.seed = seed
+
+        self.code_space = None
+        self.candidates = None
+        self.rng = None
+
+
+    @override
+    def starting_game(
+            self,
+            rules: MastermindRules,
+            player_index: int):
+
+        self.rng = random.Random(self.seed)
+        self.code_space = CodeSpace(rules.code_size(), rules.number_values(), rules.allow_repetition())
+        self.candidates = CandidateSet(
+            FeedbackType.Mastermind,
+            rules.code_size(),
+            rules.number_values(),
+            rules.allow_repetition(),
+            sampling_time_s=self.move_time_s / 2,
+            seed=self.rng.randrange(1 << 32))
+
+
+    @override
+    def play(
+            self,
+            position: MastermindPosition) -> MastermindMovement:
+
+        start = time.monotonic()
+
+        last_guess = position.last_guess()
+        if last_guess is not None:
+            self.candidates.update(
+                last_guess.guess, feedback_array(FeedbackType.Mastermind, position.last_feedback()))
+
+        candidates = self.candidates.sample(self.max_candidates)
+
+        # Nothing to split: play the only candidate, or the closest code to be consistent if sampling found none
+        if len(candidates) == 0:
+            nearest = self.candidates.nearest_codes()
+            if len(nearest) > 0:
+                return MastermindMovement(guess=nearest[0].tolist())
+            return MastermindMovement(guess=self.code_space.sample(self.rng))
+        if len(candidates) <= 2:
+            return MastermindMovement(guess=candidates[0].tolist())
+
+        guesses = self._guess_pool(candidates)
+        guess = self._best_guess(guesses, candidates, start)
+        return MastermindMovement(guess=guess.tolist())
+
+
+    def _guess_pool(
+            self,
+            candidates: np.ndarray) -> np.ndarray:
+        """Consistent codes first, completed with random codes of the space up to max_guesses."""
+        pool = candidates[:self.max_guesses // 2]
+        n_random = min(self.max_guesses - len(pool), self.code_space.size())
+        if n_random <= 0:
+            return pool
+        if self.code_space.size() <= self.max_guesses:
+            others = all_codes(self.code_space.code_size, self.code_space.number_values, self.code_space.allow_repetition)
+        else:
+            others = np.array([self.code_space.sample(self.rng) for _ in range(n_random)], dtype=np.int64)
+        return np.concatenate([pool, others], axis=0)
+
+
+    def _best_guess(
+            self,
+            guesses: np.ndarray,
+            candidates: np.ndarray,
+            start: float) -> np.ndarray:
+        """Guess with the best score, evaluating blocks of guesses until the time budget ends."""
+        code_size = guesses.shape[1]
+        n_feedback = feedback_code_count(FeedbackType.Mastermind, code_size)
+        win = mastermind_code(code_size, 0, code_size)
+        block = max(1, (1 << 22) // max(1, len(candidates) * code_size))
+
+        best_score = None
+        best_guess = guesses[0]
+        for first in range(0, len(guesses), block):
+            chunk = guesses[first:first + block]
+            codes = feedback_codes(FeedbackType.Mastermind, chunk, candidates, self.code_space.number_values)
+
+            # Size of each part for each guess, counting all the rows at once
+            offsets = codes + np.arange(len(chunk), dtype=np.int64)[:, None] * n_feedback
+            parts = np.bincount(offsets.ravel(), minlength=len(chunk) * n_feedback).reshape(len(chunk), n_feedback)
+
+            if self.criterion == 'minimax':
+                score = -parts.max(axis=1).astype(np.float64)
+            else:
+                p = parts / len(candidates)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    score = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+
+            # Prefer guesses that may win
+            score = score + 1e-6 * (parts[:, win] > 0)
+
+            i = int(np.argmax(score))
+            if best_score is None or score[i] > best_score:
+                best_score = score[i]
+                best_guess = chunk[i]
+
+            if time.monotonic() - start > self.move_time_s:
+                break
+
+        return best_guess
+
+
+
+class DistanceWordle_OptimalPlayer_norep(IPlayer):
+    """
+    DistanceWordle player without repetitions that keeps the exact constraints of the feedback as bitmask domains.
+
+    Without repetitions, the distance d of the value v at index i means:
+    0: v is at i. n: v is not in the code. Otherwise: v is at i-d or at i+d.
+    So a code is consistent with the feedback if and only if it is inside the domain and has every value
+    known to be in the code.
+
+    Each move samples consistent codes and plays the one whose feedback best splits the others (most entropy),
+    evaluating them until the time budget of the move ends.
+    """
+
+    def __init__(
+            self,
+            name: str = None,
+            move_time_s: float = 1.0,
+            samples: int = 256,
+            seed: int = None):
+        """
+        Args:
+            name: Name of the player.
+            move_time_s: Time budget of each move. Keep it under the move timeout of the game.
+            samples: Consistent codes sampled in each move, used both as guesses and as possible secrets.
+            seed: Seed of the samples.
+        """
+        super().__init__(name=name)
+
+        self.move_time_s = move_time_s
+        self.samples = samples
+        self.seed = seed
+
+        self.code_size = None
+        self.number_values = None
+        self.domain = None
+        self.required = None
+        self.rng = None
+
+
+    @override
+    def starting_game(
+            self,
+            rules: DistanceWordleRules,
+            player_index: int):
+
+        self.code_size = rules.code_size()
+        self.number_values = rules.number_values()
+        self.domain = BitDomain(self.code_size, self.number_values)
+        # Mask of the values known to be in the code
+        self.required = 0
+        self.rng = random.Random(self.seed)
+
+
+    @override
+    def play(
+            self,
+            position: DistanceWordlePosition) -> DistanceWordleMovement:
+
+        start = time.monotonic()
+
+        last_guess = position.last_guess()
+        if last_guess is not None:
+            self._update(last_guess.guess, position.last_feedback())
+
+        codes = self._consistent_codes(start)
+        if len(codes) <= 2:
+            return DistanceWordleMovement(guess=list(codes[0]))
+
+        codes = np.array(codes, dtype=np.int64)
+        guesses = np.concatenate([codes, self._exploring_guesses(codes)], axis=0)
+        return DistanceWordleMovement(guess=self._best_guess(guesses, codes, start))
+
+
+    def _update(
+            self,
+            guess: List[int],
+            feedback: List[int]):
+        """Add the constraints of the feedback of a guess to the domain, and propagate them."""
+        n = self.code_size
+        for i, (v, d) in enumerate(zip(guess, feedback)):
+            if d == 0:
+                self.domain.fix_unique(i, v)
+                self.required |= 1 << v
+            elif d >= n:
+                self.domain.remove_value(v)
+            else:
+                self.required |= 1 << v
+                allowed = 0
+                for j in (i - d, i + d):
+                    if 0 <= j < n:
+                        allowed |= 1 << j
+                for j in bits(self.domain.value_masks[v] & ~allowed):
+                    self.domain.remove(j, v)
+
+        self.domain.propagate_unique(required=self.required)
+
+
+    def _consistent_codes(
+            self,
+            start: float) -> List[Tuple[int]]:
+        """Different consistent codes found by random backtracking, at least one."""
+        codes = {tuple(self.domain.first_unique_code(required=self.required))}
+        for _ in range(self.samples):
+            if time.monotonic() - start > self.move_time_s / 2:
+                break
+            codes.add(tuple(self.domain.random_unique_code(self.rng, required=self.required)))
+        return sorted(codes)
+
+
+    def _exploring_guesses(
+            self,
+            codes: np.ndarray) -> np.ndarray:
+        """
+        Consistent codes with a growing share of their positions changed to values not tried yet.
+
+        They may not be the secret, but when many values are unknown they split the consistent codes better.
+        Changing fixed positions also helps: a value there tells by its distance where else it may be.
+        """
+        # Values that may or may not be in the code
+        untried = [v for v in range(self.number_values)
+                   if not self.required >> v & 1 and self.domain.value_masks[v]]
+        if not untried:
+            return codes[:0]
+
+        guesses = codes.copy()
+        for guess, share in zip(guesses, np.linspace(0, 1, len(guesses))):
+            values = [v for v in untried if v not in guess]
+            self.rng.shuffle(values)
+            for i in range(self.code_size):
+                if not values:
+                    break
+                if self.rng.random() < share:
+                    guess[i] = values.pop()
+        return guesses
+
+
+    def _best_guess(
+            self,
+            guesses: np.ndarray,
+            codes: np.ndarray,
+            start: float) -> List[int]:
+        """Guess whose feedback against the consistent codes has the most entropy, preferring consistent ones."""
+        # Random weights to identify each feedback vector by a single integer
+        weights = np.array([self.rng.getrandbits(62) for _ in range(self.code_size)], dtype=np.int64)
+        block = max(1, (1 << 22) // (len(codes) * self.code_size))
+
+        best_score = -1.0
+        best_guess = guesses[0]
+        for first in range(0, len(guesses), block):
+            chunk = guesses[first:first + block]
+            feedback = distance_feedback(chunk, codes, self.number_values).astype(np.int64)
+            with np.errstate(over='ignore'):
+                keys = np.sort(feedback @ weights, axis=1)
+
+            # Size of the runs of equal keys in each row
+            starts = np.ones(keys.shape, dtype=bool)
+            starts[:, 1:] = keys[:, 1:] != keys[:, :-1]
+            for k, (row, row_starts) in enumerate(zip(chunk, starts)):
+                sizes = np.diff(np.append(np.nonzero(row_starts)[0], len(codes)))
+                p = sizes / len(codes)
+                score = -float((p * np.log2(p)).sum())
+                # Consistent codes (first in the guesses) may win, so they win the ties
+                if first + k < len(codes):
+                    score += 1e-6
+                if score > best_score:
+                    best_score = score
+                    best_guess = row
+
+            if time.monotonic() - start > self.move_time_s:
+                break
+
+        return best_guess.tolist()
+
+
+class FieldWalk_OptimalPlayer(IPlayer):
+    """
+    Follows a path of minimum cost, computed once for the whole map when the game starts.
+
+    From each square it moves to the neighbour whose cost plus minimum cost to the goal is the lowest,
+    so it also reaches the goal optimally from any square it is given.
+    """
+
+    Directions = (
+        ((-1, 0), FieldWalkMovement.Direction.Up),
+        ((1, 0), FieldWalkMovement.Direction.Down),
+        ((0, -1), FieldWalkMovement.Direction.Left),
+        ((0, 1), FieldWalkMovement.Direction.Right),
+    )
+
+    @override
+    def starting_game(
+            self,
+            rules: FieldWalkRules,
+            player_index: int):
+        self.squares = rules.get_map().squares
+        self.cost_to_goal = rules.get_map().cost_to_goal()
+
+    @override
+    def play(
+            self,
+            position: FieldWalkPosition) -> FieldWalkMovement:
+        rows, cols = self.squares.shape
+        best = None
+        for (dx, dy), direction in FieldWalk_OptimalPlayer.Directions:
+            x, y = position.x + dx, position.y + dy
+            if 0 <= x < rows and 0 <= y < cols:
+                cost = self.squares[x, y] + self.cost_to_goal[x, y]
+                if best is None or cost < best[0]:
+                    best = (cost, direction)
+        return FieldWalkMovement(best[1])
+
+
+class SlicingPuzzle_OptimalPlayer(IPlayer):
+    """
+    Solves the board with IDA* when the game starts, and then plays the moves of the solution.
+
+    Pattern databases make 4x4 boards solvable in a few seconds. They are only used if they are already built,
+    unless asked to build them (which takes minutes for 4x4, but only once: they are kept in the cache directory).
+    If the optimal solution is not found in the time budget, a weighted search finds a good one instead.
+    """
+
+    def __init__(
+            self,
+            name: str = None,
+            pattern_databases: bool = None,
+            move_time_s: float = 8.0,
+            fallback_weight: float = 1.5):
+        """
+        Args:
+            name: Name of the player.
+            pattern_databases: True to use them (building them if needed), False to never use them,
+                or None to use them only if they are already built.
+            move_time_s: Time budget to look for the optimal solution. Keep it under the move timeout of the game.
+            fallback_weight: Weight of the heuristic of the search used when the time budget runs out.
+        """
+        super().__init__(name=name)
+        self.pattern_databases = pattern_databases
+        self.move_time_s = move_time_s
+        self.fallback_weight = fallback_weight
+
+    @override
+    def starting_game(
+            self,
+            rules: SlicingPuzzleRules,
+            player_index: int):
+        self.solver = solver_for(rules.n, self.pattern_databases)
+        self._plan(rules.first_position())
+
+    def _plan(
+            self,
+            position: SlicingPuzzlePosition):
+        """Moves of the empty space to solve the board of the position."""
+        try:
+            self.solution = self.solver.solve(position.key(), deadline=time.time() + self.move_time_s)
+        except SlicingSolver.Timeout:
+            self.solution = self.solver.solve(position.key(), weight=self.fallback_weight)
+        self.next_move = 0
+        self.expected_key = position.key()
+
+    @override
+    def play(
+            self,
+            position: SlicingPuzzlePosition) -> SlicingPuzzleMovement:
+        if position.key() != self.expected_key:
+            self._plan(position)
+
+        movement = self._movement(self.solution[self.next_move] - position.blank_, position.n)
+        self.next_move += 1
+        self.expected_key = position.get_rules().next_position(movement, position).key()
+        return movement
+
+    @staticmethod
+    def _movement(
+            delta: int,
+            n: int) -> SlicingPuzzleMovement:
+        """Movement that moves the empty space by delta indexes (the square moves the opposite way)."""
+        if delta == n:
+            return SlicingPuzzleMovement.Values.Up
+        if delta == -n:
+            return SlicingPuzzleMovement.Values.Down
+        if delta == 1:
+            return SlicingPuzzleMovement.Values.Left
+        return SlicingPuzzleMovement.Values.Right
+
+
+class Hanoi_OptimalPlayer(IPlayer):
+    """
+    Plays the Frame-Stewart solution from the first position.
+
+    If it is given a position out of its solution, it looks for a new one from it with the rules.
+    """
+
+    @override
+    def starting_game(
+            self,
+            rules: HanoiRules,
+            player_index: int):
+        self._plan(rules.first_position())
+
+    def _plan(
+            self,
+            position: HanoiPosition):
+        self.solution = position.get_rules().solution(position)
+        self.next_move = 0
+        self.expected_key = position.key()
+
+    @override
+    def play(
+            self,
+            position: HanoiPosition) -> HanoiMovement:
+        if position.key() != self.expected_key:
+            self._plan(position)
+
+        movement = self.solution[self.next_move]
+        self.next_move += 1
+        self.expected_key = position.get_rules().next_position(movement, position).key()
+        return movement
+
+
+class NQueens_OptimalPlayer(IPlayer):
+    """
+    Finds a board without attacks when the game starts (the least attacked one for 2 and 3),
+    and places its queens one row after the other.
+
+    Backtracking solves small boards, and min-conflicts boards with thousands of rows.
+    """
+
+    def __init__(
+            self,
+            name: str = None,
+            seed: int = None):
+        """
+        Args:
+            name: Name of the player.
+            seed: Seed of the solver for large boards.
+        """
+        super().__init__(name=name)
+        self.seed = seed
+
+    @override
+    def starting_game(
+            self,
+            rules: NQueensRules,
+            player_index: int):
+        self.columns = NQueensSolver(rules.get_size(), self.seed).solve()
+        self.next_row = 0
+
+    @override
+    def play(
+            self,
+            position: NQueensPosition) -> NQueensMovement:
+        # Skip the queens of the solution already in the board
+        while self.next_row < len(self.columns) - 1 and \
+                position.is_occupied((self.next_row, self.columns[self.next_row])):
+            self.next_row += 1
+        return NQueensMovement((self.next_row, self.columns[self.next_row]))
+
+
+class HighestCard_OptimalPlayer(IPlayer):
+    """
+    Bets the number of rounds with the lowest expected score, knowing only its cards.
+
+    The expected scores come from an exact table of every hand in small games, and from Monte Carlo deals otherwise.
+    """
+
+    def __init__(
+            self,
+            name: str = None,
+            samples: int = 20000,
+            seed: int = None):
+        """
+        Args:
+            name: Name of the player.
+            samples: Deals simulated by Monte Carlo in large games.
+            seed: Seed of the Monte Carlo deals.
+        """
+        super().__init__(name=name)
+        self.samples = samples
+        self.seed = seed
+
+    @override
+    def starting_game(
+            self,
+            rules: HighestCardRules,
+            player_index: int):
+        self.advisor = HighestCardAdvisor(
+            rules.n_players(), rules.m_cards(), samples=self.samples, seed=self.seed, deck=rules.deck())
+
+    @override
+    def play(
+            self,
+            position: HighestCardPosition) -> HighestCardMovement:
+        return HighestCardMovement(self.advisor.best_bet(position.get_cards()))
@@ -0,0 +1,249 @@
+from typing import List
+import numpy as np
+
+from IArena.games.PrisonerDilemma import PrisonerDilemmaMovement
+from IArena.games.IteratedPrisonerDilemma import IteratedPrisonerDilemmaPosition, IteratedPrisonerDilemmaRules
+from IArena.interfaces.IPlayer import IPlayer
+from IArena.interfaces.PlayerIndex import two_player_game_change_player
+from IArena.utils.decorators import override, pure_virtual
+
+"""
+Classic strategies of the Iterated Prisoner Dilemma, from the tournaments of Axelrod.
+
+Strategies decide over the history of many matches at once: they receive the decisions of both players
+in each round played as int8 arrays of shape (matches, rounds), 0 to cooperate and 1 to defect,
+and return the decision of the next round of every match. So the same strategy plays a game with
+PrisonerStrategyPlayer, or thousands of matches at once in IteratedPrisonerTournament.
+"""
+
+Cooperate = np.int8(PrisonerDilemmaMovement.Cooperate)
+Defect = np.int8(PrisonerDilemmaMovement.Defect)
+
+
+class PrisonerStrategy:
+    """Strategy of the Iterated Prisoner Dilemma, deciding for many matches at once."""
+
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @pure_virtual
+    def decide(
+            self,
+            own: np.ndarray,
+            other: np.ndarray,
+            rng: np.random.Generator) -> np.ndarray:
+        """
+        Args:
+            own: Decisions of the player, with shape (matches, rounds played).
+            other: Decisions of the opponent, with the same shape.
+            rng: Random generator for the strategies that need it.
+
+        Returns:
+            Decision of the player in the next round of each match, as an int8 array of shape (matches,).
+        """
+        pass
+
+    def decide_counted(
+            self,
+            own: np.ndarray,
+            other: np.ndarray,
+            defections: np.ndarray,
+            rng: np.random.Generator) -> np.ndarray:
+        """
+        Same as decide, also given the number of times the opponent has defected in each match.
+
+        IteratedPrisonerTournament calls this method and keeps the counts as the rounds are played,
+        so strategies that only need them do not read the whole history each round.
+        By default, it calls decide.
+        """
+        return self.decide(own, other, rng)
+
+    @staticmethod
+    def _all(
+            own: np.ndarray,
+            decision: np.int8) -> np.ndarray:
+        return np.full(own.shape[0], decision, dtype=np.int8)
+
+
+class Cooperator(PrisonerStrategy):
+    """Always cooperates."""
+
+    @override
+    def decide(self, own, other, rng):
+        return PrisonerStrategy._all(own, Cooperate)
+
+
+class Defector(PrisonerStrategy):
+    """Always defects."""
+
+    @override
+    def decide(self, own, other, rng):
+        return PrisonerStrategy._all(own, Defect)
+
+
+class RandomStrategy(PrisonerStrategy):
+    """Defects with a fixed probability."""
+
+    def __init__(self, defect_probability: float = 0.5):
+        self.defect_probability = defect_probability
+
+    @override
+    def decide(self, own, other, rng):
+        return (rng.random(own.shape[0]) < self.defect_probability).astype(np.int8)
+
+
+class TitForTat(PrisonerStrategy):
+    """Cooperates first, and then repeats the last decision of the opponent."""
+
+    @override
+    def decide(self, own, other, rng):
+        if other.shape[1] == 0:
+            return PrisonerStrategy._all(own, Cooperate)
+        return other[:, -1].copy()
+
+
+class SuspiciousTitForTat(PrisonerStrategy):
+    """Defects first, and then repeats the last decision of the opponent."""
+
+    @override
+    def decide(self, own, other, rng):
+        if other.shape[1] == 0:
+            return PrisonerStrategy._all(own, Defect)
+        return other[:, -1].copy()
+
+
+class TitForTwoTats(PrisonerStrategy):
+    """Defects only if the opponent defected in the last two rounds."""
+
+    @override
+    def decide(self, own, other, rng):
+        if other.shape[1] < 2:
+            return PrisonerStrategy._all(own, Cooperate)
+        return other[:, -1] & other[:, -2]
+
+
+class GenerousTitForTat(PrisonerStrategy):
+    """Tit for tat that forgives a defection of the opponent with some probability."""
+
+    def __init__(self, generosity: float = 1 / 3):
+        self.generosity = generosity
+
+    @override
+    def decide(self, own, other, rng):
+        if other.shape[1] == 0:
+            return PrisonerStrategy._all(own, Cooperate)
+        forgive = rng.random(own.shape[0]) < self.generosity
+        return other[:, -1] & ~forgive
+
+
+class Joss(PrisonerStrategy):
+    """Tit for tat that defects instead of cooperating with some probability."""
+
+    def __init__(self, sneak_probability: float = 0.1):
+        self.sneak_probability = sneak_probability
+
+    @override
+    def decide(self, own, other, rng):
+        sneak = (rng.random(own.shape[0]) < self.sneak_probability).astype(np.int8)
+        if other.shape[1] == 0:
+            return sneak
+        return other[:, -1] | sneak
+
+
+class Grudger(PrisonerStrategy):
+    """Cooperates until the opponent defects once, and defects from then on."""
+
+    @override
+    def decide(self, own, other, rng):
+        return self.decide_counted(own, other, other.sum(axis=1, dtype=np.int64), rng)
+
+    @override
+    def decide_counted(self, own, other, defections, rng):
+        return (defections > 0).astype(np.int8)
+
+
+class Pavlov(PrisonerStrategy):
+    """Win stay, lose shift: cooperates if both players made the same decision in the last round."""
+
+    @override
+    def decide(self, own, other, rng):
+        if other.shape[1] == 0:
+            return PrisonerStrategy._all(own, Cooperate)
+        return own[:, -1] ^ other[:, -1]
+
+
+class Alternator(PrisonerStrategy):
+    """Cooperates and defects in turns."""
+
+    @override
+    def decide(self, own, other, rng):
+        return PrisonerStrategy._all(own, np.int8(own.shape[1] % 2))
+
+
+class SoftMajority(PrisonerStrategy):
+    """Cooperates while the opponent has cooperated at least as many times as it has defected."""
+
+    @override
+    def decide(self, own, other, rng):
+        return self.decide_counted(own, other, other.sum(axis=1, dtype=np.int64), rng)
+
+    @override
+    def decide_counted(self, own, other, defections, rng):
+        return (2 * defections > other.shape[1]).astype(np.int8)
+
+
+class HardMajority(PrisonerStrategy):
+    """Defects while the opponent has defected at least as many times as it has cooperated."""
+
+    @override
+    def decide(self, own, other, rng):
+        return self.decide_counted(own, other, other.sum(axis=1, dtype=np.int64), rng)
+
+    @override
+    def decide_counted(self, own, other, defections, rng):
+        return (2 * defections >= other.shape[1]).astype(np.int8)
+
+
+def classic_strategies() -> List[PrisonerStrategy]:
+    """One of each strategy of this module, with their default parameters."""
+    return [
+        Cooperator(), Defector(), RandomStrategy(), TitForTat(), SuspiciousTitForTat(), TitForTwoTats(),
+        GenerousTitForTat(), Joss(), Grudger(), Pavlov(), Alternator(), SoftMajority(), HardMajority(),
+    ]
+
+
+class PrisonerStrategyPlayer(IPlayer):
+    """
+    Plays the Iterated Prisoner Dilemma with a strategy, over the history of the position.
+    """
+
+    def __init__(
+            self,
+            strategy: PrisonerStrategy,
+            name: str = None,
+            seed: int = None):
+        """
+        Args:
+            strategy: Strategy that decides each round.
+            name: Name of the player. By default, the name of the strategy.
+            seed: Seed of the random generator given to the strategy.
+        """
+        super().__init__(name=name if name is not None else strategy.name())
+        self.strategy = strategy
+        self.seed = seed
+
+    @override
+    def starting_game(
+            self,
+            rules: IteratedPrisonerDilemmaRules,
+            player_index: int):
+        self.player_index = player_index
+        self.rng = np.random.default_rng(self.seed)
+
+    @override
+    def play(
+            self,
+            position: IteratedPrisonerDilemmaPosition) -> PrisonerDilemmaMovement:
+        own = position.history(self.player_index)[np.newaxis]
+        other = position.history(two_player_game_change_player(self.player_index))[np.newaxis]
+        return PrisonerDilemmaMovement(int(self.strategy.decide(own, other, self.rng)[0]))
@@ -0,0 +1,236 @@
+import random
+from typing import Iterator, List
+
+"""
+Possible values of each position of a code, kept as integer bitmasks.
+
+Every position has a bitmask of the values it may have, and every value a bitmask of the positions it may be in.
+Both views are updated together, so removing a value, fixing a position or finding the only position of a value
+are a few integer operations instead of loops over lists.
+"""
+
+
+if hasattr(int, 'bit_count'):
+    def popcount(mask: int) -> int:
+        """Number of bits set in a mask."""
+        return mask.bit_count()
+else:
+    def popcount(mask: int) -> int:
+        """Number of bits set in a mask."""
+        return bin(mask).count('1')
+
+
+def bits(mask: int) -> Iterator[int]:
+    """Indexes of the bits set in a mask, from the lowest."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitDomain:
+    """
+    Domain of code_size positions with values from 0 to number_values-1.
+
+    position_masks[i] has bit v set if position i may have value v.
+    value_masks[v] has bit i set if value v may be in position i.
+    """
+
+    def __init__(
+            self,
+            code_size: int,
+            number_values: int):
+        self.code_size = code_size
+        self.number_values = number_values
+        self.all_values = (1 << number_values) - 1
+        self.all_positions = (1 << code_size) - 1
+        self.position_masks = [self.all_values] * code_size
+        self.value_masks = [self.all_positions] * number_values
+
+    def copy(self) -> "BitDomain":
+        domain = BitDomain.__new__(BitDomain)
+        domain.code_size = self.code_size
+        domain.number_values = self.number_values
+        domain.all_values = self.all_values
+        domain.all_positions = self.all_positions
+        domain.position_masks = list(self.position_masks)
+        domain.value_masks = list(self.value_masks)
+        return domain
+
+    ###############
+    # Queries
+
+    def has(self, position: int, value: int) -> bool:
+        """Whether the position may have the value."""
+        return bool(self.position_masks[position] >> value & 1)
+
+    def count(self, position: int) -> int:
+        """Number of values the position may have."""
+        return popcount(self.position_masks[position])
+
+    def values(self, position: int) -> List[int]:
+        """Values the position may have, sorted."""
+        return list(bits(self.position_masks[position]))
+
+    def positions(self, value: int) -> List[int]:
+        """Positions the value may be in, sorted."""
+        return list(bits(self.value_masks[value]))
+
+    def is_fixed(self, position: int) -> bool:
+        """Whether the position may only have one value."""
+        mask = self.position_masks[position]
+        return mask != 0 and mask & (mask - 1) == 0
+
+    def fixed_value(self, position: int) -> int:
+        """Value of a fixed position, or None if it is not fixed."""
+        if not self.is_fixed(position):
+            return None
+        return self.position_masks[position].bit_length() - 1
+
+    def is_empty(self) -> bool:
+        """Whether some position cannot have any value."""
+        return not all(self.position_masks)
+
+    ###############
+    # Updates
+
+    def remove(self, position: int, value: int):
+        """The position does not have the value."""
+        self.position_masks[position] &= ~(1 << value)
+        self.value_masks[value] &= ~(1 << position)
+
+    def remove_value(self, value: int):
+        """The value is in no position."""
+        bit = ~(1 << value)
+        for position in bits(self.value_masks[value]):
+            self.position_masks[position] &= bit
+        self.value_masks[value] = 0
+
+    def fix(self, position: int, value: int):
+        """The position has the value, and no other."""
+        bit = ~(1 << position)
+        for other in bits(self.position_masks[position] & ~(1 << value)):
+            self.value_masks[other] &= bit
+        self.position_masks[position] = 1 << value
+        self.value_masks[value] |= 1 << position
+
+    def fix_unique(self, position: int, value: int):
+        """The position has the value, and, as values are not repeated, no other position has it."""
+        self.fix(position, value)
+        bit = ~(1 << value)
+        for other in bits(self.value_masks[value] & ~(1 << position)):
+            self.position_masks[other] &= bit
+        self.value_masks[value] = 1 << position
+
+    def propagate_unique(
+            self,
+            hidden_singles: bool = False,
+            required: int = 0) -> bool:
+        """
+        Propagate the constraints of codes without repeated values until nothing changes.
+
+        A fixed position removes its value from the other positions.
+        A value that must be in the code and may only be in one position is fixed there.
+        If the code must have as many values as positions, the rest of values are removed.
+
+        Args:
+            hidden_singles: Whether every value left in the domain is known to be in the code.
+            required: Mask of the values known to be in the code.
+
+        Returns:
+            Whether the domain changed.
+        """
+        changed = False
+        pending = True
+        while pending:
+            pending = False
+            for position in range(self.code_size):
+                mask = self.position_masks[position]
+                if mask and mask & (mask - 1) == 0:
+                    value = mask.bit_length() - 1
+                    if self.value_masks[value] != 1 << position:
+                        self.fix_unique(position, value)
+                        pending = True
+            single_values = range(self.number_values) if hidden_singles else bits(required)
+            for value in single_values:
+                mask = self.value_masks[value]
+                if mask and mask & (mask - 1) == 0:
+                    position = mask.bit_length() - 1
+                    if self.position_masks[position] != 1 << value:
+                        self.fix_unique(position, value)
+                        pending = True
+            if popcount(required) == self.code_size:
+                for value in bits(self.all_values & ~required):
+                    if self.value_masks[value]:
+                        self.remove_value(value)
+                        pending = True
+            changed |= pending
+        return changed
+
+    ###############
+    # Search
+
+    def first_unique_code(
+            self,
+            order: List[List[int]] = None,
+            required: int = 0) -> List[int]:
+        """
+        First code without repeated values inside the domain, or None if there is none.
+
+        Positions are filled from the most constrained one, trying their values in the order given
+        (sorted by default), with backtracking.
+
+        Args:
+            order: Order to try the values of each position. Values out of the domain are skipped.
+            required: Mask of the values the code must have.
+        """
+        positions = sorted(range(self.code_size), key=lambda i: popcount(self.position_masks[i]))
+        if order is None:
+            candidates = [self.values(i) for i in positions]
+        else:
+            candidates = [[v for v in order[i] if self.position_masks[i] >> v & 1] for i in positions]
+
+        code = [0] * self.code_size
+        indexes = [0] * self.code_size
+        used = 0
+        depth = 0
+        while 0 <= depth < self.code_size:
+            options = candidates[depth]
+            # Values not used yet, leaving enough positions for the required values still missing
+            free = self.code_size - depth - 1
+            while indexes[depth] < len(options) and (
+                    used >> options[indexes[depth]] & 1
+                    or popcount(required & ~(used | 1 << options[indexes[depth]])) > free):
+                indexes[depth] += 1
+            if indexes[depth] < len(options):
+                value = options[indexes[depth]]
+                code[positions[depth]] = value
+                used |= 1 << value
+                depth += 1
+            else:
+                # Backtrack: free the value of the previous position and try its next one
+                indexes[depth] = 0
+                depth -= 1
+                if depth >= 0:
+                    used &= ~(1 << code[positions[depth]])
+                    indexes[depth] += 1
+
+        if depth < 0:
+            return None
+        return code
+
+    def random_unique_code(
+            self,
+            rng: random.Random,
+            required: int = 0) -> List[int]:
+        """Code without repeated values inside the domain with the required values, trying values in random order."""
+        order = [self.values(i) for i in range(self.code_size)]
+        for values in order:
+            rng.shuffle(values)
+        return self.first_unique_code(order, required)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BitDomain) and self.position_masks == other.position_masks
+
+    def __str__(self) -> str:
+        return str([self.values(i) for i in range(self.code_size)])
@@ -0,0 +1,452 @@
+import math
+import time
+from typing import Any, List, Sequence
+import numpy as np
+
+from IArena.utils.feedbacking import (
+    CodeArray, CodeLike, FeedbackType, as_code_array, code_ranks, codes_from_ranks, mastermind_code,
+    positional_code, raw_feedback)
+
+"""
+Set of codes consistent with the guesses and feedback received so far in a code-breaking game.
+
+While the consistent codes fit in memory, they are kept as a sorted array of their ranks (positions in all_codes order,
+as Python integers when the space is bigger than an int64) and filtered with the vectorized feedback kernel after each feedback.
+When the space is too big to be materialized, the set keeps per-position domains deduced from the feedback
+and a reservoir of consistent codes found by sampling those domains, checked against the whole history.
+Once the product of the domains is small enough, the set materializes it and becomes exact.
+"""
+
+# Maximum number of candidates kept as an array of ranks
+DEFAULT_MAX_MATERIALIZED = 1 << 21
+
+# Number of consistent codes kept when the set is not materialized
+DEFAULT_RESERVOIR_SIZE = 256
+
+# Number of random codes generated (in batches) to refill the reservoir after each feedback
+DEFAULT_SAMPLING_BUDGET = 1 << 16
+
+# Number of candidates filtered at once
+_FILTER_BLOCK = 1 << 16
+
+
+def feedback_array(
+        feedback_type: FeedbackType,
+        feedback: Any) -> np.ndarray:
+    """
+    Feedback of a game as the integer array returned by raw_feedback.
+
+    Args:
+        feedback: MastermindFeedback-like object (correct, misplaced) for Mastermind,
+            list of WordleFeedback (or their values) for Wordle, list of distances for Distance.
+    """
+    if feedback_type == FeedbackType.Mastermind:
+        return np.array([feedback.correct, feedback.misplaced], dtype=np.int64)
+    return np.array([getattr(x, 'value', x) for x in feedback], dtype=np.int64)
+
+
+def vector_wordle_feedback_array(
+        positive_feedback: Sequence[int],
+        misplaced_feedback: Sequence[int],
+        code_size: int) -> np.ndarray:
+    """Feedback of VectorWordle (correct and misplaced positions) as a Wordle feedback array."""
+    feedback = np.zeros(code_size, dtype=np.int64)
+    feedback[list(misplaced_feedback)] = 1
+    feedback[list(positive_feedback)] = 2
+    return feedback
+
+
+class CandidateSet:
+    """
+    Codes consistent with the history of a code-breaking game, updated incrementally.
+
+    Codes are arrays of integers from 0 to number_values-1. Games with symbols (colors, letters)
+    must be converted to their indexes before using the set.
+    """
+
+    def __init__(
+            self,
+            feedback_type: FeedbackType,
+            code_size: int,
+            number_values: int,
+            allow_repetition: bool = True,
+            max_materialized: int = DEFAULT_MAX_MATERIALIZED,
+            reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+            sampling_budget: int = DEFAULT_SAMPLING_BUDGET,
+            sampling_time_s: float = None,
+            table=None,
+            seed: int = 0):
+        """
+        Args:
+            feedback_type: Feedback semantics of the game.
+            code_size: Size of the codes.
+            number_values: Number of different values of each position.
+            allow_repetition: Whether the codes can have repeated values.
+            max_materialized: Maximum number of candidates kept as an array.
+            reservoir_size: Consistent codes kept while the set is not materialized.
+            sampling_budget: Random codes checked after each feedback to refill the reservoir.
+            sampling_time_s: Maximum time to refill the reservoir after each feedback. None for no limit.
+            table: Optional FeedbackTable of the space, used instead of the kernel while materialized.
+            seed: Seed of the sampling.
+        """
+        self.feedback_type = feedback_type
+        self.code_size = code_size
+        self.number_values = number_values
+        self.allow_repetition = allow_repetition
+        self.max_materialized = max_materialized
+        self.reservoir_size = reservoir_size
+        self.sampling_budget = sampling_budget
+        self.sampling_time_s = sampling_time_s
+        self.table = table
+        self.rng = np.random.default_rng(seed)
+
+        # History as arrays of guesses and raw feedback
+        self.guesses: List[np.ndarray] = []
+        self.feedback: List[np.ndarray] = []
+
+        # domains[i, v] whether value v may be in position i
+        self.domains = np.ones((code_size, number_values), dtype=bool)
+        # Values that must appear at least this number of times
+        self.min_count = np.zeros(number_values, dtype=np.int64)
+
+        self.ranks = None
+        self.reservoir = np.zeros((0, code_size), dtype=np.int64)
+        # Least inconsistent codes of the last search, while the reservoir is empty
+        self.nearest = np.zeros((0, code_size), dtype=np.int64)
+
+        if self.space_size() <= max_materialized:
+            self.ranks = np.arange(self.space_size(), dtype=np.int64)
+        else:
+            self._refill_reservoir()
+
+    ###############
+    # Queries
+
+    def space_size(self) -> int:
+        """Number of codes of the whole space."""
+        if self.allow_repetition:
+            return self.number_values ** self.code_size
+        if self.code_size > self.number_values:
+            return 0
+        return math.perm(self.number_values, self.code_size)
+
+    def is_materialized(self) -> bool:
+        """Whether every consistent code is known."""
+        return self.ranks is not None
+
+    def size(self) -> int:
+        """Exact number of consistent codes, or None if the set is not materialized."""
+        if self.is_materialized():
+            return len(self.ranks)
+        return None
+
+    def size_upper_bound(self) -> int:
+        """Upper bound of the number of consistent codes."""
+        if self.is_materialized():
+            return len(self.ranks)
+        return math.prod(int(x) for x in self.domains.sum(axis=1))
+
+    def codes(self) -> CodeArray:
+        """
+        Consistent codes, one per row: all of them if materialized, or the ones in the reservoir otherwise.
+        """
+        if self.is_materialized():
+            return codes_from_ranks(self.ranks, self.code_size, self.number_values, self.allow_repetition)
+        return self.reservoir.copy()
+
+    def sample(
+            self,
+            k: int = 1) -> CodeArray:
+        """
+        Up to k different consistent codes chosen at random.
+
+        If the set is not materialized, they are chosen among the codes of the reservoir.
+        """
+        if self.is_materialized():
+            n = len(self.ranks)
+            chosen = self.ranks[self.rng.choice(n, size=min(k, n), replace=False)] if n > 0 else self.ranks
+            return codes_from_ranks(chosen, self.code_size, self.number_values, self.allow_repetition)
+        n = len(self.reservoir)
+        return self.reservoir[self.rng.choice(n, size=min(k, n), replace=False)] if n > 0 else self.reservoir.copy()
+
+    def nearest_codes(self) -> CodeArray:
+        """
+        Codes closest to be consistent found by the last search, from the closest, if it found no consistent code.
+
+        Useful as a guess when the set is not materialized and its reservoir is empty.
+        """
+        return self.nearest.copy()
+
+    def __contains__(self, code: CodeLike) -> bool:
+        code = as_code_array(code)
+        if self.is_materialized():
+            rank = code_ranks(code, self.number_values, self.allow_repetition)[0]
+            index = np.searchsorted(self.ranks, rank)
+            return index < len(self.ranks) and self.ranks[index] == rank
+        return bool(self._consistent(code)[0])
+
+    ###############
+    # Update
+
+    def update(
+            self,
+            guess: CodeLike,
+            feedback: np.ndarray):
+        """
+        Remove the codes that would not have given this feedback to this guess.
+
+        Args:
+            guess: Code guessed.
+            feedback: Feedback received as an integer array (see feedback_array).
+        """
+        guess = as_code_array(guess)[0]
+        feedback = np.asarray(feedback, dtype=np.int64)
+        self.guesses.append(guess)
+        self.feedback.append(feedback)
+        self._update_domains(guess, feedback)
+
+        if self.is_materialized():
+            self.ranks = self._filter_ranks(self.ranks, guess, feedback)
+            return
+
+        if len(self.reservoir) > 0:
+            self.reservoir = self.reservoir[self._matches(guess, feedback, self.reservoir)]
+
+        if self.size_upper_bound() <= self.max_materialized:
+            self._materialize()
+        else:
+            self._refill_reservoir()
+
+    def _matches(
+            self,
+            guess: np.ndarray,
+            feedback: np.ndarray,
+            codes: CodeArray) -> np.ndarray:
+        """Mask of the codes that give this feedback to the guess."""
+        result = raw_feedback(self.feedback_type, guess, codes, self.number_values)[0]
+        return np.all(result == feedback, axis=-1)
+
+    def _consistent(
+            self,
+            codes: CodeArray) -> np.ndarray:
+        """Mask of the codes consistent with the whole history."""
+        mask = np.ones(len(codes), dtype=bool)
+        for guess, feedback in zip(self.guesses, self.feedback):
+            if not mask.any():
+                break
+            mask[mask] = self._matches(guess, feedback, codes[mask])
+        return mask
+
+    def _filter_ranks(
+            self,
+            ranks: np.ndarray,
+            guess: np.ndarray,
+            feedback: np.ndarray) -> np.ndarray:
+        if self.table is not None:
+            row = self.table.row(guess)
+            return ranks[row[ranks] == self._feedback_code(feedback)]
+
+        kept = []
+        for start in range(0, len(ranks), _FILTER_BLOCK):
+            block = ranks[start:start + _FILTER_BLOCK]
+            codes = codes_from_ranks(block, self.code_size, self.number_values, self.allow_repetition)
+            kept.append(block[self._matches(guess, feedback, codes)])
+        return np.concatenate(kept) if kept else ranks
+
+    def _feedback_code(self, feedback: np.ndarray) -> int:
+        if self.feedback_type == FeedbackType.Mastermind:
+            return mastermind_code(feedback[0], feedback[1], self.code_size)
+        if self.feedback_type == FeedbackType.Wordle:
+            return positional_code(feedback, 3)
+        return positional_code(feedback, self.code_size + 1)
+
+    ###############
+    # Constraints for big spaces
+
+    def _update_domains(
+            self,
+            guess: np.ndarray,
+            feedback: np.ndarray):
+        """
+        Restrict the values of each position with the necessary conditions that the feedback implies.
+        """
+        n = self.code_size
+
+        if self.feedback_type == FeedbackType.Mastermind:
+            correct, misplaced = int(feedback[0]), int(feedback[1])
+            if correct == 0:
+                self.domains[np.arange(n), guess] = False
+            if correct + misplaced == 0:
+                self.domains[:, np.unique(guess)] = False
+            if correct == n:
+                self._fix(guess)
+            return
+
+        # Positional feedback: correct positions are fixed, the rest do not have the guessed value
+        if self.feedback_type == FeedbackType.Wordle:
+            correct = feedback == 2
+            matched = feedback > 0
+        else:
+            correct = feedback == 0
+            matched = feedback < n
+
+        for i in range(n):
+            if correct[i]:
+                self.domains[i, :] = False
+                self.domains[i, guess[i]] = True
+            else:
+                self.domains[i, guess[i]] = False
+
+        # The secret has at least as many copies of a value as were matched, and none if no copy was matched
+        for v in np.unique(guess):
+            matched_count = int(np.sum((guess == v) & matched))
+            self.min_count[v] = max(self.min_count[v], matched_count)
+            if matched_count == 0:
+                self.domains[:, v] = False
+
+    def _fix(self, code: np.ndarray):
+        self.domains[:, :] = False
+        self.domains[np.arange(self.code_size), code] = True
+
+    def _domain_codes(self, k: int) -> CodeArray:
+        """k random codes with every value in the domain of its position (possibly repeated)."""
+        codes = np.zeros((k, self.code_size), dtype=np.int64)
+        used = np.zeros((k, self.number_values), dtype=bool)
+        valid = np.ones(k, dtype=bool)
+        # Fill the most constrained positions first, so fewer codes run out of values
+        for i in np.argsort(self.domains.sum(axis=1), kind='stable'):
+            allowed = np.broadcast_to(self.domains[i], used.shape)
+            if not self.allow_repetition:
+                allowed = allowed & ~used
+            counts = allowed.sum(axis=1)
+            valid &= counts > 0
+            # Uniform choice among the allowed values of each code
+            choice = np.floor(self.rng.random(k) * np.maximum(counts, 1)).astype(np.int64)
+            values = np.argmax(np.cumsum(allowed, axis=1) > choice[:, None], axis=1)
+            codes[:, i] = values
+            used[np.arange(k), values] = True
+        return codes[valid]
+
+    def _inconsistency(
+            self,
+            codes: CodeArray) -> np.ndarray:
+        """Total difference between the feedback each code would have given and the feedback received."""
+        if not self.guesses:
+            return np.zeros(len(codes), dtype=np.int64)
+        result = raw_feedback(self.feedback_type, np.stack(self.guesses), codes, self.number_values)
+        difference = np.abs(result.astype(np.int64) - np.stack(self.feedback)[:, None, :])
+        return difference.sum(axis=(0, 2))
+
+    def _mutate(
+            self,
+            codes: CodeArray) -> CodeArray:
+        """Copy of the codes with one random position of each set to another value of its domain."""
+        k = len(codes)
+        rows = np.arange(k)
+        positions = self.rng.integers(self.code_size, size=k)
+        allowed = self.domains[positions]
+        counts = allowed.sum(axis=1)
+        choice = np.floor(self.rng.random(k) * np.maximum(counts, 1)).astype(np.int64)
+        values = np.argmax(np.cumsum(allowed, axis=1) > choice[:, None], axis=1)
+
+        mutated = codes.copy()
+        if not self.allow_repetition:
+            # Swap with the position that already has the value, so the code keeps having no repetitions
+            holder = codes == values[:, None]
+            has_holder = holder.any(axis=1)
+            holder_position = np.argmax(holder, axis=1)
+            mutated[rows[has_holder], holder_position[has_holder]] = codes[rows[has_holder], positions[has_holder]]
+        mutated[rows, positions] = values
+        return mutated
+
+    def _add_to_reservoir(
+            self,
+            codes: CodeArray,
+            seen: set) -> List[np.ndarray]:
+        added = []
+        if len(codes) == 0:
+            return added
+        for code, rank in zip(codes, code_ranks(codes, self.number_values, self.allow_repetition).tolist()):
+            if rank not in seen and len(seen) < self.reservoir_size:
+                seen.add(rank)
+                added.append(code[None, :])
+        return added
+
+    def _refill_reservoir(self):
+        """
+        Add consistent codes to the reservoir until it is full or the sampling budget ends.
+
+        A quarter of the budget samples codes from the domains. If that is not enough (the feedback says little about
+        single positions, as in Mastermind), the rest runs a local search from random codes of the domains
+        that changes one position at a time while the codes do not get more inconsistent with the history.
+        """
+        found = [self.reservoir]
+        seen = set(code_ranks(self.reservoir, self.number_values, self.allow_repetition).tolist()) \
+            if len(self.reservoir) > 0 else set()
+
+        start = time.monotonic()
+        time_limit = self.sampling_time_s if self.sampling_time_s is not None else float('inf')
+        batch = 1 << 12
+        checked = 0
+        while len(seen) < self.reservoir_size and checked < self.sampling_budget // 4 \
+                and time.monotonic() - start < time_limit / 4:
+            codes = self._domain_codes(batch)
+            checked += batch
+            if len(codes) == 0:
+                continue
+            if self.min_count.any():
+                counts = np.stack([(codes == v).sum(axis=1) for v in range(self.number_values)], axis=1)
+                codes = codes[np.all(counts >= self.min_count, axis=1)]
+            found.extend(self._add_to_reservoir(codes[self._consistent(codes)], seen))
+
+        batch = 1 << 9
+        codes = self._domain_codes(batch)
+        distance = self._inconsistency(codes)
+        while len(seen) < self.reservoir_size and checked < self.sampling_budget and len(codes) > 0 \
+                and time.monotonic() - start < time_limit:
+            mutated = self._mutate(codes)
+            mutated_distance = self._inconsistency(mutated)
+            checked += len(codes)
+            accepted = mutated_distance <= distance
+            codes[accepted] = mutated[accepted]
+            distance[accepted] = mutated_distance[accepted]
+
+            solved = distance == 0
+            if solved.any():
+                found.extend(self._add_to_reservoir(codes[solved], seen))
+                # Restart the solved ones from new random codes
+                restart = self._domain_codes(int(solved.sum()))
+                n_restart = len(restart)
+                indexes = np.nonzero(solved)[0][:n_restart]
+                codes[indexes] = restart
+                distance[indexes] = self._inconsistency(restart)
+
+        self.reservoir = np.concatenate(found, axis=0)
+        if len(self.reservoir) == 0 and len(codes) > 0:
+            # Without the codes already guessed, which are known not to be the secret
+            guessed = np.zeros(len(codes), dtype=bool)
+            for guess in self.guesses:
+                guessed |= np.all(codes == guess, axis=1)
+            order = np.argsort(distance, kind='stable')
+            self.nearest = codes[order[~guessed[order]]]
+        else:
+            self.nearest = self.reservoir[:0]
+
+    def _materialize(self):
+        """Enumerate every code inside the domains and keep the consistent ones."""
+        domain_values = [np.nonzero(self.domains[i])[0] for i in range(self.code_size)]
+        grids = np.meshgrid(*domain_values, indexing='ij')
+        codes = np.stack([g.ravel() for g in grids], axis=1).astype(np.int64)
+        if not self.allow_repetition and len(codes) > 0:
+            sorted_codes = np.sort(codes, axis=1)
+            codes = codes[np.all(sorted_codes[:, 1:] != sorted_codes[:, :-1], axis=1)]
+
+        kept = []
+        for start in range(0, len(codes), _FILTER_BLOCK):
+            block = codes[start:start + _FILTER_BLOCK]
+            kept.append(block[self._consistent(block)])
+        codes = np.concatenate(kept) if kept else codes
+
+        self.ranks = np.sort(code_ranks(codes, self.number_values, self.allow_repetition)) \
+            if len(codes) > 0 else np.zeros(0, dtype=np.int64)
+        self.reservoir = np.zeros((0, self.code_size), dtype=np.int64)
@@ -0,0 +1,188 @@
+import itertools
+import numbers
+import random
+from typing import Any, Callable, Iterator, List, Sequence
+
+from IArena.utils.RandomGenerator import RandomGenerator
+
+"""
+Lazy representation of every code of a code-breaking game.
+
+A code is a list of code_size values from 0 to number_values-1 (or the symbols given, such as colors or letters),
+with or without repeated values.
+Codes are ordered as itertools.product (with repetition) or itertools.permutations (without repetition),
+so the code with rank i is the i-th element that enumerating the space would give.
+None of the operations enumerates the space: len, random access, rank, sampling and membership
+only depend on the code size.
+"""
+
+
+class CodeSpace:
+    """
+    Indexable sequence of every possible code, built lazily.
+
+    Elements are returned as movements (or plain lists if no movement type is given).
+
+    NOTE: the size of big spaces (e.g. 30^20) does not fit in the integer len() accepts,
+    so use size() instead of len() when the space may be big.
+    """
+
+    def __init__(
+            self,
+            code_size: int,
+            number_values: int,
+            allow_repetition: bool = True,
+            movement_type: Callable[[List[Any]], Any] = None,
+            symbols: Sequence[Any] = None):
+        """
+        Args:
+            code_size: Size of the codes.
+            number_values: Number of different values of each position.
+            allow_repetition: Whether the codes can have repeated values.
+            movement_type: Class of the movements (constructed with guess=code). None to use plain lists.
+            symbols: Symbol that represents each value (e.g. colors or letters). None to use the values themselves.
+        """
+        if symbols is not None and len(symbols) != number_values:
+            raise ValueError(f"Number of symbols {len(symbols)} must be the number of values {number_values}")
+
+        self.code_size = code_size
+        self.number_values = number_values
+        self.allow_repetition = allow_repetition
+        self.movement_type = movement_type
+        self.symbols = list(symbols) if symbols is not None else None
+        self._symbol_values = {s: i for i, s in enumerate(self.symbols)} if self.symbols is not None else None
+
+        if allow_repetition:
+            self._size = number_values ** code_size
+        elif code_size > number_values:
+            self._size = 0
+        else:
+            self._size = 1
+            for k in range(code_size):
+                self._size *= number_values - k
+
+    def size(self) -> int:
+        """Number of codes, with no limit of size."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.allow_repetition:
+            codes = itertools.product(range(self.number_values), repeat=self.code_size)
+        else:
+            codes = itertools.permutations(range(self.number_values), self.code_size)
+        for code in codes:
+            yield self._element(code)
+
+    def __getitem__(self, index: int) -> Any:
+        if not isinstance(index, int):
+            raise TypeError(f"CodeSpace indexes must be integers, not {type(index).__name__}")
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError(f"Index out of range for a code space of size {self._size}")
+        return self._element(self.unrank(index))
+
+    def __contains__(self, item: Any) -> bool:
+        return self.code(item) is not None
+
+    def _element(self, values: Sequence[int]) -> Any:
+        if self.symbols is not None:
+            code = [self.symbols[v] for v in values]
+        else:
+            code = list(values)
+        if self.movement_type is None:
+            return code
+        return self.movement_type(guess=code)
+
+    def code(self, item: Any) -> List[int]:
+        """
+        Values of a code or movement of the space, or None if it does not belong to the space.
+        """
+        guess = getattr(item, 'guess', item)
+        try:
+            if len(guess) != self.code_size:
+                return None
+        except TypeError:
+            return None
+
+        if self._symbol_values is not None:
+            values = []
+            for x in guess:
+                try:
+                    v = self._symbol_values.get(x)
+                except TypeError:
+                    return None
+                if v is None:
+                    return None
+                values.append(v)
+        else:
+            # Any integer type, as NumPy integers, but not booleans
+            if any(isinstance(x, bool) or not isinstance(x, numbers.Integral) for x in guess):
+                return None
+            values = [int(x) for x in guess]
+            if any(x < 0 or x >= self.number_values for x in values):
+                return None
+
+        if not self.allow_repetition and len(set(values)) != self.code_size:
+            return None
+
+        return values
+
+    def rank(self, item: Any) -> int:
+        """Position of a code or movement in the space. Raise ValueError if it does not belong to it."""
+        values = self.code(item)
+        if values is None:
+            raise ValueError(f"{item} does not belong to the code space")
+
+        rank = 0
+        if self.allow_repetition:
+            for v in values:
+                rank = rank * self.number_values + v
+            return rank
+
+        # Lehmer code with the number of arrangements of the remaining positions as weights
+        used = []
+        for p, v in enumerate(values):
+            rank = rank * (self.number_values - p) + v - sum(1 for u in used if u < v)
+            used.append(v)
+        return rank
+
+    def unrank(self, rank: int) -> List[int]:
+        """Values of the code in a position of the space."""
+        if rank < 0 or rank >= self._size:
+            raise IndexError(f"Rank {rank} out of range for a code space of size {self._size}")
+
+        if self.allow_repetition:
+            values = [0] * self.code_size
+            for p in range(self.code_size - 1, -1, -1):
+                rank, values[p] = divmod(rank, self.number_values)
+            return values
+
+        digits = [0] * self.code_size
+        for p in range(self.code_size - 1, -1, -1):
+            rank, digits[p] = divmod(rank, self.number_values - p)
+        available = list(range(self.number_values))
+        return [available.pop(d) for d in digits]
+
+    def sample(self, rng: Any = None) -> Any:
+        """
+        Uniformly random element of the space.
+
+        Args:
+            rng: RandomGenerator, random.Random or None to use the random module.
+        """
+        if self._size == 0:
+            raise IndexError("Cannot sample from an empty code space")
+        if rng is None:
+            rank = random.randrange(self._size)
+        elif isinstance(rng, RandomGenerator):
+            rank = rng.rng.randrange(self._size)
+        else:
+            rank = rng.randrange(self._size)
+        return self._element(self.unrank(rank))
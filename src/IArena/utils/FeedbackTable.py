@@ -0,0 +1,164 @@
+import math
+import os
+import tempfile
+from typing import Dict, Tuple
+import numpy as np
+
+from IArena.utils.caching import cache_directory
+from IArena.utils.feedbacking import CodeLike, FeedbackType, all_codes, code_ranks, feedback_codes, feedback_code_count
+
+"""
+Precomputed feedback of every guess against every secret of a code space, stored on disk.
+
+The table is a square matrix indexed by the rank of the guess and the rank of the secret in all_codes order,
+with the feedback coded as in feedback_codes.
+It is saved as a .npy file and opened as a read-only memory map, so every process using the same table
+shares the same physical pages and only reads the rows it actually needs.
+"""
+
+# Default maximum number of entries of a table (1 byte each for Mastermind and Wordle up to size 5)
+DEFAULT_MAX_ENTRIES = 1 << 30
+
+# Tables already opened in this process
+_opened_tables: Dict[Tuple, 'FeedbackTable'] = {}
+
+
+def _smallest_dtype(n_values: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_values <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class FeedbackTable:
+    """
+    Read-only guess x secret feedback matrix of a code space.
+
+    Use get_feedback_table to reuse the same table within a process.
+    The table is built the first time it is required and saved in the cache directory,
+    so later executions (and other processes) only map the file.
+    """
+
+    def __init__(
+            self,
+            feedback_type: FeedbackType,
+            code_size: int,
+            number_values: int,
+            allow_repetition: bool = True,
+            directory: str = None,
+            max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Load the table from the directory, building it first if it does not exist.
+
+        Args:
+            feedback_type: Feedback semantics of the game.
+            code_size: Size of the codes.
+            number_values: Number of different values of each position.
+            allow_repetition: Whether the codes can have repeated values.
+            directory: Directory of the table files. By default, the feedback_tables directory of the cache.
+            max_entries: Maximum number of entries allowed. Raise ValueError if the table is bigger.
+        """
+        self.feedback_type = feedback_type
+        self.code_size = code_size
+        self.number_values = number_values
+        self.allow_repetition = allow_repetition
+
+        if directory is None:
+            directory = cache_directory('feedback_tables')
+        self.directory = directory
+
+        # Counted before listing the codes, that would not fit in memory for the biggest spaces
+        if allow_repetition:
+            n_codes = number_values ** code_size
+        else:
+            n_codes = math.perm(number_values, code_size) if code_size <= number_values else 0
+        if n_codes * n_codes > max_entries:
+            raise ValueError(
+                f"Feedback table for {n_codes} codes has {n_codes * n_codes} entries, more than the maximum {max_entries}.")
+        self.codes = all_codes(code_size, number_values, allow_repetition)
+
+        self.dtype = _smallest_dtype(feedback_code_count(feedback_type, code_size))
+        self.path = os.path.join(directory, self.file_name(feedback_type, code_size, number_values, allow_repetition))
+
+        if not os.path.exists(self.path):
+            self._build()
+
+        self.table = np.load(self.path, mmap_mode='r')
+        if self.table.shape != (n_codes, n_codes) or self.table.dtype != self.dtype:
+            raise ValueError(f"Feedback table file {self.path} does not match its configuration. Remove it to rebuild it.")
+
+    @staticmethod
+    def file_name(
+            feedback_type: FeedbackType,
+            code_size: int,
+            number_values: int,
+            allow_repetition: bool) -> str:
+        repetition = 'rep' if allow_repetition else 'norep'
+        return f'{feedback_type.name.lower()}_{code_size}_{number_values}_{repetition}.npy'
+
+    def _build(self):
+        """Compute the table in blocks of rows into a temporary file and move it to its final path."""
+        n_codes = len(self.codes)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.npy.tmp')
+        os.close(fd)
+
+        try:
+            table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=self.dtype, shape=(n_codes, n_codes))
+            rows_per_block = max(1, (1 << 22) // max(1, n_codes * self.code_size))
+            for start in range(0, n_codes, rows_per_block):
+                end = min(start + rows_per_block, n_codes)
+                table[start:end] = feedback_codes(
+                    self.feedback_type, self.codes[start:end], self.codes, self.number_values)
+            table.flush()
+            del table
+            # Atomic, so concurrent builders never see a partially written table
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def __len__(self) -> int:
+        """Number of codes of the space."""
+        return len(self.codes)
+
+    def __reduce__(self):
+        # Other processes map the file again instead of receiving a copy of the table
+        return (
+            get_feedback_table,
+            (self.feedback_type, self.code_size, self.number_values, self.allow_repetition, self.directory))
+
+    def index(self, code: CodeLike) -> int:
+        """Row (or column) of a code in the table."""
+        return int(code_ranks(code, self.number_values, self.allow_repetition)[0])
+
+    def indexes(self, codes: CodeLike) -> np.ndarray:
+        """Rows (or columns) of several codes in the table."""
+        return code_ranks(codes, self.number_values, self.allow_repetition)
+
+    def feedback(self, guess: CodeLike, secret: CodeLike) -> int:
+        """Feedback code of a guess against a secret."""
+        return int(self.table[self.index(guess), self.index(secret)])
+
+    def row(self, guess: CodeLike) -> np.ndarray:
+        """Feedback codes of a guess against every code, in all_codes order."""
+        return self.table[self.index(guess)]
+
+    def feedbacks(self, guess_indexes: np.ndarray, secret_indexes: np.ndarray) -> np.ndarray:
+        """Submatrix of feedback codes of the guesses against the secrets, both given by index."""
+        return np.asarray(self.table[np.ix_(guess_indexes, secret_indexes)])
+
+
+def get_feedback_table(
+        feedback_type: FeedbackType,
+        code_size: int,
+        number_values: int,
+        allow_repetition: bool = True,
+        directory: str = None) -> FeedbackTable:
+    """
+    Table of a code space, opened only once per process.
+    """
+    key = (feedback_type, code_size, number_values, allow_repetition, directory)
+    if key not in _opened_tables:
+        _opened_tables[key] = FeedbackTable(feedback_type, code_size, number_values, allow_repetition, directory)
+    return _opened_tables[key]
@@ -0,0 +1,193 @@
+import math
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Tuple
+import numpy as np
+
+from IArena.games.HighestCard import bet_score
+
+"""
+Expected score of each bet of HighestCard, knowing only the own cards.
+
+The cards of the rest of players are a uniform deal of the cards not in the hand. Round k pairs the k-th card
+of every player, so the hand wins round k if its k-th card is higher than the k-th card of every other player.
+Only the order of the cards matters, so the cards are replaced by their rank in the deck, from 0 to N*M-1.
+
+- Monte Carlo: many deals are shuffled at once as rows of a NumPy array, sorted by player, and their wins counted.
+- Exact: for small games, every deal is enumerated once as the positions of the remaining cards that each player
+  gets, so the wins of every hand are counted over all deals with the same index array.
+  The probabilities of winning each number of rounds with every possible hand are kept in a table.
+"""
+
+
+def _deal_positions(
+        players: int,
+        cards: int) -> np.ndarray:
+    """
+    Every way of splitting the positions 0..players*cards-1 in groups of cards, without order of the groups.
+
+    Returns:
+        Array of shape (deals, players, cards) with the sorted positions of each group.
+    """
+    def split(remaining: Tuple[int]) -> List[List[Tuple[int]]]:
+        if not remaining:
+            return [[]]
+        # The group with the lowest position first, so each split is generated once
+        first, rest = remaining[0], remaining[1:]
+        deals = []
+        for others in combinations(rest, cards - 1):
+            group = (first,) + others
+            left = tuple(p for p in rest if p not in others)
+            deals.extend([group] + deal for deal in split(left))
+        return deals
+
+    return np.array(split(tuple(range(players * cards))), dtype=np.int64).reshape(-1, players, cards)
+
+
+def _wins_distribution(
+        hands: np.ndarray,
+        others: np.ndarray,
+        cards: int) -> np.ndarray:
+    """
+    Probability of winning each number of rounds with each hand.
+
+    Args:
+        hands: Sorted cards of each hand, with shape (hands, cards).
+        others: Sorted cards of the rest of players in each deal of each hand, with shape (hands, deals, players, cards).
+
+    Returns:
+        Array of shape (hands, cards + 1).
+    """
+    wins = (hands[:, np.newaxis, :] > others.max(axis=2)).sum(axis=2)
+    counts = (wins[:, :, np.newaxis] == np.arange(cards + 1)).sum(axis=1)
+    return counts / wins.shape[1]
+
+
+@lru_cache(maxsize=None)
+def exact_table(
+        n_players: int,
+        m_cards: int) -> Dict[Tuple[int], np.ndarray]:
+    """
+    Probability of winning each number of rounds with each hand, enumerating every deal of the rest of cards.
+
+    Returns:
+        Dictionary from each sorted hand to an array with the probability of winning 0..m_cards rounds.
+    """
+    total = n_players * m_cards
+    positions = _deal_positions(n_players - 1, m_cards)
+    hands = np.array(list(combinations(range(total), m_cards)), dtype=np.int64)
+
+    table = {}
+    # Hands in chunks of about a million cards dealt
+    chunk = max(1, (1 << 20) // positions.size)
+    for start in range(0, len(hands), chunk):
+        block = hands[start:start + chunk]
+        free = np.ones((len(block), total), dtype=bool)
+        free[np.arange(len(block))[:, np.newaxis], block] = False
+        remaining = np.broadcast_to(np.arange(total), free.shape)[free].reshape(len(block), -1)
+        distributions = _wins_distribution(block, remaining[:, positions], m_cards)
+        for hand, distribution in zip(block, distributions):
+            table[tuple(int(card) for card in hand)] = distribution
+    return table
+
+
+class HighestCardAdvisor:
+    """
+    Computes the expected score of each bet of a hand, exactly or by Monte Carlo.
+    """
+
+    Exact = 'exact'
+    MonteCarlo = 'monte_carlo'
+
+    # Most hands times deals of the rest of cards to build the exact table
+    ExactMaxDeals = 1 << 21
+
+    # Deals simulated at once by Monte Carlo
+    MonteCarloBatch = 1 << 14
+
+    def __init__(
+            self,
+            n_players: int,
+            m_cards: int,
+            samples: int = 20000,
+            seed: int = None,
+            method: str = None,
+            deck: List[int] = None):
+        """
+        Args:
+            n_players: Players of the game.
+            m_cards: Cards of each player.
+            samples: Deals simulated by Monte Carlo.
+            seed: Seed of the Monte Carlo deals.
+            method: Exact or MonteCarlo. By default, Exact if the table is small enough.
+            deck: Every card of the game, as given by the rules. By default, from 0 to n_players * m_cards - 1.
+        """
+        self.n_players = n_players
+        self.m_cards = m_cards
+        self.samples = samples
+        self.rng = np.random.default_rng(seed)
+        self.deck = np.arange(n_players * m_cards) if deck is None else np.array(sorted(deck))
+        if len(self.deck) != n_players * m_cards:
+            raise ValueError(f"Deck of {len(self.deck)} cards for {n_players} players with {m_cards} cards")
+        if method is None:
+            method = HighestCardAdvisor.Exact if self.exact_deals() <= HighestCardAdvisor.ExactMaxDeals \
+                else HighestCardAdvisor.MonteCarlo
+        self.method = method
+
+    def exact_deals(self) -> int:
+        """Hands times deals of the rest of cards enumerated by the exact table."""
+        n, m = self.n_players, self.m_cards
+        hands = math.comb(n * m, m)
+        deals = math.factorial((n - 1) * m) // (math.factorial(m) ** (n - 1) * math.factorial(n - 1))
+        return hands * deals
+
+    def win_probabilities(
+            self,
+            cards: List[int]) -> np.ndarray:
+        """Probability of winning each number of rounds, from 0 to m_cards, with the cards."""
+        hand = tuple(self._ranks(cards))
+        if self.method == HighestCardAdvisor.Exact:
+            return exact_table(self.n_players, self.m_cards)[hand]
+        if self.method == HighestCardAdvisor.MonteCarlo:
+            return self._monte_carlo(np.array(hand))
+        raise ValueError(f"Unknown method {self.method}")
+
+    def _ranks(
+            self,
+            cards: List[int]) -> List[int]:
+        """Sorted ranks of the cards in the deck."""
+        cards = sorted(cards)
+        ranks = np.searchsorted(self.deck, cards)
+        found = self.deck[np.minimum(ranks, len(self.deck) - 1)]
+        if len(set(cards)) != self.m_cards or not np.array_equal(found, cards):
+            raise ValueError(f"Hand {cards} is not {self.m_cards} cards of the deck")
+        return [int(rank) for rank in ranks]
+
+    def _monte_carlo(
+            self,
+            hand: np.ndarray) -> np.ndarray:
+        remaining = np.delete(np.arange(self.n_players * self.m_cards), hand)
+        counts = np.zeros(self.m_cards + 1, dtype=np.int64)
+        done = 0
+        while done < self.samples:
+            batch = min(HighestCardAdvisor.MonteCarloBatch, self.samples - done)
+            deals = self.rng.permuted(np.tile(remaining, (batch, 1)), axis=1)
+            others = np.sort(deals.reshape(batch, self.n_players - 1, self.m_cards), axis=2)
+            wins = (hand > others.max(axis=1)).sum(axis=1)
+            counts += np.bincount(wins, minlength=self.m_cards + 1)
+            done += batch
+        return counts / self.samples
+
+    def expected_scores(
+            self,
+            cards: List[int]) -> np.ndarray:
+        """Expected score of each bet, from 0 to m_cards."""
+        bets = np.arange(self.m_cards + 1)
+        scores = bet_score(bets[:, np.newaxis], bets[np.newaxis, :])
+        return scores @ self.win_probabilities(cards)
+
+    def best_bet(
+            self,
+            cards: List[int]) -> int:
+        """Bet with the lowest expected score."""
+        return int(np.argmin(self.expected_scores(cards)))
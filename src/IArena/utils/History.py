@@ -0,0 +1,126 @@
+import copy
+from typing import Any, Iterable, Iterator, List
+
+"""
+Immutable append-only sequence that shares its elements with the sequences it was built from.
+
+Appending returns a new history in O(1) that points to the previous one, so every position of a game
+stores only its last element and a reference to the history of its parent position.
+"""
+
+
+class PersistentHistory:
+    """
+    Immutable sequence built by appending elements.
+
+    Appending, len and last are O(1). Iterating and converting into a list are O(k).
+    Random access to other elements than the last one is O(k), so convert it into a list to index it repeatedly.
+    """
+
+    __slots__ = ('_previous', '_last', '_length')
+
+    def __init__(
+            self,
+            iterable: Iterable[Any] = None):
+        """
+        Create a history with the elements of the iterable (empty by default).
+        """
+        self._previous = None
+        self._last = None
+        self._length = 0
+
+        if iterable is not None:
+            node = PersistentHistory()
+            for element in iterable:
+                node = node.append(element)
+            self._previous = node._previous
+            self._last = node._last
+            self._length = node._length
+
+    @staticmethod
+    def of(
+            elements: Iterable[Any]) -> "PersistentHistory":
+        """The history itself if it already is one, or a new history with the elements given."""
+        if isinstance(elements, PersistentHistory):
+            return elements
+        return PersistentHistory(elements)
+
+    def append(
+            self,
+            element: Any) -> "PersistentHistory":
+        """New history with the element at the end. This history is not modified."""
+        history = PersistentHistory.__new__(PersistentHistory)
+        history._previous = self
+        history._last = element
+        history._length = self._length + 1
+        return history
+
+    def last(self) -> Any:
+        """Last element, or None if it is empty."""
+        return self._last
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_list())
+
+    def __reversed__(self) -> Iterator[Any]:
+        node = self
+        while node._length > 0:
+            yield node._last
+            node = node._previous
+
+    def to_list(self) -> List[Any]:
+        """New list with the elements from the first to the last."""
+        elements = list(reversed(self))
+        elements.reverse()
+        return elements
+
+    def __getitem__(
+            self,
+            index: int) -> Any:
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError(f"Index out of range for a history of length {self._length}")
+        node = self
+        for _ in range(self._length - 1 - index):
+            node = node._previous
+        return node._last
+
+    def __eq__(
+            self,
+            other: Any) -> bool:
+        if isinstance(other, PersistentHistory):
+            if self._length != other._length:
+                return False
+            a, b = self, other
+            # Shared nodes have the same prefix, so the comparison stops at the first common node
+            while a is not b:
+                if a._last != b._last:
+                    return False
+                a, b = a._previous, b._previous
+            return True
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    # Copy and pickle as a flat list, so long histories do not recurse node by node
+    def __reduce__(self):
+        return (PersistentHistory, (self.to_list(),))
+
+    def __copy__(self) -> "PersistentHistory":
+        return self
+
+    def __deepcopy__(self, memo) -> "PersistentHistory":
+        return PersistentHistory(copy.deepcopy(self.to_list(), memo))
+
+    def __str__(self) -> str:
+        return str(self.to_list())
+
+    def __repr__(self) -> str:
+        return f'PersistentHistory({self.to_list()})'
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import tempfile
+from typing import Dict, Tuple
+import numpy as np
+
+from IArena.utils.caching import cache_directory
+from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.SquareMap import SquareMap, SquareMapCoordinate, square_valid_map_generator
+
+"""
+Valid square maps generated once and stored on disk, so the graders never generate the same map twice.
+
+Each map is kept in a .npy file named after its generation parameters and seed.
+The version of the generator is part of the name, so changing how maps are generated never reuses old files.
+"""
+
+# Increase when the maps generated for the same parameters and seed change
+GENERATOR_VERSION = 1
+
+# Maps already read in this process
+_read_maps: Dict[Tuple, np.ndarray] = {}
+
+
+class MapCorpus:
+    """
+    Directory of valid square maps, generated the first time they are required.
+
+    Maps are returned as new SquareMap objects, so the caller may modify them freely.
+    """
+
+    def __init__(
+            self,
+            directory: str = None):
+        """
+        Args:
+            directory: Directory of the map files. By default, the square_maps directory of the cache.
+        """
+        if directory is None:
+            directory = cache_directory('square_maps')
+        self.directory = directory
+
+    @staticmethod
+    def file_name(
+            rows: int,
+            cols: int,
+            start: Tuple[int, int],
+            target: Tuple[int, int],
+            approx_path_length: int,
+            approx_obstacle_prob: float,
+            seed: int) -> str:
+        parameters = repr((GENERATOR_VERSION, rows, cols, start, target, approx_path_length, float(approx_obstacle_prob), seed))
+        digest = hashlib.sha1(parameters.encode()).hexdigest()[:16]
+        return f'{rows}x{cols}_{seed}_{digest}.npy'
+
+    def valid_map(
+            self,
+            rows: int,
+            cols: int,
+            start: SquareMapCoordinate,
+            target: SquareMapCoordinate,
+            approx_path_length: int,
+            approx_obstacle_prob: float,
+            seed: int) -> SquareMap:
+        """
+        Map of square_valid_map_generator with a RandomGenerator of the seed, read from disk if it was already generated.
+        """
+        key = (rows, cols, start.as_tuple(), target.as_tuple(), approx_path_length, approx_obstacle_prob, seed)
+        path = os.path.join(self.directory, MapCorpus.file_name(*key))
+
+        map = _read_maps.get(path)
+        if map is None:
+            if os.path.exists(path):
+                map = np.load(path)
+                if map.shape != (rows, cols) or map.dtype != bool:
+                    raise ValueError(f"Map file {path} does not match its configuration. Remove it to generate it again.")
+            else:
+                map = square_valid_map_generator(
+                    rows, cols, start, target, approx_path_length, approx_obstacle_prob, RandomGenerator(seed)).map_
+                self._save(path, map)
+            _read_maps[path] = map
+
+        return SquareMap(map)
+
+    def _save(
+            self,
+            path: str,
+            map: np.ndarray):
+        """Write the map into a temporary file and move it to its final path."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.save(file, map)
+            # Atomic, so concurrent graders never read a partially written map
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_valid_map(
+        rows: int,
+        cols: int,
+        start: SquareMapCoordinate,
+        target: SquareMapCoordinate,
+        approx_path_length: int,
+        approx_obstacle_prob: float,
+        seed: int,
+        directory: str = None) -> SquareMap:
+    """
+    Valid map of the corpus in the directory (by default, the cache), generating it only if it is not stored yet.
+    """
+    return MapCorpus(directory).valid_map(rows, cols, start, target, approx_path_length, approx_obstacle_prob, seed)
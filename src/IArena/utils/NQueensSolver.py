@@ -0,0 +1,180 @@
+from typing import List, Optional
+import numpy as np
+
+"""
+Solvers of the N queens puzzle, to place queens in NQueens without attacks even in very large boards.
+
+Boards are lists with the column of the queen of each row, so rows never have two queens.
+Backtracking keeps the columns and diagonals under attack as bitmasks, and finds the first solution
+(or counts all of them) in small boards. Min-conflicts starts from a greedy board and moves queens
+to the least attacked square of their row, and solves boards of thousands of squares in a few seconds.
+"""
+
+
+def board_attacks(columns: List[int]) -> int:
+    """Score of NQueens for the board: for each queen, the number of other queens it attacks."""
+    columns = np.asarray(columns)
+    rows = np.arange(len(columns))
+    attacks = 0
+    for lines in (columns, rows - columns, rows + columns):
+        counts = np.unique(lines, return_counts=True)[1]
+        attacks += int((counts * (counts - 1)).sum())
+    return attacks
+
+
+class NQueensSolver:
+    """
+    Finds boards of size n with queens that do not attack each other.
+
+    There are solutions for every n except 2 and 3.
+    """
+
+    # Largest board solved by backtracking in solve
+    BacktrackingLimit = 20
+
+    # Moves without improving (besides n) before min-conflicts starts from a new board
+    RestartPatience = 20
+
+    def __init__(
+            self,
+            n: int,
+            seed: int = None):
+        """
+        Args:
+            n: Size of the board.
+            seed: Seed of the random choices of min-conflicts.
+        """
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+    def solve(self) -> List[int]:
+        """
+        Board without attacks if there is any, or with the fewest attacks found otherwise.
+        """
+        if self.n <= NQueensSolver.BacktrackingLimit:
+            columns = self.backtracking()
+            if columns is not None:
+                return columns
+        return self.min_conflicts()
+
+    def backtracking(self) -> Optional[List[int]]:
+        """
+        First solution in lexicographic order, or None if there is none.
+
+        Each row keeps as bitmasks the columns attacked vertically and by each diagonal,
+        shifting the diagonal ones when going to the next row.
+        """
+        n = self.n
+        full = (1 << n) - 1
+        columns = []
+        # Columns still to try in each row, and the columns attacked in it
+        free = [full]
+        attacked = [(0, 0, 0)]
+        while free:
+            if not free[-1]:
+                free.pop()
+                attacked.pop()
+                if columns:
+                    columns.pop()
+                continue
+
+            bit = free[-1] & -free[-1]
+            free[-1] ^= bit
+            columns.append(bit.bit_length() - 1)
+            if len(columns) == n:
+                return columns
+
+            vertical, left, right = attacked[-1]
+            vertical, left, right = vertical | bit, ((left | bit) << 1) & full, (right | bit) >> 1
+            free.append(full & ~(vertical | left | right))
+            attacked.append((vertical, left, right))
+        return None
+
+    def count_solutions(self) -> int:
+        """Number of boards without attacks, with the same bitmasks as backtracking."""
+        full = (1 << self.n) - 1
+
+        def count(vertical: int, left: int, right: int) -> int:
+            if vertical == full:
+                return 1
+            solutions = 0
+            free = full & ~(vertical | left | right)
+            while free:
+                bit = free & -free
+                free ^= bit
+                solutions += count(vertical | bit, ((left | bit) << 1) & full, (right | bit) >> 1)
+            return solutions
+
+        return count(0, 0, 0)
+
+    def min_conflicts(
+            self,
+            max_steps: int = None) -> List[int]:
+        """
+        Board found by min-conflicts: while some queen is attacked, one of them moves to the least attacked
+        column of its row (breaking ties at random), starting from a new greedy board when it gets stuck.
+        Returns the board with fewest attacks seen if max_steps (by default 100 n) moves do not solve it.
+        """
+        n = self.n
+        if max_steps is None:
+            max_steps = 100 * n
+        rows = np.arange(n)
+        all_columns = np.arange(n)
+
+        # Queens in each column, diagonal (row - column + n - 1) and anti diagonal (row + column)
+        column_counts = np.zeros(n, dtype=np.int64)
+        diagonal_counts = np.zeros(2 * n - 1, dtype=np.int64)
+        anti_diagonal_counts = np.zeros(2 * n - 1, dtype=np.int64)
+
+        def row_conflicts(row: int) -> np.ndarray:
+            """Queens attacking each column of the row."""
+            return (column_counts
+                    + diagonal_counts[row - all_columns + n - 1]
+                    + anti_diagonal_counts[row + all_columns])
+
+        def least_conflicted(row: int) -> int:
+            conflicts = row_conflicts(row)
+            best = np.flatnonzero(conflicts == conflicts.min())
+            return int(best[self.rng.integers(len(best))])
+
+        def add(row: int, column: int, queens: int):
+            column_counts[column] += queens
+            diagonal_counts[row - column + n - 1] += queens
+            anti_diagonal_counts[row + column] += queens
+
+        best, best_attacks = None, None
+        steps = 0
+        while steps <= max_steps:
+            # Greedy start: each row, in random order, takes its least attacked column
+            column_counts[:] = 0
+            diagonal_counts[:] = 0
+            anti_diagonal_counts[:] = 0
+            columns = np.zeros(n, dtype=np.int64)
+            for row in self.rng.permutation(n):
+                columns[row] = least_conflicted(row)
+                add(row, columns[row], 1)
+
+            # Repair until solved, or start again if stuck in a board that cannot be improved
+            run_attacks, stuck = None, 0
+            while steps <= max_steps and stuck <= n + NQueensSolver.RestartPatience:
+                conflicts = (column_counts[columns]
+                             + diagonal_counts[rows - columns + n - 1]
+                             + anti_diagonal_counts[rows + columns] - 3)
+                attacks = int(conflicts.sum())
+                if best_attacks is None or attacks < best_attacks:
+                    best, best_attacks = columns.copy(), attacks
+                if attacks == 0:
+                    return best.tolist()
+                if run_attacks is None or attacks < run_attacks:
+                    run_attacks, stuck = attacks, 0
+                else:
+                    stuck += 1
+
+                attacked = np.flatnonzero(conflicts)
+                row = int(attacked[self.rng.integers(len(attacked))])
+                add(row, columns[row], -1)
+                columns[row] = least_conflicted(row)
+                add(row, columns[row], 1)
+                steps += 1
+
+        return best.tolist()
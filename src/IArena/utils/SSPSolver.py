@@ -0,0 +1,208 @@
+import math
+from functools import reduce
+from typing import List, Tuple
+import numpy as np
+
+"""
+Exact solver of the Subset Sum Problem of SSP: the subset of coins with the largest sum not over the target.
+
+Three methods, chosen from the size of the instance:
+
+- Meet in the middle, for few coins and any target: every sum of each half of the coins is enumerated with NumPy,
+  and each sum of one half is matched with the largest sum of the other half that fits.
+  Sums that may not fit in an int64 are kept as Python integers, so targets of any size are exact.
+- Dynamic programming over bitsets, for the rest: the reachable sums are the bits of a NumPy array of 64 bit words,
+  and adding a coin is a shift and an or of the whole array. Once the target is reachable the rest of coins are skipped,
+  and the subset is rebuilt going back from the last state.
+  If the states after every coin fit in memory, all of them are kept (NumpyBitset).
+  Otherwise, only the states before every sqrt(n) coins are kept (CheckpointedBitset),
+  and going back recomputes the states of one block of coins at a time.
+
+Coins over the target are never used, and coins and target are divided by the greatest common divisor of the coins.
+"""
+
+
+class SSPSolver:
+    """
+    Finds a subset of coins with the maximum sum that does not exceed the target.
+
+    Attributes:
+        method: Method used for the instance, one of MeetInTheMiddle, NumpyBitset or CheckpointedBitset.
+    """
+
+    MeetInTheMiddle = 'meet_in_the_middle'
+    NumpyBitset = 'numpy_bitset'
+    CheckpointedBitset = 'checkpointed_bitset'
+
+    # Most coins for meet in the middle: 2^(n/2) sums in each half
+    MeetInTheMiddleMaxCoins = 44
+
+    # Largest size in bytes of the states kept by the NumPy dynamic programming
+    NumpyMaxBytes = 1 << 28
+
+    def __init__(
+            self,
+            coins: List[int],
+            target: int,
+            method: str = None):
+        """
+        Args:
+            coins: Positive values of the coins.
+            target: Maximum sum.
+            method: Method to use. By default, chosen from the number of coins and the target.
+        """
+        self.coins = list(coins)
+        self.target = target
+
+        # Only coins that fit are used, all in the same scale
+        self.indexes_ = [i for i, c in enumerate(self.coins) if 0 < c <= target]
+        self.divisor_ = reduce(math.gcd, (self.coins[i] for i in self.indexes_), 0) or 1
+        self.values_ = [self.coins[i] // self.divisor_ for i in self.indexes_]
+        self.capacity_ = target // self.divisor_
+
+        self.method = method if method is not None else self._choose_method()
+
+    def _choose_method(self) -> str:
+        n = len(self.values_)
+        # Meet in the middle enumerates 2^(n/2) sums, dynamic programming n times the target in bits
+        half = 1 << ((n + 1) // 2)
+        if n <= SSPSolver.MeetInTheMiddleMaxCoins and half * 64 <= n * (self.capacity_ + 1):
+            return SSPSolver.MeetInTheMiddle
+        if (n + 1) * self._words() * 8 <= SSPSolver.NumpyMaxBytes:
+            return SSPSolver.NumpyBitset
+        return SSPSolver.CheckpointedBitset
+
+    def solve(self) -> Tuple[int, List[int]]:
+        """
+        Returns:
+            Maximum sum not over the target, and the sorted indexes of the coins of one subset with that sum.
+        """
+        if sum(self.values_) <= self.capacity_:
+            chosen = list(range(len(self.values_)))
+        elif self.method == SSPSolver.MeetInTheMiddle:
+            chosen = self._meet_in_the_middle()
+        elif self.method == SSPSolver.NumpyBitset:
+            chosen = self._numpy_bitset()
+        elif self.method == SSPSolver.CheckpointedBitset:
+            chosen = self._checkpointed_bitset()
+        else:
+            raise ValueError(f"Unknown method {self.method}")
+
+        indexes = sorted(self.indexes_[i] for i in chosen)
+        return sum(self.coins[i] for i in indexes), indexes
+
+    @staticmethod
+    def _subset_sums(values: List[int]) -> np.ndarray:
+        """
+        Sum of every subset of the values, the one of subset mask m in position m.
+
+        Sums are int64, or Python integers in an object array if they may not fit in an int64.
+        """
+        dtype = np.int64 if sum(values) <= np.iinfo(np.int64).max else object
+        sums = np.zeros(1, dtype=dtype)
+        for value in values:
+            sums = np.concatenate((sums, sums + value))
+        return sums
+
+    def _meet_in_the_middle(self) -> List[int]:
+        half = len(self.values_) // 2
+        left = SSPSolver._subset_sums(self.values_[:half])
+        right = SSPSolver._subset_sums(self.values_[half:])
+
+        # Largest sum of the right half that fits with each sum of the left half
+        order = np.argsort(right, kind='stable')
+        sorted_right = right[order]
+        fitting = left <= self.capacity_
+        left_masks = np.flatnonzero(fitting)
+        positions = np.searchsorted(sorted_right, self.capacity_ - left[fitting], side='right') - 1
+        totals = left[fitting] + sorted_right[positions]
+
+        best = int(np.argmax(totals))
+        left_mask = int(left_masks[best])
+        right_mask = int(order[positions[best]])
+        return ([i for i in range(half) if left_mask >> i & 1]
+                + [half + i for i in range(len(self.values_) - half) if right_mask >> i & 1])
+
+    def _words(self) -> int:
+        """Number of 64 bit words of a bitset of the sums from 0 to the capacity."""
+        return self.capacity_ // 64 + 1
+
+    def _first_state(self) -> np.ndarray:
+        state = np.zeros(self._words(), dtype=np.uint64)
+        state[0] = 1
+        return state
+
+    def _add_coin(
+            self,
+            state: np.ndarray,
+            value: int,
+            out: np.ndarray):
+        """Sums reachable from the state with or without the coin: state | state << value, in out."""
+        words = len(state)
+        shift, bit = divmod(value, 64)
+        out[:shift] = 0
+        if bit:
+            np.left_shift(state[:words - shift], np.uint64(bit), out=out[shift:])
+            out[shift + 1:] |= state[:words - shift - 1] >> np.uint64(64 - bit)
+        else:
+            out[shift:] = state[:words - shift]
+        out |= state
+        # Sums over the capacity in the last word
+        out[-1] &= np.uint64((1 << (self.capacity_ % 64 + 1)) - 1)
+
+    @staticmethod
+    def _has(
+            state: np.ndarray,
+            amount: int) -> bool:
+        return bool(int(state[amount >> 6]) >> (amount & 63) & 1)
+
+    @staticmethod
+    def _highest(state: np.ndarray) -> int:
+        word = int(np.flatnonzero(state)[-1])
+        return 64 * word + int(state[word]).bit_length() - 1
+
+    def _numpy_bitset(self) -> List[int]:
+        # Every state, so going back needs no recomputation
+        states = np.empty((len(self.values_) + 1, self._words()), dtype=np.uint64)
+        states[0] = self._first_state()
+        used = 0
+        while used < len(self.values_) and not SSPSolver._has(states[used], self.capacity_):
+            self._add_coin(states[used], self.values_[used], states[used + 1])
+            used += 1
+
+        chosen = []
+        remaining = SSPSolver._highest(states[used])
+        for i in reversed(range(used)):
+            if not SSPSolver._has(states[i], remaining):
+                chosen.append(i)
+                remaining -= self.values_[i]
+        return chosen
+
+    def _checkpointed_bitset(self) -> List[int]:
+        step = max(1, math.isqrt(len(self.values_)))
+
+        # States before the coins 0, step, 2 step...
+        checkpoints = []
+        state, following = self._first_state(), np.empty(self._words(), dtype=np.uint64)
+        n = 0
+        while n < len(self.values_) and not SSPSolver._has(state, self.capacity_):
+            if n % step == 0:
+                checkpoints.append(state.copy())
+            self._add_coin(state, self.values_[n], following)
+            state, following = following, state
+            n += 1
+
+        # Go back through the blocks, recomputing the states before each coin of the block
+        chosen = []
+        remaining = SSPSolver._highest(state)
+        for block in reversed(range(len(checkpoints))):
+            start, end = block * step, min(block * step + step, n)
+            states = np.empty((end - start, self._words()), dtype=np.uint64)
+            states[0] = checkpoints[block]
+            for i in range(start, end - 1):
+                self._add_coin(states[i - start], self.values_[i], states[i - start + 1])
+            for i in reversed(range(start, end)):
+                if not SSPSolver._has(states[i - start], remaining):
+                    chosen.append(i)
+                    remaining -= self.values_[i]
+        return chosen
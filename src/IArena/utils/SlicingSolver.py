@@ -0,0 +1,489 @@
+import os
+import tempfile
+import time
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+from IArena.utils.caching import cache_directory
+
+"""
+Optimal solver of the sliding puzzle of SlicingPuzzle, by IDA* over flat boards.
+
+Boards are flat sequences of the n*n squares row after row, with -1 for the empty space,
+as the keys of SlicingPuzzlePosition. A solution is the list of indexes the empty space moves to.
+
+The heuristic is the Manhattan distance plus linear conflicts, updated incrementally in each move.
+Optionally, additive pattern databases give a much better heuristic: the squares are split in disjoint groups,
+and for each group a table holds the minimum number of moves of its squares needed to place them,
+whatever the other squares are. Their sum never overestimates the moves left.
+Tables are built once with a vectorized breadth first search, saved in the cache directory
+and memory-mapped when loaded, so every process shares the same pages.
+"""
+
+# Groups of squares of the pattern databases used by default for each size
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+# Value of the table entries never reached
+_UNREACHED = 255
+
+# Databases already opened in this process
+_opened_databases: Dict[Tuple, 'PatternDatabase'] = {}
+
+
+def _neighbours(n: int) -> List[List[int]]:
+    """Indexes next to each index of an n*n board."""
+    neighbours = []
+    for cell in range(n * n):
+        row, column = divmod(cell, n)
+        cells = []
+        if row > 0:
+            cells.append(cell - n)
+        if row < n - 1:
+            cells.append(cell + n)
+        if column > 0:
+            cells.append(cell - 1)
+        if column < n - 1:
+            cells.append(cell + 1)
+        neighbours.append(cells)
+    return neighbours
+
+
+def is_solvable(board: Sequence[int]) -> bool:
+    """Whether the board can reach the solved one, from the parity of its inversions and its empty space row."""
+    n = int(round(len(board) ** 0.5))
+    tiles = [x for x in board if x != -1]
+    inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+    if n % 2 == 1:
+        return inversions % 2 == 0
+    # With an even width, each vertical move changes the parity of the inversions
+    blank_row_from_bottom = n - list(board).index(-1) // n
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+
+class PatternDatabase:
+    """
+    Minimum number of moves of a group of squares to reach their places, for every placement of them.
+
+    Entries are indexed by the cells of the squares of the group as digits in base n*n,
+    the first square of the group being the lowest digit.
+    Use get_pattern_database to reuse the same table within a process.
+    """
+
+    def __init__(
+            self,
+            n: int,
+            tiles: Sequence[int],
+            directory: str = None,
+            build: bool = True):
+        """
+        Load the table from the directory, building it first if it does not exist.
+
+        Args:
+            n: Size of the board = nxn
+            tiles: Squares of the group.
+            directory: Directory of the table files. By default, the pattern_databases directory of the cache.
+            build: Whether to build the table if it does not exist. Otherwise, raise FileNotFoundError.
+        """
+        self.n = n
+        self.tiles = tuple(tiles)
+        if directory is None:
+            directory = cache_directory('pattern_databases')
+        self.directory = directory
+        self.path = os.path.join(directory, PatternDatabase.file_name(n, self.tiles))
+
+        if not os.path.exists(self.path):
+            if not build:
+                raise FileNotFoundError(f"Pattern database {self.path} is not built.")
+            self._build()
+
+        self.table = np.load(self.path, mmap_mode='r')
+        if self.table.shape != ((n * n) ** len(self.tiles),) or self.table.dtype != np.uint8:
+            raise ValueError(f"Pattern database file {self.path} does not match its configuration. Remove it to rebuild it.")
+        # Indexing a memoryview of the map is as fast as indexing bytes, without copying the table
+        self.entries = memoryview(self.table)
+
+    @staticmethod
+    def file_name(
+            n: int,
+            tiles: Sequence[int]) -> str:
+        return f'slicing_{n}_{"-".join(str(t) for t in tiles)}.npy'
+
+    def index(self, board: Sequence[int]) -> int:
+        """Entry of the table for a board."""
+        cells = self.n * self.n
+        position = {square: cell for cell, square in enumerate(board)}
+        return sum(position[t] * cells ** i for i, t in enumerate(self.tiles))
+
+    def __getitem__(self, board: Sequence[int]) -> int:
+        return self.entries[self.index(board)]
+
+    def _build(self):
+        """
+        0-1 breadth first search over the cells of the group and the empty space, from the solved board.
+
+        Moving the empty space into a square of the group costs 1, and into any other square 0,
+        so the distances only count the moves of the group. The table keeps the minimum over the empty space.
+        Each level expands all its states at once with array operations.
+        """
+        n = self.n
+        cells = n * n
+        k = len(self.tiles)
+        powers = cells ** np.arange(k + 1, dtype=np.int64)
+        neighbours = np.full((cells, 4), -1, dtype=np.int64)
+        for cell, cell_neighbours in enumerate(_neighbours(n)):
+            neighbours[cell, :len(cell_neighbours)] = cell_neighbours
+
+        distances = np.full(cells ** (k + 1), _UNREACHED, dtype=np.uint8)
+        start = sum((t - 1) * cells ** i for i, t in enumerate(self.tiles)) + (cells - 1) * cells ** k
+        distances[start] = 0
+
+        def expand(states: np.ndarray, group_moves: bool) -> np.ndarray:
+            """States one move away not reached yet, in chunks so big levels fit in memory."""
+            reached = []
+            for chunk in range(0, len(states), 1 << 20):
+                chunk_states = states[chunk:chunk + (1 << 20)]
+                digits = (chunk_states[:, None] // powers) % cells
+                blank = digits[:, k]
+                for direction in range(4):
+                    target = neighbours[blank, direction]
+                    moved = digits[:, :k] == target[:, None]
+                    is_group = moved.any(axis=1)
+                    valid = (target >= 0) & (is_group if group_moves else ~is_group)
+                    new = chunk_states[valid] + (target[valid] - blank[valid]) * powers[k]
+                    if group_moves:
+                        # The square of the group moves to the old cell of the empty space
+                        new += (blank[valid] - target[valid]) * powers[np.argmax(moved[valid], axis=1)]
+                    reached.append(np.unique(new[distances[new] == _UNREACHED]))
+            return np.unique(np.concatenate(reached))
+
+        frontier = np.array([start], dtype=np.int64)
+        distance = 0
+        while frontier.size:
+            # States at the same distance, moving the empty space over squares out of the group
+            current = frontier
+            while current.size:
+                current = expand(current, group_moves=False)
+                distances[current] = distance
+                frontier = np.concatenate([frontier, current])
+            frontier = expand(frontier, group_moves=True)
+            distance += 1
+            distances[frontier] = distance
+
+        table = distances.reshape(cells, cells ** k).min(axis=0)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.save(file, table)
+            # Atomic, so concurrent builders never see a partially written table
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_pattern_database(
+        n: int,
+        tiles: Sequence[int],
+        directory: str = None,
+        build: bool = True) -> PatternDatabase:
+    """
+    Pattern database of a group of squares, opened only once per process.
+    """
+    key = (n, tuple(tiles), directory)
+    if key not in _opened_databases:
+        _opened_databases[key] = PatternDatabase(n, tiles, directory, build)
+    return _opened_databases[key]
+
+
+def get_pattern_databases(
+        n: int,
+        partition: Sequence[Sequence[int]] = None,
+        directory: str = None,
+        build: bool = True) -> List[PatternDatabase]:
+    """
+    Additive pattern databases of a partition of the squares (by default, the one of DEFAULT_PARTITIONS).
+
+    Building them takes a while for 4x4 boards, so it is better done once offline:
+    the files stay in the cache directory for later executions.
+    """
+    if partition is None:
+        partition = DEFAULT_PARTITIONS[n]
+    return [get_pattern_database(n, tiles, directory, build) for tiles in partition]
+
+
+class SlicingSolver:
+    """
+    IDA* solver of n x n boards.
+
+    Uses the additive pattern databases given, or Manhattan distance plus linear conflicts if none.
+    With databases, the heuristic is the highest of the one of the board and the one of the board
+    reflected over its main diagonal, as both need the same moves.
+    """
+
+    class Timeout(Exception):
+        """The search has not finished before its deadline."""
+
+    def __init__(
+            self,
+            n: int,
+            databases: List[PatternDatabase] = None):
+        self.n = n
+        self.cells = n * n
+        self.neighbours = _neighbours(n)
+        self.databases = databases or []
+
+        # Distance of each square (0 for the empty space) from each cell to its place
+        self.manhattan = [[0] * self.cells for _ in range(self.cells)]
+        for tile in range(1, self.cells):
+            goal_row, goal_column = divmod(tile - 1, n)
+            for cell in range(self.cells):
+                row, column = divmod(cell, n)
+                self.manhattan[tile][cell] = abs(row - goal_row) + abs(column - goal_column)
+
+        if self.databases:
+            tiles = [t for database in self.databases for t in database.tiles]
+            if sorted(tiles) != list(range(1, self.cells)):
+                raise ValueError("Pattern databases must split the squares of the board without overlapping")
+            self.group_of = [-1] * self.cells
+            self.weight_of = [0] * self.cells
+            for g, database in enumerate(self.databases):
+                for i, tile in enumerate(database.tiles):
+                    self.group_of[tile] = g
+                    self.weight_of[tile] = self.cells ** i
+
+        # Cell (and square, as square t belongs in cell t-1) in the board reflected over its main diagonal
+        self.reflected = [(cell % n) * n + cell // n for cell in range(self.cells)]
+        self.reflected_tile = [0] + [self.reflected[t - 1] + 1 for t in range(1, self.cells)]
+
+        self._conflicts: Dict[Tuple, int] = {}
+
+        # Nodes expanded by the last search
+        self.expanded = 0
+
+    ###############
+    # Heuristic
+
+    def _line_conflicts(
+            self,
+            board: List[int],
+            line: int,
+            is_row: bool) -> int:
+        """Extra moves of the squares of a line whose place is in the line but in the wrong order."""
+        n = self.n
+        cells = range(line * n, line * n + n) if is_row else range(line, self.cells, n)
+        goals = []
+        for cell in cells:
+            tile = board[cell]
+            if tile > 0 and ((tile - 1) // n if is_row else (tile - 1) % n) == line:
+                goals.append((tile - 1) % n if is_row else (tile - 1) // n)
+        key = tuple(goals)
+        value = self._conflicts.get(key)
+        if value is None:
+            # Squares to take out of the line so the rest are in order: all but the longest increasing subsequence
+            longest = [1] * len(goals)
+            for i in range(len(goals)):
+                for j in range(i):
+                    if goals[j] < goals[i]:
+                        longest[i] = max(longest[i], longest[j] + 1)
+            value = 2 * (len(goals) - max(longest, default=0))
+            self._conflicts[key] = value
+        return value
+
+    def heuristic(self, board: Sequence[int]) -> int:
+        """Lower bound of the moves needed to solve a board."""
+        board = [0 if x == -1 else x for x in board]
+        if self.databases:
+            return max(
+                sum(database.entries[i] for database, i in zip(self.databases, self._group_indexes(board))),
+                sum(database.entries[i] for database, i in zip(self.databases, self._group_indexes(self._reflect(board)))))
+        distance = sum(self.manhattan[tile][cell] for cell, tile in enumerate(board) if tile)
+        return distance + sum(
+            self._line_conflicts(board, line, is_row) for line in range(self.n) for is_row in (True, False))
+
+    def _reflect(self, board: List[int]) -> List[int]:
+        """Board reflected over its main diagonal, which needs the same moves to be solved."""
+        reflected = [0] * self.cells
+        for cell, tile in enumerate(board):
+            reflected[self.reflected[cell]] = self.reflected_tile[tile]
+        return reflected
+
+    def _group_indexes(self, board: List[int]) -> List[int]:
+        indexes = [0] * len(self.databases)
+        for cell, tile in enumerate(board):
+            if tile:
+                indexes[self.group_of[tile]] += cell * self.weight_of[tile]
+        return indexes
+
+    ###############
+    # Search
+
+    def solve(
+            self,
+            board: Sequence[int],
+            deadline: float = None,
+            weight: float = 1) -> List[int]:
+        """
+        Solution of a board, optimal unless the heuristic is weighted.
+
+        Args:
+            board: Flat board with -1 for the empty space.
+            deadline: time.time() after which the search raises SlicingSolver.Timeout.
+            weight: Weight of the heuristic. Over 1, solutions are found much faster
+                but may be up to that factor longer than the optimal ones.
+
+        Returns:
+            Indexes the empty space moves to, in order.
+        """
+        if len(board) != self.cells:
+            raise ValueError(f"Board must have {self.cells} squares")
+        if not is_solvable(board):
+            raise ValueError("Board cannot be solved")
+
+        board = [0 if x == -1 else x for x in board]
+        blank = board.index(0)
+        neighbours = self.neighbours
+        manhattan = self.manhattan
+        n = self.n
+        path: List[int] = []
+        FOUND = -1
+        counter = [0]
+
+        if self.databases:
+            entries = [database.entries for database in self.databases]
+            group_of = self.group_of
+            weight_of = self.weight_of
+            reflected = self.reflected
+            reflected_tile = self.reflected_tile
+            indexes = self._group_indexes(board)
+            reflected_indexes = self._group_indexes(self._reflect(board))
+            # Both heuristics are kept, and the search uses the highest one
+            sums = [
+                sum(table[i] for table, i in zip(entries, indexes)),
+                sum(table[i] for table, i in zip(entries, reflected_indexes))]
+
+            def search(blank: int, previous: int, g: int, bound: int) -> int:
+                h = sums[0] if sums[0] > sums[1] else sums[1]
+                f = g + weight * h
+                if f > bound:
+                    return f
+                if h == 0:
+                    return FOUND
+                counter[0] += 1
+                if deadline is not None and counter[0] & 0x3FFF == 0 and time.time() > deadline:
+                    raise SlicingSolver.Timeout()
+                minimum = 1 << 30
+                for target in neighbours[blank]:
+                    if target == previous:
+                        continue
+                    tile = board[target]
+                    group = group_of[tile]
+                    table = entries[group]
+                    delta = (blank - target) * weight_of[tile]
+                    old = table[indexes[group]]
+                    indexes[group] += delta
+                    new = table[indexes[group]]
+                    sums[0] += new - old
+
+                    reflected_square = reflected_tile[tile]
+                    reflected_group = group_of[reflected_square]
+                    reflected_table = entries[reflected_group]
+                    reflected_delta = (reflected[blank] - reflected[target]) * weight_of[reflected_square]
+                    reflected_old = reflected_table[reflected_indexes[reflected_group]]
+                    reflected_indexes[reflected_group] += reflected_delta
+                    reflected_new = reflected_table[reflected_indexes[reflected_group]]
+                    sums[1] += reflected_new - reflected_old
+
+                    board[blank] = tile
+                    board[target] = 0
+                    path.append(target)
+                    t = search(target, blank, g + 1, bound)
+                    if t == FOUND:
+                        return FOUND
+                    path.pop()
+                    board[target] = tile
+                    board[blank] = 0
+                    indexes[group] -= delta
+                    sums[0] += old - new
+                    reflected_indexes[reflected_group] -= reflected_delta
+                    sums[1] += reflected_old - reflected_new
+                    if t < minimum:
+                        minimum = t
+                return minimum
+
+        else:
+            line_conflicts = self._line_conflicts
+
+            def search(blank: int, previous: int, g: int, h: int, bound: int) -> int:
+                f = g + weight * h
+                if f > bound:
+                    return f
+                if h == 0:
+                    return FOUND
+                counter[0] += 1
+                if deadline is not None and counter[0] & 0x3FFF == 0 and time.time() > deadline:
+                    raise SlicingSolver.Timeout()
+                minimum = 1 << 30
+                for target in neighbours[blank]:
+                    if target == previous:
+                        continue
+                    tile = board[target]
+                    # A vertical move changes the row of the square, a horizontal one its column
+                    vertical = target - blank in (n, -n)
+                    line_old = target // n if vertical else target % n
+                    line_new = blank // n if vertical else blank % n
+                    before = line_conflicts(board, line_old, vertical) + line_conflicts(board, line_new, vertical)
+                    board[blank] = tile
+                    board[target] = 0
+                    after = line_conflicts(board, line_old, vertical) + line_conflicts(board, line_new, vertical)
+                    path.append(target)
+                    t = search(target, blank, g + 1,
+                               h + manhattan[tile][blank] - manhattan[tile][target] + after - before, bound)
+                    if t == FOUND:
+                        return FOUND
+                    path.pop()
+                    board[target] = tile
+                    board[blank] = 0
+                    if t < minimum:
+                        minimum = t
+                return minimum
+
+        h = self.heuristic(board)
+        bound = weight * h
+        while True:
+            t = search(blank, -1, 0, bound) if self.databases else search(blank, -1, 0, h, bound)
+            if t == FOUND:
+                self.expanded = counter[0]
+                return path
+            bound = t
+
+    def solution_cost(
+            self,
+            board: Sequence[int],
+            deadline: float = None) -> int:
+        """Minimum number of moves to solve a board."""
+        return len(self.solve(board, deadline))
+
+
+def solver_for(
+        n: int,
+        pattern_databases: bool = None) -> SlicingSolver:
+    """
+    Solver of n x n boards with the default pattern databases of the size, if any.
+
+    Args:
+        n: Size of the board = nxn
+        pattern_databases: True to use them (building them if needed), False to never use them,
+            or None to use them only if they are already built.
+    """
+    databases = []
+    if pattern_databases is not False and n in DEFAULT_PARTITIONS:
+        try:
+            databases = get_pattern_databases(n, build=bool(pattern_databases))
+        except FileNotFoundError:
+            databases = []
+    return SlicingSolver(n, databases)
@@ -1,7 +1,6 @@
 
 from typing import Dict, Iterator, List, Tuple, Optional
 from enum import Enum
-from queue import PriorityQueue
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
@@ -111,14 +110,22 @@ class SquareMap:
     Represents the grid of the game.
 
     Attributes:
-        map: List[List[bool]] - The grid represented as a matrix of booleans.
-                                   True represents a free square, and False represents a wall/obstacle.
+        map: np.ndarray - The grid represented as a matrix of booleans (a list of lists is converted).
+                          True represents a free square, and False represents a wall/obstacle.
+
+    The distances to a target are computed once with a BFS over the whole map and cached,
+    so any later distance or reachability query to the same target is a lookup.
+    The cache is cleared when squares are changed with set_free.
     """
 
+    # Distance in the distance fields of the squares that cannot reach the target
+    Unreachable = -1
+
     def __init__(
             self,
             map: List[List[bool]]):
-        self.map_ = map
+        self.map_ = np.array(map, dtype=bool, ndmin=2)
+        self.__distance_fields = {}
 
     def __str__(self):
         # Convert to a matrix of spaces and X
@@ -126,21 +133,108 @@ class SquareMap:
         return matrix_map_to_str(squares)
 
     def size(self) -> Tuple[int, int]:
-        return len(self.map_), len(self.map_[0]) if self.map_ else 0
+        rows, cols = self.map_.shape
+        return rows, cols
 
     def __len__(self):
-        return len(self.map_)
+        return self.map_.shape[0]
 
-    def __getitem__(self, index: Tuple[int, int]):
+    def __getitem__(self, index: Tuple[int, int]) -> bool:
         i, j = index
-        return self.map_[i][j]
+        return bool(self.map_[i, j])
 
     def in_bounds(self, coord: SquareMapCoordinate) -> bool:
         rows, cols = self.size()
         return 0 <= coord.x < rows and 0 <= coord.y < cols
 
     def is_free(self, coord: SquareMapCoordinate) -> bool:
-        return self.in_bounds(coord) and self.map_[coord.x][coord.y]
+        return self.in_bounds(coord) and bool(self.map_[coord.x, coord.y])
+
+    def set_free(
+            self,
+            coord: SquareMapCoordinate,
+            free: bool = True):
+        """Set whether a square is free, invalidating the cached distances."""
+        self.map_[coord.x, coord.y] = free
+        self.__distance_fields.clear()
+
+    def distance_field(
+            self,
+            target: SquareMapCoordinate) -> np.ndarray:
+        """
+        Minimum number of steps from every square to the target, computed once per target.
+
+        Walls, and free squares with no path to the target, have the distance Unreachable.
+        The array is shared by every call with the same target and must not be modified.
+        """
+        key = (target.x, target.y)
+        field = self.__distance_fields.get(key)
+        if field is None:
+            field = self.__bfs(key)
+            field.flags.writeable = False
+            self.__distance_fields[key] = field
+        return field
+
+    def distance(
+            self,
+            start: SquareMapCoordinate,
+            target: SquareMapCoordinate) -> float:
+        """Minimum number of steps from start to target, or inf if there is no path."""
+        if not self.is_free(start):
+            return float('inf')
+        d = self.distance_field(target)[start.x, start.y]
+        return float('inf') if d == SquareMap.Unreachable else int(d)
+
+    def is_reachable(
+            self,
+            start: SquareMapCoordinate,
+            target: SquareMapCoordinate) -> bool:
+        """Whether there is a path from start to target."""
+        return self.is_free(start) and self.distance_field(target)[start.x, start.y] != SquareMap.Unreachable
+
+    def __bfs(
+            self,
+            target: Tuple[int, int]) -> np.ndarray:
+        """BFS from the target over the flattened map, as every move costs the same and can be reversed."""
+        rows, cols = self.size()
+        field = np.full(rows * cols, SquareMap.Unreachable, dtype=np.int32)
+        x, y = target
+        if not (0 <= x < rows and 0 <= y < cols and self.map_[x, y]):
+            return field.reshape(rows, cols)
+
+        # Plain lists are much faster than arrays for element access in the loop
+        free = self.map_.ravel().tolist()
+        distances = [SquareMap.Unreachable] * (rows * cols)
+        source = x * cols + y
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            d = distances[u] + 1
+            column = u % cols
+            if u >= cols:
+                v = u - cols
+                if free[v] and distances[v] < 0:
+                    distances[v] = d
+                    queue.append(v)
+            if u + cols < rows * cols:
+                v = u + cols
+                if free[v] and distances[v] < 0:
+                    distances[v] = d
+                    queue.append(v)
+            if column > 0:
+                v = u - 1
+                if free[v] and distances[v] < 0:
+                    distances[v] = d
+                    queue.append(v)
+            if column < cols - 1:
+                v = u + 1
+                if free[v] and distances[v] < 0:
+                    distances[v] = d
+                    queue.append(v)
+
+        field[:] = distances
+        return field.reshape(rows, cols)
 
     def plot_2d_map(
             self,
@@ -153,12 +247,7 @@ class SquareMap:
         if coordinates is None:
             coordinates = {}
 
-        rows, cols = self.size()
-        grid = np.zeros((rows, cols))
-        for i in range(rows):
-            for j in range(cols):
-                if not self.map_[i][j]:
-                    grid[i, j] = 1
+        grid = (~self.map_).astype(float)
 
         plt.imshow(grid, cmap='Greys', origin='upper')
 
@@ -184,35 +273,9 @@ class SquareMap:
 def minimum_path(
         map: SquareMap,
         start: SquareMapCoordinate,
-        target: SquareMapCoordinate) -> int:
-
-    rows, cols = map.size()
-    directions = {
-        SquareMapMovement.Direction.Up: (-1, 0),
-        SquareMapMovement.Direction.Down: (1, 0),
-        SquareMapMovement.Direction.Left: (0, -1),
-        SquareMapMovement.Direction.Right: (0, 1)
-    }
-    pq = PriorityQueue()
-    pq.put((0, start))
-    visited = set()
-    while not pq.empty():
-        cost, current = pq.get()
-        if current == target:
-            return cost
-        if current in visited:
-            continue
-        visited.add(current)
-        for direction, (dx, dy) in directions.items():
-            neighbor = SquareMapCoordinate(current.x + dx, current.y + dy)
-            if (0 <= neighbor.x < rows and
-                    0 <= neighbor.y < cols and
-                    map[neighbor.x, neighbor.y] and
-                    neighbor not in visited):
-                pq.put((cost + 1, neighbor))
-
-    return float('inf')
-
+        target: SquareMapCoordinate) -> float:
+    """Minimum number of steps from start to target, or inf if there is no path."""
+    return map.distance(start, target)
 
 
 def square_map_generator(
@@ -232,141 +295,192 @@ def square_map_generator(
     return SquareMap(map)
 
 
+def _growing_tree(
+        rows: int,
+        cols: int,
+        root: int,
+        newest_prob: float,
+        rng: RandomGenerator) -> List[int]:
+    """
+    Random spanning tree of the grid, grown from the root square (flat index).
+
+    Each step extends the tree from the newest square with probability newest_prob, or from a random square
+    otherwise: 1 gives a depth first tree with long winding branches, 0 a Prim-like tree with short ones.
+    Every square is added once and every step is constant time, so the cost is linear in the squares.
+
+    Returns:
+        Parent of each square, and -1 for the root.
+    """
+    r = rng.rng
+    size = rows * cols
+    parent = [-2] * size
+    parent[root] = -1
+    active = [root]
+    while active:
+        i = len(active) - 1 if r.random() < newest_prob else r.randrange(len(active))
+        u = active[i]
+        x, y = divmod(u, cols)
+        options = []
+        if x > 0 and parent[u - cols] == -2:
+            options.append(u - cols)
+        if x < rows - 1 and parent[u + cols] == -2:
+            options.append(u + cols)
+        if y > 0 and parent[u - 1] == -2:
+            options.append(u - 1)
+        if y < cols - 1 and parent[u + 1] == -2:
+            options.append(u + 1)
+        if options:
+            v = options[r.randrange(len(options))]
+            parent[v] = u
+            active.append(v)
+        else:
+            # Swap remove, the order of the active squares only matters for the newest one
+            active[i] = active[-1]
+            active.pop()
+    return parent
+
+
+def _induced_path(
+        path: List[int],
+        cols: int) -> List[int]:
+    """
+    Shortcut a path (flat indexes) so no square is repeated and no two squares are adjacent unless consecutive.
+
+    From each square it jumps to the latest square of the path next to it, so no later square touches it.
+    """
+    index = {u: i for i, u in enumerate(path)}
+    i = index[path[0]]
+    result = [path[i]]
+    while i < len(path) - 1:
+        u = path[i]
+        neighbours = [u - cols, u + cols]
+        if u % cols > 0:
+            neighbours.append(u - 1)
+        if u % cols < cols - 1:
+            neighbours.append(u + 1)
+        i = max(index.get(v, -1) for v in neighbours)
+        result.append(path[i])
+    return result
+
+
+def _room_path(
+        rows: int,
+        cols: int,
+        s: Tuple[int, int],
+        t: Tuple[int, int],
+        newest_prob: float,
+        rng: RandomGenerator) -> List[int]:
+    """
+    Path (flat indexes) from s to t through a random spanning tree of the squares with even coordinates (rooms).
+
+    Consecutive rooms are joined by the square between them, so the path only touches itself
+    around the few squares joining s and t to their rooms.
+    """
+    room_cols = (cols + 1) // 2
+    parent = _growing_tree((rows + 1) // 2, room_cols, (t[0] // 2) * room_cols + t[1] // 2, newest_prob, rng)
+
+    def to_room(x, y):
+        squares = [(x, y)]
+        if x % 2:
+            squares.append((x - 1, y))
+        if y % 2:
+            squares.append((x - x % 2, y - 1))
+        return squares
+
+    path = to_room(*s)
+    room = (s[0] // 2) * room_cols + s[1] // 2
+    while parent[room] >= 0:
+        x, y = divmod(room, room_cols)
+        room = parent[room]
+        ux, uy = divmod(room, room_cols)
+        path.append((x + ux, y + uy))
+        path.append((2 * ux, 2 * uy))
+    path.extend(reversed(to_room(*t)[:-1]))
+    return [x * cols + y for x, y in path]
+
+
+def _monotone_path(
+        s: Tuple[int, int],
+        t: Tuple[int, int],
+        rng: RandomGenerator) -> List[Tuple[int, int]]:
+    """Random shortest path moving always towards the target, which never touches itself."""
+    steps = [(1 if t[0] > s[0] else -1, 0)] * abs(t[0] - s[0]) + [(0, 1 if t[1] > s[1] else -1)] * abs(t[1] - s[1])
+    rng.shuffle(steps)
+    path = [s]
+    for dx, dy in steps:
+        path.append((path[-1][0] + dx, path[-1][1] + dy))
+    return path
+
+
 def generate_random_non_loop_path(
             rows: int,
             cols: int,
             start: SquareMapCoordinate,
             target: SquareMapCoordinate,
             approx_path_length: int,
-            rng: RandomGenerator = RandomGenerator()
+            rng: RandomGenerator = RandomGenerator(),
+            attempts: int = 12,
         ) -> List[SquareMapCoordinate]:
+    """
+    Random path from start to target of about approx_path_length steps whose squares only touch
+    the previous and next ones, so freeing them never creates shortcuts.
+
+    Paths follow random spanning trees of the squares with even coordinates, which never touch themselves.
+    How winding the trees are is bisected over a fixed number of attempts to get close to the length required,
+    so the time is linear in the squares of the grid times the attempts, whatever the map.
+    A path shorter than the Manhattan distance is never returned, and the length keeps its parity.
 
-    DIRS = [(0,1), (1,0), (0,-1), (-1,0)]  # right, down, left, up
-
-    def in_bounds(u: Tuple[int,int]) -> bool:
-        x, y = u
-        return 0 <= x < rows and 0 <= y < cols
-
-    def neighbours(u: Tuple[int,int]):
-        x, y = u
-        for dx, dy in DIRS:
-            v = (x + dx, y + dy)
-            if in_bounds(v):
-                yield v
-
-    def manhattan(a: Tuple[int,int], b: Tuple[int,int]) -> int:
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    def legal_moves(cur: Tuple[int,int], visited: set) -> List[Tuple[int,int]]:
-        """Moves that keep the path induced: the new cell may touch only `cur` among visited."""
-        out = []
-        for u in neighbours(cur):
-            if u in visited:
-                continue
-            ok = True
-            for w in neighbours(u):
-                if w != cur and w in visited:
-                    ok = False
-                    break
-            if ok:
-                out.append(u)
-        return out
-
-    def bfs_reaches_end(cur: Tuple[int,int], end: Tuple[int,int], visited: set) -> bool:
-        """Conservative reachability check ignoring the induced constraint but not revisiting."""
-        q = deque([cur])
-        seen = {cur}
-        blocked = visited - {cur}
-        while q:
-            u = q.popleft()
-            if u == end:
-                return True
-            for v in neighbours(u):
-                if v in blocked or v in seen:
-                    continue
-                seen.add(v)
-                q.append(v)
-        return False
-
-    # Normalize inputs
+    Returns:
+        Squares of the path, from start to target. Empty if start or target are out of the grid.
+    """
     s = start.as_tuple()
     t = target.as_tuple()
-    if not (in_bounds(s) and in_bounds(t)):
+    if not (0 <= s[0] < rows and 0 <= s[1] < cols and 0 <= t[0] < rows and 0 <= t[1] < cols):
         return []
-    # at least the Manhattan distance is necessary
-    need = max(approx_path_length, manhattan(s, t))
-
-    # Effort limits (tune as needed)
-    MAX_RESTARTS = 1500
-    STEP_CAP = 200000
-
-    steps_used_total = 0
-
-    def dfs(path: List[Tuple[int,int]], visited: set) -> List[Tuple[int,int]] | None:
-        nonlocal steps_used_total
-        steps_used_total += 1
-        if steps_used_total > STEP_CAP:
-            return None
-
-        cur = path[-1]
-        L = len(path) - 1  # number of edges so far
-
-        if cur == t and L >= need:
-            return path
-
-        if not bfs_reaches_end(cur, t, visited):
-            return None
-
-        cands = legal_moves(cur, visited)
-        # steer away from entering target too early
-        if L < need - 1:
-            cands = [u for u in cands if u != t]
-        if not cands:
-            return None
-
-        # dead-end lookahead prune and gather mobility for scoring
-        scored = []
-        for u in cands:
-            visited.add(u)
-            nm = legal_moves(u, visited)
-            visited.remove(u)
-            if u == t and L + 1 >= need:
-                scored.append((u, 1))
-            elif nm:
-                scored.append((u, len(nm)))
-        if not scored:
-            return None
-
-        # heuristic ordering: before reaching `need`, prefer moves that increase distance (stretch);
-        # afterwards, prefer those that decrease it; break ties by mobility and randomness.
-        rng.shuffle(scored)
-        if L < need:
-            scored.sort(key=lambda p: (manhattan(p[0], t) - manhattan(cur, t), p[1]))
-        else:
-            scored.sort(key=lambda p: (manhattan(cur, t) - manhattan(p[0], t), p[1]))
-
-        for u, _mob in reversed(scored):
-            visited.add(u)
-            path.append(u)
-            out = dfs(path, visited)
-            if out is not None:
-                return out
-            path.pop()
-            visited.remove(u)
-        return None
-
-    # Multiple randomized restarts
-    for _ in range(MAX_RESTARTS):
-        rng.shuffle(DIRS)  # vary local geometry preference
-        steps_used_total = 0
-        path0 = [s]
-        visited0 = {s}
-        out = dfs(path0, visited0)
-        if out is not None:
-            # Convert back to SquareMapCoordinate
-            return [SquareMapCoordinate(x, y) for x, y in out]
-
-    return []
+    manhattan = abs(s[0] - t[0]) + abs(s[1] - t[1])
+    need = max(approx_path_length, manhattan)
+
+    best = _monotone_path(s, t, rng)
+    if need > manhattan + 1 and s != t:
+        low, high = 0.0, 1.0
+        for _ in range(attempts):
+            newest_prob = (low + high) / 2
+            path = [divmod(u, cols) for u in _induced_path(_room_path(rows, cols, s, t, newest_prob, rng), cols)]
+
+            if abs(len(path) - 1 - need) < abs(len(best) - 1 - need):
+                best = path
+            if abs(len(best) - 1 - need) <= 1:
+                break
+            if len(path) - 1 < need:
+                low = newest_prob
+            else:
+                high = newest_prob
+
+    return [SquareMapCoordinate(x, y) for x, y in best]
+
+
+def square_maze_generator(
+        rows: int,
+        cols: int,
+        rng: RandomGenerator = RandomGenerator()) -> SquareMap:
+    """
+    Random maze with exactly one path between any two free squares.
+
+    The squares with even coordinates are the rooms, joined along a random depth first spanning tree
+    by freeing the square between them. Linear in the squares of the map.
+    """
+    room_rows = (rows + 1) // 2
+    room_cols = (cols + 1) // 2
+    parent = _growing_tree(room_rows, room_cols, 0, 1.0, rng)
+
+    map = np.zeros((rows, cols), dtype=bool)
+    map[::2, ::2] = True
+    for room, up in enumerate(parent):
+        if up >= 0:
+            x, y = divmod(room, room_cols)
+            ux, uy = divmod(up, room_cols)
+            map[x + ux, y + uy] = True
+    return SquareMap(map)
 
 
 def square_valid_map_generator(
@@ -379,9 +493,9 @@ def square_valid_map_generator(
         rng: RandomGenerator = RandomGenerator()) -> SquareMap:
 
     map = square_map_generator(rows, cols, approx_obstacle_prob, rng)
-    path = generate_random_non_loop_path(rows, cols, start, target, approx_path_length)
+    path = generate_random_non_loop_path(rows, cols, start, target, approx_path_length, rng)
     for coord in path:
-        map.map_[coord.x][coord.y] = True  # Ensure path is free
-    map.map_[start.x][start.y] = True  # Ensure start is free
-    map.map_[target.x][target.y] = True  # Ensure target is free
+        map.set_free(coord)  # Ensure path is free
+    map.set_free(start)  # Ensure start is free
+    map.set_free(target)  # Ensure target is free
     return map
@@ -0,0 +1,28 @@
+import os
+
+"""
+Location of the files precomputed and reused between executions.
+
+The root directory is taken from the environment variable IARENA_CACHE_DIR,
+or defaults to the user cache directory ($XDG_CACHE_HOME/iarena or ~/.cache/iarena).
+"""
+
+CACHE_DIRECTORY_VARIABLE = 'IARENA_CACHE_DIR'
+
+
+def cache_directory(*subdirectories: str) -> str:
+    """
+    Path to a directory inside the cache, creating it if it does not exist.
+
+    Args:
+        subdirectories: Path components of the directory inside the cache root.
+    """
+    root = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+    if not root:
+        root = os.path.join(
+            os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+            'iarena')
+
+    directory = os.path.join(root, *subdirectories)
+    os.makedirs(directory, exist_ok=True)
+    return directory
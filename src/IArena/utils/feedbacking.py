@@ -0,0 +1,382 @@
+import math
+from typing import List, Sequence, Tuple, Union
+from enum import Enum
+import numpy as np
+
+"""
+Vectorized feedback computation for the code-breaking games.
+
+Every code is represented as a row of integers from 0 to M-1 (colors and letters are coded by their index).
+The functions compute the feedback of a batch of G guesses against a batch of C candidate secrets at once,
+returning arrays with shape (G, C, ...) that match exactly the feedback given by the rules of each game.
+"""
+
+CodeArray = np.ndarray
+CodeLike = Union[CodeArray, Sequence[Sequence[int]], Sequence[int]]
+
+# Maximum number of elements of an intermediate array before splitting guesses in chunks
+_MAX_CHUNK_ELEMENTS = 1 << 22
+
+
+class FeedbackType(Enum):
+    """
+    Represents the different feedback semantics of the code-breaking games.
+
+    Values:
+        Mastermind: Number of correct and misplaced values (Mastermind, ColorMastermind).
+        Wordle: Wrong / Misplaced / Correct for each position (Wordle, LetterWordle, VectorWordle).
+        Distance: Distance to the matched value for each position (DistanceWordle).
+    """
+    Mastermind = 0
+    Wordle = 1
+    Distance = 2
+
+
+def as_code_array(codes: CodeLike) -> CodeArray:
+    """
+    Convert a code or a list of codes into a 2D integer array with one code per row.
+    """
+    array = np.asarray(codes, dtype=np.int64)
+    if array.ndim == 1:
+        array = array[None, :]
+    if array.ndim != 2:
+        raise ValueError(f"Codes must be a 1D or 2D array. Shape given: {array.shape}")
+    return array
+
+
+def all_codes(
+        code_size: int,
+        number_values: int,
+        allow_repetition: bool = True) -> CodeArray:
+    """
+    Array with every possible code, one per row.
+
+    The order is the same as the one of itertools.product (with repetition)
+    or itertools.permutations (without repetition), that is the order of possible_movements.
+    """
+    if allow_repetition:
+        indexes = np.arange(number_values ** code_size, dtype=np.int64)
+        powers = number_values ** np.arange(code_size - 1, -1, -1, dtype=np.int64)
+        return (indexes[:, None] // powers[None, :]) % number_values
+
+    if code_size > number_values:
+        return np.zeros((0, code_size), dtype=np.int64)
+
+    codes = np.zeros((1, 0), dtype=np.int64)
+    for p in range(code_size):
+        used = np.zeros((len(codes), number_values), dtype=bool)
+        np.put_along_axis(used, codes, True, axis=1)
+        rows, values = np.nonzero(~used)
+        codes = np.concatenate([codes[rows], values[:, None]], axis=1)
+    return codes
+
+
+def _ranks_fit_int64(
+        code_size: int,
+        number_values: int,
+        allow_repetition: bool) -> bool:
+    """Whether every rank of the space fits in an int64."""
+    size = number_values ** code_size if allow_repetition else math.perm(number_values, min(code_size, number_values))
+    return size - 1 <= np.iinfo(np.int64).max
+
+
+def code_ranks(
+        codes: CodeLike,
+        number_values: int,
+        allow_repetition: bool = True) -> np.ndarray:
+    """
+    Index of each code in all_codes(code_size, number_values, allow_repetition).
+
+    Ranks are int64, or Python integers in an object array if the space has more codes than an int64 can index.
+    Codes are not validated: a code with repeated values when allow_repetition is False has no meaningful rank.
+    """
+    codes = as_code_array(codes)
+    code_size = codes.shape[1]
+    dtype = np.int64 if _ranks_fit_int64(code_size, number_values, allow_repetition) else object
+
+    if allow_repetition:
+        powers = np.array([number_values ** k for k in range(code_size - 1, -1, -1)], dtype=dtype)
+        return codes.astype(dtype) @ powers
+
+    # Lehmer code: for each position, number of unused values lower than the value times the arrangements left
+    ranks = np.zeros(len(codes), dtype=dtype)
+    for p in range(code_size):
+        smaller_used = (codes[:, :p] < codes[:, p:p+1]).sum(axis=1)
+        arrangements = 1
+        for k in range(code_size - p - 1):
+            arrangements *= number_values - p - 1 - k
+        ranks += (codes[:, p] - smaller_used).astype(dtype) * arrangements
+    return ranks
+
+
+def codes_from_ranks(
+        ranks: np.ndarray,
+        code_size: int,
+        number_values: int,
+        allow_repetition: bool = True) -> CodeArray:
+    """
+    Codes in the given positions of all_codes(code_size, number_values, allow_repetition), one per row.
+
+    Inverse of code_ranks.
+    """
+    dtype = np.int64 if _ranks_fit_int64(code_size, number_values, allow_repetition) else object
+    ranks = np.asarray(ranks, dtype=dtype).ravel()
+
+    if allow_repetition:
+        powers = np.array([number_values ** k for k in range(code_size - 1, -1, -1)], dtype=dtype)
+        return ((ranks[:, None] // powers[None, :]) % number_values).astype(np.int64)
+
+    # Mixed radix digits: the digit of position p is the index of its value among the unused ones
+    digits = np.zeros((len(ranks), code_size), dtype=np.int64)
+    remaining = ranks.copy()
+    for p in range(code_size - 1, -1, -1):
+        digits[:, p] = remaining % (number_values - p)
+        remaining //= number_values - p
+
+    codes = np.zeros((len(ranks), code_size), dtype=np.int64)
+    unused = np.ones((len(ranks), number_values), dtype=bool)
+    rows = np.arange(len(ranks))
+    for p in range(code_size):
+        # First value whose number of unused values up to it is digit + 1
+        values = np.argmax(np.cumsum(unused, axis=1) > digits[:, p:p+1], axis=1)
+        codes[:, p] = values
+        unused[rows, values] = False
+    return codes
+
+
+def _chunks(n_guesses: int, elements_per_guess: int) -> List[slice]:
+    step = max(1, _MAX_CHUNK_ELEMENTS // max(1, elements_per_guess))
+    return [slice(i, min(i + step, n_guesses)) for i in range(0, n_guesses, step)]
+
+
+def _histogram(codes: CodeArray, number_values: int) -> np.ndarray:
+    """Number of times each value appears in each code. Shape (N, number_values)."""
+    histogram = np.zeros((len(codes), number_values), dtype=np.int32)
+    rows = np.repeat(np.arange(len(codes)), codes.shape[1])
+    np.add.at(histogram, (rows, codes.ravel()), 1)
+    return histogram
+
+
+def mastermind_feedback(
+        guesses: CodeLike,
+        candidates: CodeLike,
+        number_values: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mastermind feedback of each guess against each candidate.
+
+    Returns:
+        correct: Array (G, C) with the number of values in the right position.
+        misplaced: Array (G, C) with the number of values in the code but in a wrong position.
+    """
+    guesses = as_code_array(guesses)
+    candidates = as_code_array(candidates)
+    n_guesses, code_size = guesses.shape
+    n_candidates = len(candidates)
+
+    guesses_histogram = _histogram(guesses, number_values)
+    candidates_histogram = _histogram(candidates, number_values)
+
+    correct = np.zeros((n_guesses, n_candidates), dtype=np.int32)
+    common = np.zeros((n_guesses, n_candidates), dtype=np.int32)
+
+    for chunk in _chunks(n_guesses, n_candidates * max(code_size, number_values)):
+        g = guesses[chunk]
+        correct[chunk] = (g[:, None, :] == candidates[None, :, :]).sum(axis=2)
+        common[chunk] = np.minimum(
+            guesses_histogram[chunk][:, None, :],
+            candidates_histogram[None, :, :]).sum(axis=2)
+
+    return correct, common - correct
+
+
+def _positional_ranks(
+        guesses: CodeArray,
+        candidates: CodeArray,
+        number_values: int):
+    """
+    Common computations for the positional feedbacks.
+
+    Returns:
+        equal: (G, C, n) whether each position is correct.
+        guess_rank: (G, C, n) number of previous not correct positions in the guess with the same value.
+        available: (G, C, n) number of not correct positions in the candidate with the value of the guess.
+    """
+    code_size = guesses.shape[1]
+
+    equal = guesses[:, None, :] == candidates[None, :, :]
+    not_equal = ~equal
+
+    guess_rank = np.zeros(equal.shape, dtype=np.int16)
+    value_correct = np.zeros(equal.shape, dtype=np.int16)
+    for j in range(code_size):
+        # same_value[g, i] whether guess position i has the same value as guess position j
+        same_value = guesses == guesses[:, j:j+1]
+        value_correct += equal[:, :, j:j+1] & same_value[:, None, :]
+        same_value[:, :j+1] = False
+        guess_rank += not_equal[:, :, j:j+1] & same_value[:, None, :]
+
+    candidates_histogram = _histogram(candidates, number_values)
+    available = candidates_histogram[:, guesses].transpose(1, 0, 2) - value_correct
+
+    return equal, guess_rank, available
+
+
+def wordle_feedback(
+        guesses: CodeLike,
+        candidates: CodeLike,
+        number_values: int) -> np.ndarray:
+    """
+    Wordle feedback of each guess against each candidate.
+
+    Returns:
+        Array (G, C, n) with 0 (Wrong), 1 (Misplaced) or 2 (Correct) for each position,
+        the same values as WordlePosition.WordleFeedback.
+    """
+    guesses = as_code_array(guesses)
+    candidates = as_code_array(candidates)
+    n_guesses, code_size = guesses.shape
+
+    feedback = np.zeros((n_guesses, len(candidates), code_size), dtype=np.int8)
+
+    for chunk in _chunks(n_guesses, len(candidates) * code_size * 4):
+        equal, guess_rank, available = _positional_ranks(guesses[chunk], candidates, number_values)
+        misplaced = ~equal & (guess_rank < available)
+        feedback[chunk] = 2 * equal + misplaced
+
+    return feedback
+
+
+def distance_feedback(
+        guesses: CodeLike,
+        candidates: CodeLike,
+        number_values: int) -> np.ndarray:
+    """
+    DistanceWordle feedback of each guess against each candidate.
+
+    Returns:
+        Array (G, C, n) with 0 if the position is correct, the distance to the position of the secret
+        the value is matched with if it is misplaced, or n if it is not matched.
+    """
+    guesses = as_code_array(guesses)
+    candidates = as_code_array(candidates)
+    n_guesses, code_size = guesses.shape
+    positions = np.arange(code_size)
+
+    feedback = np.zeros((n_guesses, len(candidates), code_size), dtype=np.int32)
+
+    for chunk in _chunks(n_guesses, len(candidates) * code_size * 6):
+        g = guesses[chunk]
+        equal, guess_rank, _ = _positional_ranks(g, candidates, number_values)
+        not_equal = ~equal
+
+        # The k-th not correct appearance of a value in the guess matches the k-th one in the candidate
+        result = np.full(equal.shape, code_size, dtype=np.int32)
+        candidate_rank = np.zeros(equal.shape[:2], dtype=np.int16)
+        for j in range(code_size):
+            value_j = candidates[:, j]
+            if j > 0:
+                # Previous not correct positions of the candidate with the same value than j
+                same_before = candidates[:, :j] == value_j[:, None]
+                candidate_rank = (not_equal[:, :, :j] & same_before[None, :, :]).sum(axis=2)
+            match = (
+                not_equal
+                & not_equal[:, :, j:j+1]
+                & (g[:, None, :] == value_j[None, :, None])
+                & (guess_rank == candidate_rank[:, :, None]))
+            result[match] = np.abs(positions - j)[np.nonzero(match)[2]]
+
+        result[equal] = 0
+        feedback[chunk] = result
+
+    return feedback
+
+
+def raw_feedback(
+        feedback_type: FeedbackType,
+        guesses: CodeLike,
+        candidates: CodeLike,
+        number_values: int) -> np.ndarray:
+    """
+    Feedback of each guess against each candidate as an integer array (G, C, k), without packing it.
+
+    k is 2 (correct, misplaced) for Mastermind and n (one value per position) for Wordle and Distance.
+    Unlike feedback_codes, it works for any code size.
+    """
+    if feedback_type == FeedbackType.Mastermind:
+        correct, misplaced = mastermind_feedback(guesses, candidates, number_values)
+        return np.stack([correct, misplaced], axis=-1)
+    if feedback_type == FeedbackType.Wordle:
+        return wordle_feedback(guesses, candidates, number_values)
+    if feedback_type == FeedbackType.Distance:
+        return distance_feedback(guesses, candidates, number_values)
+    raise ValueError(f"Unknown feedback type {feedback_type}")
+
+
+def feedback_code_count(
+        feedback_type: FeedbackType,
+        code_size: int) -> int:
+    """Number of different feedback codes for a feedback type and code size."""
+    if feedback_type == FeedbackType.Mastermind:
+        return (code_size + 1) ** 2
+    if feedback_type == FeedbackType.Wordle:
+        return 3 ** code_size
+    if feedback_type == FeedbackType.Distance:
+        return (code_size + 1) ** code_size
+    raise ValueError(f"Unknown feedback type {feedback_type}")
+
+
+def mastermind_code(
+        correct: int,
+        misplaced: int,
+        code_size: int) -> int:
+    """Code of a Mastermind feedback."""
+    return correct * (code_size + 1) + misplaced
+
+
+def positional_code(
+        values: Sequence[int],
+        base: int) -> int:
+    """Code of a positional feedback (Wordle or Distance), with the first position as the least significant."""
+    code = 0
+    for v in reversed(values):
+        code = code * base + int(v)
+    return code
+
+
+def _pack_positional(feedback: np.ndarray, base: int) -> np.ndarray:
+    powers = base ** np.arange(feedback.shape[-1], dtype=np.int64)
+    return (feedback.astype(np.int64) * powers).sum(axis=-1)
+
+
+def feedback_codes(
+        feedback_type: FeedbackType,
+        guesses: CodeLike,
+        candidates: CodeLike,
+        number_values: int) -> np.ndarray:
+    """
+    Feedback of each guess against each candidate coded as a single integer.
+
+    Two pairs (guess, candidate) have the same code if and only if they have the same feedback.
+    Codes go from 0 to feedback_code_count(feedback_type, code_size) - 1.
+
+    Returns:
+        Array (G, C) of int64 codes.
+    """
+    guesses = as_code_array(guesses)
+    code_size = guesses.shape[1]
+
+    if feedback_type == FeedbackType.Mastermind:
+        correct, misplaced = mastermind_feedback(guesses, candidates, number_values)
+        return correct.astype(np.int64) * (code_size + 1) + misplaced
+
+    if feedback_type == FeedbackType.Wordle:
+        if 3 ** code_size > np.iinfo(np.int64).max:
+            raise ValueError(f"Wordle feedback codes do not fit in 64 bits for code size {code_size}")
+        return _pack_positional(wordle_feedback(guesses, candidates, number_values), 3)
+
+    if feedback_type == FeedbackType.Distance:
+        if (code_size + 1) ** code_size > np.iinfo(np.int64).max:
+            raise ValueError(f"Distance feedback codes do not fit in 64 bits for code size {code_size}")
+        return _pack_positional(distance_feedback(guesses, candidates, number_values), code_size + 1)
+
+    raise ValueError(f"Unknown feedback type {feedback_type}")
@@ -0,0 +1,179 @@
+import heapq
+import math
+from collections import deque
+from typing import List, Tuple
+import numpy as np
+
+"""
+Minimum cost paths in grids where entering each square has a cost, as in FieldWalk.
+
+The costs are a NumPy array whose last two axes are the rows and columns of the grid,
+so many maps of the same size can be solved at once by stacking them in the leading axes.
+Moves go to the 4 adjacent squares, and the cost of a path is the sum of the squares it enters
+(the starting square does not count).
+"""
+
+Square = Tuple[int, int]
+
+# Iterations of whole line sweeps before the maps still improving are finished with Dijkstra
+SweepLimit = 32
+
+
+def _sweep(
+        field: np.ndarray,
+        prefix: np.ndarray,
+        before: np.ndarray,
+        axis: int) -> None:
+    """
+    Relaxes the field in place along whole lines of the axis, in both directions.
+
+    Going towards higher indexes, field[i] = min over j >= i of field[j] + weights[i+1..j], that is
+    the suffix minimum of field + prefix, minus prefix, with prefix the cumulative sum of the weights
+    along the axis. The other direction is the prefix minimum of field - before, plus before,
+    with before the cumulative sum without the own weight.
+    """
+    reverse = [slice(None)] * field.ndim
+    reverse[axis] = slice(None, None, -1)
+    reverse = tuple(reverse)
+    # Entering the squares of higher index
+    np.minimum(field, np.minimum.accumulate((field + prefix)[reverse], axis=axis)[reverse] - prefix, out=field)
+    # Entering the squares of lower index
+    np.minimum(field, np.minimum.accumulate(field - before, axis=axis) + before, out=field)
+
+
+def _dijkstra(
+        weights: np.ndarray,
+        target: Square) -> np.ndarray:
+    """Minimum cost from every square of one map to the target, with a heap."""
+    rows, cols = weights.shape
+    entering = weights.ravel().tolist()
+    field = [math.inf] * (rows * cols)
+    start = target[0] * cols + target[1]
+    field[start] = 0.0
+    queue = [(0.0, start)]
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > field[u]:
+            continue
+        # Going from v to u enters u
+        d += entering[u]
+        x, y = divmod(u, cols)
+        for v in (u - cols if x > 0 else -1, u + cols if x < rows - 1 else -1,
+                  u - 1 if y > 0 else -1, u + 1 if y < cols - 1 else -1):
+            if v >= 0 and d < field[v]:
+                field[v] = d
+                heapq.heappush(queue, (d, v))
+    return np.array(field).reshape(rows, cols)
+
+
+def cost_to_go(
+        costs: np.ndarray,
+        target: Square = None) -> np.ndarray:
+    """
+    Minimum cost from every square to the target, for one map or a batch of them.
+
+    The field is the fixed point of cost_to_go[u] = min(costs[v] + cost_to_go[v]) over the neighbours v of u.
+    Each iteration sweeps whole rows and then whole columns in both directions over the whole array
+    (so over every map of the batch at once), and stops when nothing improves.
+    With non negative costs this gives the same distances as Dijkstra, in as many iterations
+    as turns the optimal paths need, instead of a heap operation per square.
+    Maps whose optimal paths turn too many times, as winding corridors, would need a number of iterations
+    that grows with their squares, so after SweepLimit iterations the maps still improving are finished
+    one by one with Dijkstra, which keeps the worst case in O(squares log squares).
+
+    Args:
+        costs: Cost of entering each square, with shape (..., rows, cols). Must be non negative.
+        target: Square to reach. By default, the bottom right one.
+
+    Returns:
+        Array of the shape of costs with the minimum cost to reach the target from each square.
+        Integer costs give integer distances.
+    """
+    costs = np.asarray(costs)
+    if np.any(costs < 0):
+        raise ValueError("Costs must be non negative")
+    rows, cols = costs.shape[-2:]
+    if target is None:
+        target = (rows - 1, cols - 1)
+
+    weights = costs.astype(np.float64)
+    field = np.full(weights.shape, np.inf)
+    field[..., target[0], target[1]] = 0
+
+    sums = [(axis, np.cumsum(weights, axis=axis)) for axis in (-1, -2)]
+    sums = [(axis, prefix, prefix - weights) for axis, prefix in sums]
+    for _ in range(SweepLimit):
+        previous = field.copy()
+        for axis, prefix, before in sums:
+            _sweep(field, prefix, before, axis)
+        if np.array_equal(field, previous):
+            break
+    else:
+        maps_field = field.reshape(-1, rows, cols)
+        maps_weights = weights.reshape(-1, rows, cols)
+        maps_previous = previous.reshape(-1, rows, cols)
+        for i in range(len(maps_field)):
+            if not np.array_equal(maps_field[i], maps_previous[i]):
+                maps_field[i] = _dijkstra(maps_weights[i], target)
+
+    if np.issubdtype(costs.dtype, np.integer):
+        return field.astype(np.int64)
+    return field
+
+
+def minimum_costs(
+        costs: np.ndarray,
+        start: Square = (0, 0),
+        target: Square = None) -> np.ndarray:
+    """
+    Minimum cost from start to target of each map of a batch with shape (maps, rows, cols).
+    """
+    return cost_to_go(costs, target)[..., start[0], start[1]]
+
+
+def optimal_path(
+        costs: np.ndarray,
+        start: Square = (0, 0),
+        target: Square = None,
+        field: np.ndarray = None) -> Tuple[int, List[Square]]:
+    """
+    Minimum cost and one optimal path from start to target in one map.
+
+    Among the optimal paths, it returns one with the fewest squares, so squares of cost zero are fine.
+
+    Args:
+        costs: Cost of entering each square, with shape (rows, cols). Must be non negative.
+        start: Initial square.
+        target: Square to reach. By default, the bottom right one.
+        field: cost_to_go of the map to the same target, if already computed.
+
+    Returns:
+        Cost of the path, and the squares of the path from start to target, both included.
+    """
+    costs = np.asarray(costs)
+    rows, cols = costs.shape
+    if target is None:
+        target = (rows - 1, cols - 1)
+    if field is None:
+        field = cost_to_go(costs, target)
+
+    # Breadth first search over the moves whose cost plus remaining cost is the remaining cost of the square,
+    # so squares of cost zero (with ties in both directions) are not visited twice
+    tolerance = 0 if np.issubdtype(field.dtype, np.integer) else 1e-9 * (1 + abs(float(field[start[0], start[1]])))
+    start, target = tuple(start), tuple(target)
+    parents = {start: None}
+    queue = deque([start])
+    while target not in parents:
+        x, y = queue.popleft()
+        for v in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= v[0] < rows and 0 <= v[1] < cols and v not in parents \
+                    and costs[v] + field[v] <= field[x, y] + tolerance:
+                parents[v] = (x, y)
+                queue.append(v)
+
+    path = [target]
+    while path[-1] != start:
+        path.append(parents[path[-1]])
+    path.reverse()
+
+    return field[start[0], start[1]].item(), path
@@ -0,0 +1,63 @@
+import itertools
+import random
+import pytest
+
+from IArena.utils.BitDomain import BitDomain, bits, popcount
+from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.games.Wordle import WordleRules
+from IArena.players.optimal_players import Wordle_OptimalPlayer_norep, Wordle_NonOptimalPlayer_norep
+
+
+def test_bits_and_popcount():
+    assert list(bits(0b101001)) == [0, 3, 5]
+    assert popcount(0b101001) == 3
+    assert popcount(0) == 0
+
+
+def test_position_and_value_masks_stay_in_sync():
+    rng = random.Random(0)
+    domain = BitDomain(5, 7)
+    for _ in range(30):
+        operation = rng.randrange(3)
+        position, value = rng.randrange(5), rng.randrange(7)
+        if operation == 0:
+            domain.remove(position, value)
+        elif operation == 1:
+            domain.remove_value(value)
+        else:
+            domain.fix_unique(position, value)
+
+        for i in range(5):
+            for v in range(7):
+                assert domain.has(i, v) == (i in domain.positions(v))
+
+
+def test_first_unique_code_is_valid():
+    rng = random.Random(0)
+    for _ in range(50):
+        domain = BitDomain(4, 5)
+        for _ in range(8):
+            domain.remove(rng.randrange(4), rng.randrange(5))
+
+        code = domain.first_unique_code()
+        exists = any(
+            all(domain.has(i, v) for i, v in enumerate(c))
+            for c in itertools.permutations(range(5), 4))
+        if not exists:
+            assert code is None
+        else:
+            assert len(set(code)) == 4
+            assert all(domain.has(i, v) for i, v in enumerate(code))
+
+
+@pytest.mark.parametrize("player_type", [Wordle_OptimalPlayer_norep, Wordle_NonOptimalPlayer_norep])
+def test_norep_players_solve_big_boards(player_type):
+    for seed in range(3):
+        rng = random.Random(seed)
+        rules = WordleRules(20, 30, secret=rng.sample(range(30), 20), allow_repetition=False)
+        player = player_type() if player_type is Wordle_OptimalPlayer_norep else player_type(rng=RandomGenerator(seed))
+        player.starting_game(rules, 0)
+        position = rules.first_position()
+        while not rules.finished(position) and len(position.guesses()) < 40:
+            position = rules.next_position(player.play(position), position)
+        assert rules.finished(position)
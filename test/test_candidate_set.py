@@ -0,0 +1,85 @@
+import random
+import numpy as np
+import pytest
+
+from IArena.utils.feedbacking import FeedbackType, all_codes, raw_feedback
+from IArena.utils.CandidateSet import CandidateSet, feedback_array
+from IArena.games.Mastermind import MastermindRules, MastermindMovement
+from IArena.games.Wordle import WordleRules, WordleMovement
+from IArena.games.DistanceWordle import DistanceWordleRules, DistanceWordleMovement
+
+
+GAMES = {
+    FeedbackType.Mastermind: (MastermindRules, MastermindMovement),
+    FeedbackType.Wordle: (WordleRules, WordleMovement),
+    FeedbackType.Distance: (DistanceWordleRules, DistanceWordleMovement),
+}
+
+
+def random_code(code_size, number_values, allow_repetition, rng):
+    if allow_repetition:
+        return [rng.randrange(number_values) for _ in range(code_size)]
+    return rng.sample(range(number_values), code_size)
+
+
+def play(feedback_type, code_size, number_values, allow_repetition, guesses, seed, **kwargs):
+    """Random game against the rules of the game, returning the candidate set and the secret."""
+    rng = random.Random(seed)
+    rules_type, movement_type = GAMES[feedback_type]
+    secret = random_code(code_size, number_values, allow_repetition, rng)
+    rules = rules_type(code_size, number_values, secret=secret, allow_repetition=allow_repetition)
+    candidates = CandidateSet(feedback_type, code_size, number_values, allow_repetition, seed=seed, **kwargs)
+
+    position = rules.first_position()
+    for _ in range(guesses):
+        guess = random_code(code_size, number_values, allow_repetition, rng)
+        position = rules.next_position(movement_type(guess=guess), position)
+        candidates.update(guess, feedback_array(feedback_type, position.last_feedback()))
+        assert secret in candidates
+        if rules.finished(position):
+            break
+
+    return candidates, secret
+
+
+@pytest.mark.parametrize("feedback_type", list(GAMES.keys()))
+@pytest.mark.parametrize("allow_repetition", [True, False])
+def test_materialized_equals_brute_force(feedback_type, allow_repetition):
+    for seed in range(5):
+        candidates, secret = play(feedback_type, 4, 6, allow_repetition, 3, seed)
+        assert candidates.is_materialized()
+
+        codes = all_codes(4, 6, allow_repetition)
+        mask = np.ones(len(codes), dtype=bool)
+        for guess, feedback in zip(candidates.guesses, candidates.feedback):
+            mask &= np.all(raw_feedback(feedback_type, guess, codes, 6)[0] == feedback, axis=-1)
+
+        assert candidates.size() == int(mask.sum())
+        assert np.array_equal(candidates.codes(), codes[mask])
+
+
+@pytest.mark.parametrize("feedback_type", list(GAMES.keys()))
+@pytest.mark.parametrize("allow_repetition", [True, False])
+def test_big_space_keeps_consistent_codes(feedback_type, allow_repetition):
+    for seed in range(3):
+        candidates, secret = play(
+            feedback_type, 8, 12, allow_repetition, 6, seed, max_materialized=1000, sampling_budget=1 << 13)
+
+        reservoir = candidates.codes()
+        assert len(reservoir) == len({tuple(c) for c in reservoir.tolist()})
+        for guess, feedback in zip(candidates.guesses, candidates.feedback):
+            assert np.all(raw_feedback(feedback_type, guess, reservoir, 12)[0] == feedback)
+        if candidates.is_materialized():
+            assert candidates.size() >= 1
+
+
+def test_space_bigger_than_int64_materializes_the_secret():
+    # 30 ** 20 codes, so the ranks do not fit in an int64
+    for seed in range(2):
+        candidates, secret = play(
+            FeedbackType.Wordle, 20, 30, True, 40, seed, max_materialized=1 << 18, sampling_budget=1 << 12)
+        assert candidates.is_materialized()
+        codes = candidates.codes()
+        assert np.any(np.all(codes == secret, axis=1))
+        for guess, feedback in zip(candidates.guesses, candidates.feedback):
+            assert np.all(raw_feedback(FeedbackType.Wordle, guess, codes, 30)[0] == feedback)
@@ -0,0 +1,59 @@
+import itertools
+import random
+import numpy as np
+import pytest
+
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.games.Mastermind import MastermindRules, MastermindMovement
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", [
+    (1, 3, True),
+    (3, 4, True),
+    (3, 5, False),
+    (4, 4, False),
+])
+def test_code_space_follows_itertools_order(code_size, number_values, allow_repetition):
+    space = CodeSpace(code_size, number_values, allow_repetition)
+    if allow_repetition:
+        expected = [list(x) for x in itertools.product(range(number_values), repeat=code_size)]
+    else:
+        expected = [list(x) for x in itertools.permutations(range(number_values), code_size)]
+
+    assert len(space) == len(expected)
+    assert list(space) == expected
+    assert [space[i] for i in range(len(space))] == expected
+    assert space[-1] == expected[-1]
+    assert [space.rank(code) for code in expected] == list(range(len(expected)))
+
+
+def test_code_space_membership_and_symbols():
+    space = CodeSpace(3, 4, False, symbols=['a', 'b', 'c', 'd'])
+    assert ['a', 'c', 'd'] in space
+    assert ['a', 'a', 'd'] not in space
+    assert ['a', 'e', 'd'] not in space
+    assert ['a', 'b'] not in space
+    assert space.unrank(space.rank(['d', 'b', 'a'])) == [3, 1, 0]
+
+
+def test_code_space_accepts_numpy_integers():
+    space = CodeSpace(3, 5, False)
+    guess = np.array([4, 0, 2])
+    assert guess in space and list(guess) in space
+    assert space.rank(guess) == space.rank([4, 0, 2])
+    assert type(space.code(guess)[0]) is int
+    assert np.array([4, 0, 5]) not in space
+    assert [True, 0, 2] not in space and [1.0, 0, 2] not in space
+
+
+def test_huge_code_space_is_lazy():
+    rules = MastermindRules(20, 30)
+    movements = rules.possible_movements(rules.first_position())
+
+    assert movements.size() == 30 ** 20
+    movement = movements.sample(random.Random(0))
+    assert isinstance(movement, MastermindMovement)
+    assert movement in movements
+    assert movements[movements.rank(movement)] == movement
+    assert rules.is_movement_possible(movement, rules.first_position())
+    assert MastermindMovement([30] * 20) not in movements
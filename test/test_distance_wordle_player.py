@@ -0,0 +1,19 @@
+import random
+import pytest
+
+from IArena.games.DistanceWordle import DistanceWordleRules
+from IArena.players.optimal_players import DistanceWordle_OptimalPlayer_norep
+
+
+@pytest.mark.parametrize("code_size, number_values", [(1, 10), (5, 8), (6, 6), (5, 23), (10, 16)])
+def test_distance_wordle_player_solves_norep_boards(code_size, number_values):
+    for seed in range(3):
+        rng = random.Random(seed)
+        rules = DistanceWordleRules(
+            code_size, number_values, secret=rng.sample(range(number_values), code_size), allow_repetition=False)
+        player = DistanceWordle_OptimalPlayer_norep(move_time_s=0.2, seed=seed)
+        player.starting_game(rules, 0)
+        position = rules.first_position()
+        while not rules.finished(position) and len(position.guesses()) < 12:
+            position = rules.next_position(player.play(position), position)
+        assert rules.finished(position)
@@ -0,0 +1,208 @@
+import itertools
+import pickle
+import random
+import numpy as np
+import pytest
+
+from IArena.utils.feedbacking import (
+    FeedbackType, all_codes, feedback_codes, mastermind_feedback, wordle_feedback, distance_feedback,
+    mastermind_code, positional_code, code_ranks)
+from IArena.utils.FeedbackTable import FeedbackTable
+from IArena.games.Mastermind import MastermindRules, MastermindMovement
+from IArena.games.ColorMastermind import ColorMastermindRules, ColorMastermindMovement, ColorMastermindRulesGenerator
+from IArena.games.Wordle import WordleRules, WordleMovement
+from IArena.games.LetterWordle import LetterWordleRules, LetterWordleMovement
+from IArena.games.VectorWordle import VectorWordleRules, VectorWordleMovement
+from IArena.games.DistanceWordle import DistanceWordleRules, DistanceWordleMovement
+
+
+CONFIGURATIONS = [
+    # code_size, number_values, allow_repetition
+    (1, 3, True),
+    (3, 4, True),
+    (4, 3, True),
+    (5, 8, True),
+    (3, 4, False),
+    (5, 8, False),
+    (6, 6, False),
+]
+
+
+def random_codes(code_size, number_values, allow_repetition, k, rng):
+    codes = []
+    for _ in range(k):
+        if allow_repetition:
+            codes.append([rng.randrange(number_values) for _ in range(code_size)])
+        else:
+            codes.append(rng.sample(range(number_values), code_size))
+    return codes
+
+
+def play_guesses(rules, movements):
+    position = rules.first_position()
+    for m in movements:
+        position = rules.next_position(m, position)
+    return position
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_mastermind_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 100 + number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng) + secrets[:2]
+
+    correct, misplaced = mastermind_feedback(guesses, secrets, number_values)
+    codes = feedback_codes(FeedbackType.Mastermind, guesses, secrets, number_values)
+
+    for c, secret in enumerate(secrets):
+        rules = MastermindRules(code_size, number_values, secret, allow_repetition)
+        position = play_guesses(rules, [MastermindMovement(g) for g in guesses])
+        for g, feedback in enumerate(position.feedback()):
+            assert correct[g, c] == feedback.correct
+            assert misplaced[g, c] == feedback.misplaced
+            assert codes[g, c] == mastermind_code(feedback.correct, feedback.misplaced, code_size)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_color_mastermind_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 200 + number_values)
+    colors = ColorMastermindRules.default_colors(number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng)
+
+    codes = feedback_codes(FeedbackType.Mastermind, guesses, secrets, number_values)
+
+    for c, secret in enumerate(secrets):
+        rules = ColorMastermindRules(
+            code_size=code_size,
+            possible_colors=colors,
+            number_values=number_values,
+            secret=[colors[x] for x in secret],
+            allow_repetition=allow_repetition)
+        position = play_guesses(rules, [ColorMastermindMovement([colors[x] for x in g]) for g in guesses])
+        for g, feedback in enumerate(position.feedback()):
+            assert codes[g, c] == mastermind_code(feedback.correct, feedback.misplaced, code_size)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_wordle_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 300 + number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng) + secrets[:2]
+
+    feedback_array = wordle_feedback(guesses, secrets, number_values)
+    codes = feedback_codes(FeedbackType.Wordle, guesses, secrets, number_values)
+
+    for c, secret in enumerate(secrets):
+        rules = WordleRules(code_size, number_values, secret, allow_repetition)
+        position = play_guesses(rules, [WordleMovement(g) for g in guesses])
+        for g, feedback in enumerate(position.feedback()):
+            values = [x.value for x in feedback]
+            assert list(feedback_array[g, c]) == values
+            assert codes[g, c] == positional_code(values, 3)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_letter_wordle_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 400 + number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng)
+
+    feedback_array = wordle_feedback(guesses, secrets, number_values)
+
+    def to_letters(code):
+        return [chr(ord('a') + x) for x in code]
+
+    for c, secret in enumerate(secrets):
+        rules = LetterWordleRules(code_size, number_values, to_letters(secret), allow_repetition)
+        position = play_guesses(rules, [LetterWordleMovement(to_letters(g)) for g in guesses])
+        for g, feedback in enumerate(position.feedback()):
+            assert list(feedback_array[g, c]) == [x.value for x in feedback]
+
+
+def test_symbol_games_convert_codes_at_the_boundary():
+    colors = ColorMastermindRules(3, number_values=5, secret=['red', 'blue', 'green'])
+    assert colors.to_values(['green', 'red', 'blue']) == [2, 0, 1]
+    assert colors.to_colors([2, 0, 1]) == ['green', 'red', 'blue']
+    assert colors.possible_colors() is not colors.possible_colors()
+
+    generated = ColorMastermindRulesGenerator().generate({'n': 3, 'm': 5, 'secret': [0, 1, 2]})
+    position = play_guesses(generated, [ColorMastermindMovement(['red', 'blue', 'green'])])
+    assert generated.finished(position)
+
+    letters = LetterWordleRules(3, 5, secret=['a', 'c', 'e'])
+    assert letters.to_values(['e', 'a']) == [4, 0]
+    assert letters.to_letters([4, 0]) == ['e', 'a']
+    position = play_guesses(letters, [LetterWordleMovement(['a', 'c', 'e'])])
+    assert letters.finished(position)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_vector_wordle_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 500 + number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng)
+
+    feedback_array = wordle_feedback(guesses, secrets, number_values)
+
+    for c, secret in enumerate(secrets):
+        rules = VectorWordleRules(code_size, number_values, secret, allow_repetition)
+        position = play_guesses(rules, [VectorWordleMovement(g) for g in guesses])
+        for g, (positive, misplaced) in enumerate(zip(position.positive_feedback(), position.misplaced_feedback())):
+            assert sorted(np.nonzero(feedback_array[g, c] == 2)[0].tolist()) == sorted(positive)
+            assert sorted(np.nonzero(feedback_array[g, c] == 1)[0].tolist()) == sorted(misplaced)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_distance_wordle_feedback_matches_rules(code_size, number_values, allow_repetition):
+    rng = random.Random(code_size * 600 + number_values)
+    secrets = random_codes(code_size, number_values, allow_repetition, 10, rng)
+    guesses = random_codes(code_size, number_values, allow_repetition, 15, rng) + secrets[:2]
+
+    feedback_array = distance_feedback(guesses, secrets, number_values)
+    codes = feedback_codes(FeedbackType.Distance, guesses, secrets, number_values)
+
+    for c, secret in enumerate(secrets):
+        rules = DistanceWordleRules(code_size, number_values, secret, allow_repetition)
+        position = play_guesses(rules, [DistanceWordleMovement(g) for g in guesses])
+        for g, feedback in enumerate(position.feedback()):
+            assert list(feedback_array[g, c]) == feedback
+            assert codes[g, c] == positional_code(feedback, code_size + 1)
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_all_codes_follows_possible_movements_order(code_size, number_values, allow_repetition):
+    codes = all_codes(code_size, number_values, allow_repetition)
+    if allow_repetition:
+        expected = list(itertools.product(range(number_values), repeat=code_size))
+    else:
+        expected = list(itertools.permutations(range(number_values), code_size))
+    assert [tuple(c) for c in codes.tolist()] == expected
+
+
+@pytest.mark.parametrize("code_size, number_values, allow_repetition", CONFIGURATIONS)
+def test_code_ranks_inverse_of_all_codes(code_size, number_values, allow_repetition):
+    codes = all_codes(code_size, number_values, allow_repetition)
+    assert code_ranks(codes, number_values, allow_repetition).tolist() == list(range(len(codes)))
+
+
+@pytest.mark.parametrize("feedback_type", list(FeedbackType))
+def test_feedback_table_matches_kernel(feedback_type, tmp_path):
+    code_size, number_values, allow_repetition = 4, 5, False
+    table = FeedbackTable(feedback_type, code_size, number_values, allow_repetition, directory=str(tmp_path))
+    codes = all_codes(code_size, number_values, allow_repetition)
+
+    assert np.array_equal(table.table, feedback_codes(feedback_type, codes, codes, number_values))
+    assert table.feedback(codes[7], codes[3]) == table.table[7, 3]
+    assert not table.table.flags.writeable
+
+    # Opening it again maps the existing file and pickling does not copy the table
+    reopened = pickle.loads(pickle.dumps(table))
+    assert reopened.path == table.path
+    assert np.array_equal(reopened.row(codes[11]), table.table[11])
+
+
+def test_feedback_table_too_big_raises_before_listing_codes(tmp_path):
+    for code_size, number_values in ((8, 10), (20, 30)):
+        with pytest.raises(ValueError):
+            FeedbackTable(FeedbackType.Mastermind, code_size, number_values, directory=str(tmp_path))
@@ -0,0 +1,53 @@
+import random
+
+from IArena.games.Hanoi import HanoiRules, HanoiRulesGenerator, HanoiPosition, HanoiMovement, frame_stewart_moves
+from IArena.players.optimal_players import Hanoi_OptimalPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def random_position(rules, seed, moves=30):
+    generator = random.Random(seed)
+    position = rules.first_position()
+    for _ in range(moves):
+        position = rules.next_position(generator.choice(rules.possible_movements(position)), position)
+    return position
+
+
+def test_moves_do_not_change_previous_positions():
+    rules = HanoiRules(3)
+    position = rules.first_position()
+    following = rules.next_position(HanoiMovement(0, 2), position)
+    assert position.towers == [[0, 1, 2], [], []]
+    assert following.towers == [[0, 1], [], [2]]
+    assert not rules.is_movement_possible(HanoiMovement(0, 2), following)
+
+    back = rules.next_position(HanoiMovement(2, 0), following)
+    assert back.key() == position.key() and hash(back) == hash(position)
+    assert back != position and back == HanoiPosition(rules, [[0, 1, 2], [], []], 2)
+
+
+def test_frame_stewart_is_minimum_with_four_towers():
+    assert [frame_stewart_moves(n, 3) for n in range(1, 6)] == [1, 3, 7, 15, 31]
+    assert [frame_stewart_moves(n, 4) for n in range(1, 9)] == [1, 3, 5, 9, 13, 17, 25, 33]
+    for n in range(1, 7):
+        rules = HanoiRules(n, towers=4)
+        assert rules.minimum_moves() == len(rules._search(rules.first_position(), 1 << 20))
+
+
+def test_minimum_moves_from_any_position():
+    for towers in (3, 4):
+        rules = HanoiRules(5, towers=towers)
+        for seed in range(10):
+            position = random_position(rules, seed)
+            expected = len(rules._search(position, 1 << 20))
+            assert rules.minimum_moves(position) == expected
+            for movement in rules.solution(position):
+                position = rules.next_position(movement, position)
+            assert rules.finished(position)
+
+
+def test_optimal_player_scores_minimum_moves():
+    for configuration in ({'n': 6}, {'n': 7, 'towers': 4}, {'pieces': 5, 'pegs': 5}):
+        rules = HanoiRulesGenerator().generate(configuration)
+        score = GenericGame(rules, [Hanoi_OptimalPlayer()]).play()[0]
+        assert score == rules.minimum_moves()
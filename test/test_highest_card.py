@@ -0,0 +1,72 @@
+import itertools
+import numpy as np
+import pytest
+
+from IArena.games.HighestCard import HighestCardRules, HighestCardMovement, bet_score
+from IArena.utils.HighestCardAdvisor import HighestCardAdvisor
+from IArena.players.optimal_players import HighestCard_OptimalPlayer
+from IArena.players.dummy_players import FirstPlayer, LastPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def test_bets_share_the_cards():
+    rules = HighestCardRules(cards_distribution={0: [5, 0], 1: [1, 4], 2: [3, 2]})
+    position = rules.first_position()
+    first = position
+    for bet in (1, 0, 2):
+        assert position.get_rules() is rules
+        position = rules.next_position(HighestCardMovement(bet), position)
+        assert position.cards_ is first.cards_
+
+    assert rules.finished(position)
+    # Round of the lowest cards (0, 1, 2) and of the highest ones (5, 4, 3)
+    assert rules.round_wins() == (1, 0, 1)
+    assert rules.score(position).score == [-5, -5, 2]
+    assert first.get_cards() == [0, 5]
+
+
+def test_exact_probabilities_match_every_deal():
+    hand = [2, 6, 9, 11]
+    rest = [c for c in range(12) if c not in hand]
+    counts = np.zeros(5)
+    for cards in itertools.combinations(rest, 4):
+        others = [c for c in rest if c not in cards]
+        counts[sum(hand[k] > max(cards[k], others[k]) for k in range(4))] += 1
+
+    advisor = HighestCardAdvisor(3, 4)
+    assert advisor.method == HighestCardAdvisor.Exact
+    assert np.allclose(advisor.win_probabilities(hand), counts / counts.sum())
+
+    monte_carlo = HighestCardAdvisor(3, 4, samples=50000, seed=0, method=HighestCardAdvisor.MonteCarlo)
+    assert np.allclose(monte_carlo.win_probabilities(hand), counts / counts.sum(), atol=0.01)
+
+    expected = [sum(p * bet_score(bet, wins) for wins, p in enumerate(counts / counts.sum())) for bet in range(5)]
+    assert np.allclose(advisor.expected_scores(hand), expected)
+    assert advisor.best_bet(hand) == 4
+
+
+def test_optimal_player_beats_fixed_bets():
+    totals = np.zeros(3)
+    for seed in range(40):
+        rules = HighestCardRules(n_players=3, m_cards=4, seed=seed)
+        players = [HighestCard_OptimalPlayer(), FirstPlayer(), LastPlayer()]
+        totals += GenericGame(rules, players).play().score
+    assert totals[0] < totals[1] and totals[0] < totals[2]
+
+
+def test_advisor_uses_ranks_of_any_deck():
+    rules = HighestCardRules(cards_distribution={0: [10, 20, 30], 1: [5, 15, 25], 2: [1, 2, 3]})
+    assert rules.deck() == (1, 2, 3, 5, 10, 15, 20, 25, 30)
+
+    canonical = HighestCardAdvisor(3, 3)
+    for method in (HighestCardAdvisor.Exact, HighestCardAdvisor.MonteCarlo):
+        advisor = HighestCardAdvisor(3, 3, samples=50000, seed=0, method=method, deck=rules.deck())
+        # Same ranks as the cards 4, 6 and 8 of the deck from 0 to 8
+        assert np.allclose(advisor.win_probabilities([10, 20, 30]), canonical.win_probabilities([4, 6, 8]), atol=0.01)
+
+    player = HighestCard_OptimalPlayer()
+    player.starting_game(rules, 0)
+    assert player.play(rules.first_position()) == HighestCardMovement(canonical.best_bet([4, 6, 8]))
+
+    with pytest.raises(ValueError):
+        HighestCardAdvisor(3, 3, deck=rules.deck()).win_probabilities([10, 20, 31])
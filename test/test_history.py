@@ -0,0 +1,42 @@
+import copy
+import pickle
+
+from IArena.utils.History import PersistentHistory
+from IArena.games.Mastermind import MastermindRules, MastermindMovement
+
+
+def test_history_append_shares_parent():
+    empty = PersistentHistory()
+    a = empty.append(1)
+    b = a.append(2)
+    c = a.append(3)
+
+    assert len(empty) == 0 and empty.last() is None
+    assert list(a) == [1]
+    assert list(b) == [1, 2] and list(c) == [1, 3]
+    assert b[0] == 1 and b[-1] == 2 and b.last() == 2
+    assert b != c
+    assert b == PersistentHistory([1, 2]) == [1, 2]
+    assert PersistentHistory.of(b) is b
+
+
+def test_long_history_copies_without_recursion():
+    history = PersistentHistory(range(5000))
+    assert copy.deepcopy(history) == history
+    assert pickle.loads(pickle.dumps(history)) == history
+
+
+def test_positions_share_history():
+    rules = MastermindRules(4, 6, secret=[0, 1, 2, 3])
+    position = rules.first_position()
+    for guess in ([0, 0, 0, 0], [1, 1, 1, 1], [0, 1, 2, 2]):
+        parent = position
+        position = rules.next_position(MastermindMovement(guess), position)
+
+    assert [m.guess for m in position.guesses()] == [[0, 0, 0, 0], [1, 1, 1, 1], [0, 1, 2, 2]]
+    assert len(parent.guesses()) == 2
+    assert position.last_feedback().correct == 3
+    # Accessors return copies, so modifying them does not change the position
+    position.guesses().append(MastermindMovement([3, 3, 3, 3]))
+    assert len(position.guesses()) == 3
+    assert rules.score(position).score[0] == -3
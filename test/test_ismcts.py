@@ -0,0 +1,50 @@
+import random
+
+from IArena.games.HighestCard import HighestCardRules, HighestCardMovement
+from IArena.games.PrisonerDilemma import PrisonerDilemmaRules, PrisonerDilemmaMovement, PrisonerDilemmaScoreTable
+from IArena.games.IteratedPrisonerDilemma import IteratedPrisonerDilemmaRules
+from IArena.players.ismcts_players import ISMCTSPlayer
+
+
+def test_determinize_deals_hidden_cards_again():
+    rules = HighestCardRules(cards_distribution={0: [0, 4, 8], 1: [1, 5, 9], 2: [2, 6, 10], 3: [3, 7, 11]})
+    position = rules.next_position(HighestCardMovement(2), rules.first_position())
+    rng = random.Random(0)
+
+    deals = set()
+    for _ in range(20):
+        determinized = rules.determinize(position, 1, rng)
+        assert determinized.get_cards() == [1, 5, 9]
+        assert determinized.bets_ == position.bets_
+        assert sorted(c for cards in determinized.cards_ for c in cards) == list(range(12))
+        deals.add(determinized.cards_)
+    assert len(deals) > 1
+
+
+def test_determinize_hides_decision_of_first_player():
+    for rules in (PrisonerDilemmaRules(seed=0), IteratedPrisonerDilemmaRules(seed=0, rounds=3)):
+        position = rules.next_position(PrisonerDilemmaMovement(1), rules.first_position())
+        rng = random.Random(0)
+        assert rules.determinize(position, 0, rng) == position
+        decisions = set()
+        for _ in range(20):
+            determinized = rules.determinize(position, 1, rng)
+            final = rules.next_position(PrisonerDilemmaMovement(0), determinized)
+            decisions.add(tuple(rules.score(final).score))
+        assert len(decisions) == 2
+
+
+def test_ismcts_bets_all_rounds_with_highest_cards():
+    rules = HighestCardRules(cards_distribution={0: [8, 9, 10, 11], 1: [0, 2, 4, 6], 2: [1, 3, 5, 7]})
+    player = ISMCTSPlayer(move_time_s=None, iterations=300, processes=2, minimize=True, seed=0)
+    player.starting_game(rules, 0)
+    assert player.play(rules.first_position()) == HighestCardMovement(4)
+
+
+def test_ismcts_defects_without_knowing_the_other_decision():
+    rules = PrisonerDilemmaRules(PrisonerDilemmaScoreTable.classic_table())
+    player = ISMCTSPlayer(move_time_s=None, iterations=200, processes=1, minimize=True, seed=0)
+    for first in (0, 1):
+        player.starting_game(rules, 1)
+        position = rules.next_position(PrisonerDilemmaMovement(first), rules.first_position())
+        assert player.play(position).is_defect()
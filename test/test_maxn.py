@@ -0,0 +1,81 @@
+import random
+
+from IArena.games.Coins import CoinsRules
+from IArena.players.minimax_players import MaxNPlayer, MaxNCachePlayer, MinimaxPrunePlayer
+
+
+def maxn(position):
+    """Score of each player with every player maximizing its own, without pruning."""
+    rules = position.get_rules()
+    if rules.finished(position):
+        board = rules.score(position)
+        return [board.score[p] if p < len(board.score) else 0 for p in range(rules.n_players())]
+    player = position.next_player()
+    best = None
+    for move in rules.possible_movements(position):
+        score = maxn(rules.next_position(move, position))
+        if best is None or score[player] > best[player]:
+            best = score
+    return best
+
+
+def best_movement(position):
+    rules = position.get_rules()
+    movements = rules.possible_movements(position)
+    scores = [maxn(rules.next_position(move, position))[position.next_player()] for move in movements]
+    return movements[scores.index(max(scores))]
+
+
+def random_coins(seed, n_players, coins=(6, 10)):
+    generator = random.Random(seed)
+    coins = [generator.randint(0, 5) for _ in range(generator.randint(*coins))]
+    return CoinsRules(initial_position=coins, min_play=1, max_play=3, n_players=n_players), sum(coins)
+
+
+def test_shallow_pruning_keeps_maxn_movement():
+    for seed in range(10):
+        rules, total = random_coins(seed, 3)
+        position = rules.first_position()
+        expected = best_movement(position)
+        for player in (MaxNPlayer(), MaxNPlayer(max_score=total / 2, max_sum=total / 2), MaxNCachePlayer()):
+            player.starting_game(rules, 0)
+            assert player.play(position) == expected
+
+
+def test_shallow_pruning_with_negative_scores():
+    # Every player moves, so each one scores what it took minus half the total, and they sum a constant
+    for seed in range(40):
+        n_players = 3 + seed % 2
+        rules, total = random_coins(seed, n_players, coins=(10, 12))
+        position = rules.first_position()
+        player = MaxNPlayer(
+            max_score=total / 2, min_score=-total / 2, max_sum=total - n_players * total / 2)
+        player.starting_game(rules, 0)
+        assert player.play(position) == best_movement(position)
+
+
+def test_paranoid_matches_minimax_with_two_players():
+    for seed in range(10):
+        rules, _ = random_coins(seed, 2)
+        position = rules.first_position()
+        minimax = MinimaxPrunePlayer()
+        rules_movements = rules.possible_movements(position)
+        scores = [minimax.minimax(rules.next_position(move, position)) for move in rules_movements]
+        expected = rules_movements[scores.index(max(scores))]
+        for player in (MaxNPlayer(mode=MaxNPlayer.Paranoid), MaxNCachePlayer(mode=MaxNPlayer.Paranoid)):
+            player.starting_game(rules, 0)
+            assert player.play(position) == expected
+
+
+def test_iterative_deepening_finishes_small_games():
+    rules, _ = random_coins(0, 3)
+    position = rules.first_position()
+    player = MaxNCachePlayer(move_time_s=5.0)
+    player.starting_game(rules, 0)
+    assert player.play(position) == best_movement(position)
+
+    # Without time to finish, it plays the best movement of the deepest search
+    rules = CoinsRules(initial_position_last_coin=60, n_players=4)
+    player = MaxNCachePlayer(mode=MaxNPlayer.Paranoid, move_time_s=0.05)
+    player.starting_game(rules, 0)
+    assert player.play(rules.first_position()) in rules.possible_movements(rules.first_position())
@@ -0,0 +1,87 @@
+import random
+import pytest
+
+from IArena.interfaces.IGameRules import IGameRules
+from IArena.utils.CodeSpace import CodeSpace
+from IArena.games.Coins import CoinsRules
+from IArena.games.Nim import NimRules
+from IArena.games.NumberGuess import NumberGuessRules
+from IArena.games.TicTacToe import TicTacToeRules
+from IArena.games.Connect4 import Connect4Rules
+from IArena.games.NQueens import NQueensRules
+from IArena.games.Hanoi import HanoiRules
+from IArena.games.HighestCard import HighestCardRules
+from IArena.games.PrisonerDilemma import PrisonerDilemmaRules
+from IArena.games.IteratedPrisonerDilemma import IteratedPrisonerDilemmaRules
+from IArena.games.SSP import SSPRules
+from IArena.games.SlicingPuzzle import SlicingPuzzleRules
+from IArena.games.FieldWalk import FieldWalkRules
+from IArena.games.BlindWalk import BlindWalkRules, BlindWalkMap, BlindWalkCoordinate
+from IArena.games.CompassBlindWalk import CompassBlindWalkRules, CompassBlindWalkMap, CompassBlindWalkCoordinate
+from IArena.games.Mastermind import MastermindRules, MastermindMovement
+from IArena.games.Wordle import WordleRules
+from IArena.games.VectorWordle import VectorWordleRules
+from IArena.games.DistanceWordle import DistanceWordleRules
+from IArena.games.LetterWordle import LetterWordleRules
+from IArena.games.ColorMastermind import ColorMastermindRules
+
+
+WALK_MAP = [
+    [True, True, False, True],
+    [False, True, True, True],
+    [True, True, False, True],
+    [True, False, True, True],
+]
+
+RULES = {
+    'Coins': lambda: CoinsRules(initial_position_last_coin=12),
+    'Nim': lambda: NimRules(),
+    'NumberGuess': lambda: NumberGuessRules(number_values=20),
+    'TicTacToe': lambda: TicTacToeRules(),
+    'Connect4': lambda: Connect4Rules(),
+    'NQueens': lambda: NQueensRules(5),
+    'Hanoi': lambda: HanoiRules(4),
+    'HighestCard': lambda: HighestCardRules(seed=0),
+    'PrisonerDilemma': lambda: PrisonerDilemmaRules(seed=0),
+    'IteratedPrisonerDilemma': lambda: IteratedPrisonerDilemmaRules(seed=0, rounds=10),
+    'SSP': lambda: SSPRules(coins=[3, 5, 7, 11, 13], target=100),
+    'SlicingPuzzle': lambda: SlicingPuzzleRules(n=3, seed=0),
+    'FieldWalk': lambda: FieldWalkRules(rows=4, cols=5, seed=0),
+    'BlindWalk': lambda: BlindWalkRules(BlindWalkMap(WALK_MAP), BlindWalkCoordinate(3, 3)),
+    'CompassBlindWalk': lambda: CompassBlindWalkRules(CompassBlindWalkMap(WALK_MAP), CompassBlindWalkCoordinate(3, 3)),
+    'Mastermind': lambda: MastermindRules(3, 4),
+    'Wordle': lambda: WordleRules(3, 4, allow_repetition=False),
+    'VectorWordle': lambda: VectorWordleRules(3, 4),
+    'DistanceWordle': lambda: DistanceWordleRules(3, 4, allow_repetition=False),
+    'LetterWordle': lambda: LetterWordleRules(3, 4),
+    'ColorMastermind': lambda: ColorMastermindRules(3, number_values=4, allow_repetition=False),
+}
+
+
+@pytest.mark.parametrize("game", list(RULES.keys()))
+def test_is_movement_possible_matches_possible_movements(game):
+    rng = random.Random(0)
+    rules = RULES[game]()
+
+    # Play randomly, and check at every position every movement seen along the game
+    position = rules.first_position()
+    positions = [position]
+    seen_movements = []
+    for _ in range(30):
+        if rules.finished(position):
+            break
+        movements = list(rules.possible_movements(position))
+        seen_movements.extend(m for m in movements if m not in seen_movements)
+        position = rules.next_position(rng.choice(movements), position)
+        positions.append(position)
+
+    if game == 'Mastermind':
+        seen_movements.append(MastermindMovement([0, 4, 1]))
+
+    for position in positions:
+        for movement in seen_movements:
+            expected = IGameRules.is_movement_possible(rules, movement, position)
+            if isinstance(rules.possible_movements(position), CodeSpace):
+                expected = movement in list(rules.possible_movements(position))
+            assert rules.is_movement_possible(movement, position) == expected, \
+                f'{game}: {movement} at {position}'
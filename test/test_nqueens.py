@@ -0,0 +1,49 @@
+import random
+
+from IArena.games.NQueens import NQueensRules, NQueensMovement, NQueensPosition
+from IArena.utils.NQueensSolver import NQueensSolver, board_attacks
+from IArena.players.optimal_players import NQueens_OptimalPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def pairwise_attacks(queens):
+    """Score as defined by the game, going through every pair of queens."""
+    attacks = 0
+    for x, y in queens:
+        for x2, y2 in queens:
+            if not (x == x2 and y == y2):
+                attacks += (x == x2) + (y == y2) + (abs(x - x2) == abs(y - y2))
+    return attacks
+
+
+def test_attacks_updated_with_each_queen():
+    generator = random.Random(0)
+    for n in range(1, 7):
+        rules = NQueensRules(n)
+        position = rules.first_position()
+        for _ in range(2 * n):
+            previous = position
+            position = rules.next_position(NQueensMovement((generator.randrange(n), generator.randrange(n))), position)
+            assert len(previous) == len(position) - 1
+            assert rules.score(position)[0] == pairwise_attacks(position.positions)
+            assert NQueensPosition(rules, position.positions).attacks() == position.attacks()
+
+
+def test_backtracking_finds_every_solution():
+    assert [NQueensSolver(n).count_solutions() for n in range(1, 10)] == [1, 0, 0, 2, 10, 4, 40, 92, 352]
+    assert NQueensSolver(3).backtracking() is None
+    for n in (1, 4, 8, 13):
+        assert board_attacks(NQueensSolver(n).backtracking()) == 0
+
+
+def test_min_conflicts_solves_large_boards():
+    for n in (4, 7, 50):
+        for seed in range(5):
+            assert board_attacks(NQueensSolver(n, seed).min_conflicts()) == 0
+    assert board_attacks(NQueensSolver(2000, 0).min_conflicts()) == 0
+
+
+def test_optimal_player_places_queens_without_attacks():
+    for n, expected in ((3, 2), (8, 0), (60, 0)):
+        rules = NQueensRules(n)
+        assert GenericGame(rules, [NQueens_OptimalPlayer(seed=0)]).play()[0] == expected
@@ -0,0 +1,32 @@
+import random
+import pytest
+
+from IArena.games.Mastermind import MastermindRules
+from IArena.players.optimal_players import Mastermind_PartitionPlayer
+
+
+def play_game(rules, player, max_guesses):
+    player.starting_game(rules, 0)
+    position = rules.first_position()
+    while not rules.finished(position) and len(position.guesses()) < max_guesses:
+        position = rules.next_position(player.play(position), position)
+    return position
+
+
+@pytest.mark.parametrize("criterion", Mastermind_PartitionPlayer.Criteria)
+@pytest.mark.parametrize("allow_repetition", [True, False])
+def test_partition_player_solves_small_boards(criterion, allow_repetition):
+    for seed in range(3):
+        rng = random.Random(seed)
+        secret = [rng.randrange(6) for _ in range(4)] if allow_repetition else rng.sample(range(6), 4)
+        rules = MastermindRules(4, 6, secret=secret, allow_repetition=allow_repetition)
+        position = play_game(rules, Mastermind_PartitionPlayer(criterion=criterion, seed=seed), 8)
+        assert rules.finished(position)
+
+
+def test_partition_player_solves_big_boards():
+    rng = random.Random(0)
+    secret = [rng.randrange(12) for _ in range(8)]
+    rules = MastermindRules(8, 12, secret=secret)
+    position = play_game(rules, Mastermind_PartitionPlayer(move_time_s=0.2, seed=0), 40)
+    assert rules.finished(position)
@@ -0,0 +1,72 @@
+import heapq
+import numpy as np
+
+from IArena.utils.pathfinding import cost_to_go, minimum_costs, optimal_path
+from IArena.games.FieldWalk import FieldWalkMap, FieldWalkRules, FieldWalkRulesGenerator
+from IArena.players.optimal_players import FieldWalk_OptimalPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def dijkstra(costs, start, target):
+    rows, cols = costs.shape
+    distances = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        d, (x, y) = heapq.heappop(queue)
+        if (x, y) == target:
+            return d
+        if d > distances[(x, y)]:
+            continue
+        for v in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= v[0] < rows and 0 <= v[1] < cols and d + costs[v] < distances.get(v, float('inf')):
+                distances[v] = d + costs[v]
+                heapq.heappush(queue, (distances[v], v))
+
+
+def test_batch_costs_equal_dijkstra():
+    costs = FieldWalkMap.random_squares(9, 13, seed=1, maps=40)
+    best = minimum_costs(costs, start=(2, 3), target=(8, 0))
+    for i in range(40):
+        assert best[i] == dijkstra(costs[i], (2, 3), (8, 0))
+    assert np.array_equal(cost_to_go(costs)[5], cost_to_go(costs[5]))
+
+
+def test_winding_corridor_equals_dijkstra():
+    # Rows joined at alternate ends, so the optimal path turns more times than the sweeps allowed
+    costs = np.full((81, 30), 1000, dtype=np.int64)
+    costs[::2, :] = 1
+    costs[1::4, -1] = costs[3::4, 0] = 1
+    field = cost_to_go(costs, target=(80, 29))
+    batch = cost_to_go(np.stack([costs, FieldWalkMap.random_squares(81, 30, seed=3)]), target=(80, 29))
+    assert field[0, 0] == dijkstra(costs, (0, 0), (80, 29)) == 40 * 31 + 29
+    assert np.array_equal(batch[0], field) and field.dtype == np.int64
+
+
+def test_optimal_path_has_the_minimum_cost():
+    costs = FieldWalkMap.random_squares(12, 7, seed=2)
+    cost, path = optimal_path(costs)
+    assert path[0] == (0, 0) and path[-1] == (11, 6)
+    assert cost == sum(costs[v] for v in path[1:]) == dijkstra(costs, (0, 0), (11, 6))
+
+
+def test_optimal_path_with_zero_costs():
+    assert optimal_path(np.array([[0, 0], [0, 0]])) == (0, [(0, 0), (1, 0), (1, 1)])
+
+    costs = FieldWalkMap.random_squares(10, 12, seed=4)
+    costs[costs < np.median(costs)] = 0
+    cost, path = optimal_path(costs, start=(9, 0), target=(0, 11))
+    assert len(set(path)) == len(path)
+    assert cost == sum(costs[v] for v in path[1:]) == dijkstra(costs, (9, 0), (0, 11))
+
+
+def test_optimal_player_scores_the_minimum_cost():
+    for seed in range(5):
+        rules = FieldWalkRulesGenerator().generate({'rows': 8, 'cols': 11, 'seed': seed})
+        score = GenericGame(rules, [FieldWalk_OptimalPlayer(name='optimal')]).play()[0]
+        assert score == rules.minimum_cost() == dijkstra(rules.get_map().squares, (0, 0), (7, 10))
+
+
+def test_map_from_lists():
+    map = FieldWalkMap([[1, 3], [2, 9]])
+    assert map.size() == (2, 2) and map.goal() == (1, 1) and map[1, 0] == 2
+    assert FieldWalkRules(initial_map=map).minimum_cost() == 11
@@ -0,0 +1,55 @@
+import io
+import json
+import numpy as np
+
+from IArena.games.PrisonerDilemma import PrisonerDilemmaScoreTable
+from IArena.players.prisoner_players import Cooperator, Defector, TitForTat, classic_strategies
+from IArena.arena.PrisonerTournament import IteratedPrisonerTournament
+from IArena.arena.PopulationDynamics import PopulationDynamics, random_tables
+
+
+def test_payoffs_match_tournament_of_each_table():
+    strategies = classic_strategies()
+    dynamics = PopulationDynamics(strategies, rounds=50, noise=0.05, seed=3)
+    tables = random_tables([1, 2]) + [PrisonerDilemmaScoreTable.classic_table()]
+    payoffs = dynamics.payoffs(tables)
+    for table, payoff in zip(tables, payoffs):
+        expected = IteratedPrisonerTournament(strategies, table, rounds=50, noise=0.05, seed=3).play()
+        assert np.allclose(payoff, expected)
+
+
+def test_replicator_defectors_take_cooperators():
+    dynamics = PopulationDynamics([Cooperator(), Defector()], rounds=10)
+    tables = random_tables(range(5))
+    last = list(dynamics.evolve(tables, generations=200, processes=1))[-1]
+    assert last['generation'] == 200
+    assert last['mean_share']['Defector'] > 0.99
+    assert last['dominant'] == {'Cooperator': 0, 'Defector': 5}
+
+
+def test_moran_keeps_population_and_is_reproducible():
+    dynamics = PopulationDynamics([Cooperator(), Defector(), TitForTat()], rounds=20, seed=7)
+    tables = random_tables(range(6))
+
+    runs = []
+    for _ in range(2):
+        stream = io.StringIO()
+        dynamics.write(
+            stream, tables, generations=7, dynamics=PopulationDynamics.Moran, population=30, processes=1, block=3)
+        runs.append([json.loads(line) for line in stream.getvalue().splitlines()])
+
+    assert runs[0] == runs[1]
+    assert [summary['generation'] for summary in runs[0]] == list(range(1, 8))
+    for summary in runs[0]:
+        assert np.isclose(sum(summary['mean_share'].values()), 1)
+        assert sum(summary['dominant'].values()) == len(tables)
+
+
+def test_parallel_chunks_match_single_process():
+    dynamics = PopulationDynamics(classic_strategies(), rounds=30, seed=0)
+    tables = random_tables(range(9))
+    single = list(dynamics.evolve(tables, generations=20, processes=1))
+    parallel = list(dynamics.evolve(tables, generations=20, processes=2, block=8))
+    assert [s['dominant'] for s in single] == [s['dominant'] for s in parallel]
+    for s, p in zip(single, parallel):
+        assert np.allclose(list(s['mean_share'].values()), list(p['mean_share'].values()))
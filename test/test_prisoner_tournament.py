@@ -0,0 +1,59 @@
+import numpy as np
+
+from IArena.games.PrisonerDilemma import PrisonerDilemmaMovement, PrisonerDilemmaScoreTable
+from IArena.games.IteratedPrisonerDilemma import IteratedPrisonerDilemmaRules, IteratedPrisonerDilemmaRulesGenerator
+from IArena.players.prisoner_players import (
+    PrisonerStrategyPlayer, TitForTat, SuspiciousTitForTat, Pavlov, Alternator, Grudger, Defector, classic_strategies,
+    PrisonerStrategy, SoftMajority, HardMajority)
+from IArena.arena.PrisonerTournament import IteratedPrisonerTournament
+from IArena.arena.GenericGame import GenericGame
+
+
+def test_position_keeps_history_of_both_players():
+    rules = IteratedPrisonerDilemmaRules(PrisonerDilemmaScoreTable.classic_table(), rounds=3)
+    position = rules.first_position()
+    for first, second in ((0, 1), (1, 1), (0, 0)):
+        position = rules.next_position(PrisonerDilemmaMovement(first), position)
+        # The decision of the first player is not in the history until the round ends
+        assert len(position.history(0)) == position.rounds()
+        position = rules.next_position(PrisonerDilemmaMovement(second), position)
+    assert rules.finished(position)
+    assert position.history(0).tolist() == [0, 1, 0]
+    assert position.history(1).tolist() == [1, 1, 0]
+    assert rules.score(position).score == [5 + 4 + 2, 0 + 4 + 2]
+
+
+def test_tournament_matches_games_between_players():
+    strategies = [TitForTat(), SuspiciousTitForTat(), Pavlov(), Alternator(), Grudger(), Defector()]
+    rules = IteratedPrisonerDilemmaRulesGenerator().generate({'rounds': 40, 'classic': True})
+    results = IteratedPrisonerTournament(strategies, rounds=40).play()
+
+    for i, first in enumerate(strategies):
+        for j, second in enumerate(strategies):
+            players = [PrisonerStrategyPlayer(first), PrisonerStrategyPlayer(second)]
+            score = GenericGame(rules, players).play()
+            if i != j:
+                assert np.isclose(results[i, j], score.score[0] / 40)
+                assert np.isclose(results[j, i], score.score[1] / 40)
+
+
+class _HistoryMajority(PrisonerStrategy):
+    """SoftMajority over the whole history, without the defections counted by the tournament."""
+
+    def decide(self, own, other, rng):
+        return (2 * other.sum(axis=1) > other.shape[1]).astype(np.int8)
+
+
+def test_counted_defections_equal_the_history():
+    def outcomes(majority):
+        strategies = [majority, HardMajority(), Grudger(), Alternator(), TitForTat()]
+        return IteratedPrisonerTournament(strategies, rounds=150, repetitions=3, noise=0.1, seed=4).outcomes()
+    assert np.array_equal(outcomes(SoftMajority()), outcomes(_HistoryMajority()))
+
+
+def test_tournament_ranks_every_strategy():
+    tournament = IteratedPrisonerTournament(classic_strategies(), rounds=500, repetitions=2, noise=0.01, seed=0)
+    ranking = tournament.ranking()
+    assert sorted(name for name, _ in ranking) == sorted(tournament.names())
+    assert [score for _, score in ranking] == sorted(score for _, score in ranking)
+    assert ranking[-1][0] != 'TitForTat'
@@ -0,0 +1,31 @@
+from IArena.grader.SecretSweep import sample_ranks, sweep
+from IArena.players.optimal_players import NumberGuess_OptimalPlayer, Wordle_OptimalPlayer_norep
+
+
+def test_sample_ranks_stratified():
+    assert sample_ranks(10) == list(range(10))
+    assert sample_ranks(10, max_secrets=20) == list(range(10))
+
+    ranks = sample_ranks(1000, max_secrets=10, seed=3)
+    assert len(ranks) == 10
+    assert all(100 * k <= r < 100 * (k + 1) for k, r in enumerate(ranks))
+
+
+def test_sweep_every_secret():
+    result = sweep('NumberGuess', {'number_values': 10}, NumberGuess_OptimalPlayer())
+    assert result.exhaustive()
+    assert result.guess_counts() == {k: 1 for k in range(1, 11)}
+    assert result.worst() == -10
+    assert result.min_score_for(1.0) == -10
+    assert result.min_score_for(0.5) == -5
+    assert result.failing_secrets(min_score=-8) == [(8, 'score -9 below -8'), (9, 'score -10 below -8')]
+
+
+def test_sweep_with_processes_matches_single_process():
+    configuration = {'code_size': 3, 'number_values': 5, 'allow_repetition': False}
+    single = sweep('Wordle', configuration, Wordle_OptimalPlayer_norep(), max_secrets=30)
+    pool = sweep('Wordle', configuration, Wordle_OptimalPlayer_norep(), max_secrets=30, processes=2)
+    assert not single.exhaustive()
+    assert single.secrets == pool.secrets
+    assert single.scores == pool.scores
+    assert not single.errors
@@ -0,0 +1,30 @@
+from IArena.games.SlicingPuzzle import SlicingPuzzleRules, SlicingPuzzleMovement, SlicingPuzzlePosition
+
+
+def test_moves_keep_board_and_empty_space():
+    rules = SlicingPuzzleRules(n=3, seed=0)
+    position = rules.first_position()
+    for _ in range(200):
+        movement = rules.possible_movements(position)[0]
+        position = rules.next_position(movement, position)
+        row, column = position.empty_space()
+        assert position.squares[row][column] == -1
+        assert sorted(position.key()) == [-1] + list(range(1, 9))
+
+
+def test_positions_with_same_board_share_hash():
+    rules = SlicingPuzzleRules(initial_position=[[1, 2, 3], [4, 5, 6], [7, -1, 8]])
+    position = rules.first_position()
+    assert not rules.finished(position)
+    assert not rules.is_movement_possible(SlicingPuzzleMovement.Values.Up, position)
+
+    solved = rules.next_position(SlicingPuzzleMovement.Values.Left, position)
+    assert rules.finished(solved)
+    back = rules.next_position(SlicingPuzzleMovement.Values.Right, solved)
+    assert back.key() == position.key() and hash(back) == hash(position)
+    assert back != position and back == SlicingPuzzlePosition(rules, position.squares, 2)
+
+
+def test_random_position_depends_on_seed():
+    assert SlicingPuzzleRules(n=4, seed=3).initial_position == SlicingPuzzleRules(n=4, seed=3).initial_position
+    assert SlicingPuzzleRules(n=4, seed=3).initial_position != SlicingPuzzleRules(n=4, seed=4).initial_position
@@ -0,0 +1,73 @@
+from collections import deque
+
+from IArena.utils.caching import CACHE_DIRECTORY_VARIABLE
+from IArena.utils.SlicingSolver import SlicingSolver, PatternDatabase, is_solvable
+from IArena.games.SlicingPuzzle import SlicingPuzzleRules, SlicingPuzzleRulesGenerator
+from IArena.players.optimal_players import SlicingPuzzle_OptimalPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def bfs_cost(board, n):
+    """Reference number of moves with a breadth first search."""
+    goal = tuple(range(1, n * n)) + (-1,)
+    distances = {tuple(board): 0}
+    queue = deque([tuple(board)])
+    while queue:
+        u = queue.popleft()
+        if u == goal:
+            return distances[u]
+        blank = u.index(-1)
+        row, column = divmod(blank, n)
+        for target, possible in ((blank - n, row > 0), (blank + n, row < n - 1),
+                                 (blank - 1, column > 0), (blank + 1, column < n - 1)):
+            if possible:
+                v = list(u)
+                v[blank], v[target] = v[target], -1
+                v = tuple(v)
+                if v not in distances:
+                    distances[v] = distances[u] + 1
+                    queue.append(v)
+
+
+def test_solutions_are_optimal(tmp_path):
+    databases = [PatternDatabase(3, tiles, str(tmp_path)) for tiles in ((1, 2, 3, 4), (5, 6, 7, 8))]
+    for seed in range(6):
+        rules = SlicingPuzzleRules(n=3, seed=seed)
+        board = rules.first_position().key()
+        expected = bfs_cost(board, 3)
+        assert SlicingSolver(3).solution_cost(board) == expected
+        solver = SlicingSolver(3, databases)
+        assert solver.heuristic(board) <= expected
+
+        # Applying the solution solves the board
+        solution = solver.solve(board)
+        assert len(solution) == expected
+        squares = list(board)
+        for target in solution:
+            blank = squares.index(-1)
+            assert abs(target - blank) in (1, 3)
+            squares[blank], squares[target] = squares[target], -1
+        assert tuple(squares) == tuple(range(1, 9)) + (-1,)
+
+
+def test_solvability():
+    assert is_solvable(tuple(range(1, 16)) + (-1,))
+    assert not is_solvable((2, 1) + tuple(range(3, 16)) + (-1,))
+    assert is_solvable(SlicingPuzzleRules(n=4, seed=1).first_position().key())
+
+
+def test_linear_conflicts_on_short_4x4_board():
+    rules = SlicingPuzzleRules(n=4, seed=0)
+    board = rules.generate_random_position(seed=2, random_moves=24)
+    board = tuple(x for row in board for x in row)
+    solver = SlicingSolver(4)
+    assert solver.heuristic(board) <= solver.solution_cost(board) <= 24
+
+
+def test_optimal_player_scores_minimum_cost(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(tmp_path))
+    for seed in range(3):
+        rules = SlicingPuzzleRulesGenerator().generate({'n': 3, 'seed': seed})
+        player = SlicingPuzzle_OptimalPlayer(name='optimal', pattern_databases=True)
+        score = GenericGame(rules, [player]).play()[0]
+        assert score == rules.minimum_cost() == bfs_cost(rules.first_position().key(), 3)
@@ -0,0 +1,98 @@
+import heapq
+
+from IArena.utils.RandomGenerator import RandomGenerator
+from IArena.utils.caching import CACHE_DIRECTORY_VARIABLE
+from IArena.utils.MapCorpus import MapCorpus
+from IArena.utils.SquareMap import SquareMap, SquareMapCoordinate, square_map_generator, square_valid_map_generator
+from IArena.utils.SquareMap import generate_random_non_loop_path, square_maze_generator
+from IArena.games.BlindWalk import BlindWalkRules, BlindWalkPosition, BlindWalkRulesGenerator
+
+
+def dijkstra(map, start, target):
+    """Reference shortest path over the free squares."""
+    rows, cols = map.size()
+    queue = [(0, start)]
+    visited = set()
+    while queue:
+        cost, (x, y) = heapq.heappop(queue)
+        if (x, y) == target:
+            return cost
+        if (x, y) in visited:
+            continue
+        visited.add((x, y))
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < rows and 0 <= ny < cols and map[nx, ny] and (nx, ny) not in visited:
+                heapq.heappush(queue, (cost + 1, (nx, ny)))
+    return float('inf')
+
+
+def test_distances_equal_dijkstra():
+    for seed in range(5):
+        map = square_map_generator(9, 7, 0.3, RandomGenerator(seed))
+        target = SquareMapCoordinate(4, 3)
+        for x in range(9):
+            for y in range(7):
+                start = SquareMapCoordinate(x, y)
+                expected = dijkstra(map, (x, y), (4, 3)) if map[x, y] else float('inf')
+                assert map.distance(start, target) == expected
+                assert map.is_reachable(start, target) == (expected != float('inf'))
+
+
+def test_set_free_invalidates_distances():
+    map = SquareMap([[True, False, True]])
+    start = SquareMapCoordinate(0, 0)
+    target = SquareMapCoordinate(0, 2)
+    assert not map.is_reachable(start, target)
+    map.set_free(SquareMapCoordinate(0, 1))
+    assert map.distance(start, target) == 2
+
+
+def test_valid_map_reference_score():
+    start = SquareMapCoordinate(0, 0)
+    target = SquareMapCoordinate(5, 5)
+    map = square_valid_map_generator(6, 6, start, target, 14, 0.4, RandomGenerator(3))
+    rules = BlindWalkRules(map, target, start)
+    assert rules.minimum_steps() == dijkstra(map, (0, 0), (5, 5)) >= 10
+    assert rules.first_position() == BlindWalkPosition(rules, 0, SquareMapCoordinate(0, 0))
+
+
+def test_non_loop_path_is_induced_and_close_to_length():
+    for seed in range(5):
+        start = SquareMapCoordinate(1, 2)
+        target = SquareMapCoordinate(17, 13)
+        path = generate_random_non_loop_path(20, 16, start, target, 80, RandomGenerator(seed))
+        assert path[0] == start and path[-1] == target
+        squares = [c.as_tuple() for c in path]
+        index = {c: i for i, c in enumerate(squares)}
+        assert len(index) == len(squares)
+        for i, (x, y) in enumerate(squares):
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                j = index.get((x + dx, y + dy))
+                assert j is None or abs(i - j) == 1
+        assert abs(len(path) - 1 - 80) <= 10
+
+
+def test_maze_has_one_path_between_rooms():
+    map = square_maze_generator(9, 11, RandomGenerator(2))
+    rows, cols = map.size()
+    free = int(map.map_.sum())
+    edges = sum(
+        1 for x in range(rows) for y in range(cols) for nx, ny in ((x + 1, y), (x, y + 1))
+        if nx < rows and ny < cols and map[x, y] and map[nx, ny])
+    assert edges == free - 1
+    assert map.distance_field(SquareMapCoordinate(0, 0))[map.map_].min() >= 0
+
+
+def test_corpus_generates_each_map_once(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIRECTORY_VARIABLE, str(tmp_path))
+    configuration = {'rows': 12, 'cols': 10, 'path_length': 30, 'seed': 4}
+    rules = BlindWalkRulesGenerator().generate(configuration)
+    assert rules.minimum_steps() < float('inf')
+    assert len(list((tmp_path / 'square_maps').iterdir())) == 1
+
+    start = SquareMapCoordinate(0, 0)
+    target = SquareMapCoordinate(11, 9)
+    generated = square_valid_map_generator(12, 10, start, target, 30, 0.3, RandomGenerator(4))
+    assert (rules.map_.map_ == generated.map_).all()
+    assert (MapCorpus(str(tmp_path / 'square_maps')).valid_map(12, 10, start, target, 30, 0.3, 4).map_ == generated.map_).all()
@@ -0,0 +1,58 @@
+import itertools
+import random
+
+from IArena.utils.SSPSolver import SSPSolver
+from IArena.games.SSP import SSPRulesGenerator
+from IArena.players.exact_players import SSPExactPlayer
+from IArena.arena.GenericGame import GenericGame
+
+
+def brute_force(coins, target):
+    return max(
+        sum(subset) for k in range(len(coins) + 1)
+        for subset in itertools.combinations(coins, k) if sum(subset) <= target)
+
+
+def test_every_method_finds_the_best_sum():
+    generator = random.Random(0)
+    methods = (SSPSolver.MeetInTheMiddle, SSPSolver.NumpyBitset, SSPSolver.CheckpointedBitset)
+    for _ in range(100):
+        coins = [generator.randint(0, 200) * generator.choice([1, 3]) for _ in range(generator.randint(0, 11))]
+        target = generator.randint(0, 700)
+        expected = brute_force(coins, target)
+        for method in methods:
+            best, indexes = SSPSolver(coins, target, method).solve()
+            assert best == expected
+            assert len(set(indexes)) == len(indexes) and sum(coins[i] for i in indexes) == best
+
+
+def test_meet_in_the_middle_with_sums_over_int64():
+    instances = [
+        ([2 ** 62, 2 ** 62, 2 ** 62, 2 ** 62 + 5, 2 ** 63 - 6, 7, 11, 13], 2 ** 63 - 1),
+        ([10 ** 19, 3 * 10 ** 18, 7 * 10 ** 18 + 1, 5, 9 * 10 ** 18, 12], 2 * 10 ** 19),
+    ]
+    for coins, target in instances:
+        solver = SSPSolver(coins, target)
+        assert solver.method == SSPSolver.MeetInTheMiddle
+        best, indexes = solver.solve()
+        assert best == sum(coins[i] for i in indexes) == brute_force(coins, target)
+
+
+def test_method_depends_on_instance_size():
+    generator = random.Random(1)
+    assert SSPSolver([generator.randint(1, 10 ** 12) for _ in range(30)], 10 ** 13).method == SSPSolver.MeetInTheMiddle
+    assert SSPSolver([generator.randint(1, 1000) for _ in range(500)], 10 ** 5).method == SSPSolver.NumpyBitset
+
+    coins = [2 * generator.randint(1, 10 ** 6) + 1 for _ in range(80)]
+    solver = SSPSolver(coins, 3 * 10 ** 7)
+    assert solver.method == SSPSolver.CheckpointedBitset
+    best, indexes = solver.solve()
+    assert best == sum(coins[i] for i in indexes) <= 3 * 10 ** 7
+
+
+def test_exact_player_on_generated_rules():
+    configuration = {'target': 10 ** 6, 'n': 300, 'max_value': 10 ** 4, 'seed': 2}
+    rules = SSPRulesGenerator().generate(configuration)
+    assert rules.coins() == SSPRulesGenerator().generate(configuration).coins()
+    score = GenericGame(rules, [SSPExactPlayer()]).play()[0]
+    assert score == rules.target() - rules.minimum_loss()